@@ -1,42 +1,258 @@
-from .environment import JSONPathEnvironment
-from .environment import JSONValue
-from .exceptions import JSONPathError
-from .exceptions import JSONPathIndexError
-from .exceptions import JSONPathNameError
-from .exceptions import JSONPathRecursionError
-from .exceptions import JSONPathSyntaxError
-from .exceptions import JSONPathTypeError
-from .filter_expressions import NOTHING
-from .lex import Lexer
-from .node import JSONPathNode
-from .node import JSONPathNodeList
-from .parse import Parser
-from .query import JSONPathQuery
+"""RFC 9535 - JSONPath: Query Expressions for JSON.
+
+Names exported from this package are imported from their submodules on first
+access, and the default `JSONPathEnvironment`, used by `find()`, `compile()`
+and friends, is created the first time one of those functions is called.
+"""
+
+from __future__ import annotations
+
+from _thread import allocate_lock
+from importlib import import_module
+
+# Avoid importing `typing` at runtime. Type checkers treat this the same as
+# `typing.TYPE_CHECKING`.
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from typing import AsyncIterable
+    from typing import AsyncIterator
+    from typing import Iterable
+    from typing import Iterator
+    from typing import List
+    from typing import Optional
+    from typing import Union
+
+    from .environment import JSONPathEnvironment
+    from .environment import JSONValue
+    from .exceptions import JSONPathComplexityError
+    from .exceptions import JSONPathError
+    from .exceptions import JSONPathIndexError
+    from .exceptions import JSONPathLimitError
+    from .exceptions import JSONPathNameError
+    from .exceptions import JSONPathRecursionError
+    from .exceptions import JSONPathSyntaxError
+    from .exceptions import JSONPathTypeError
+    from .lex import Lexer
+    from .lex import RegexLexer
+    from .node import NOTHING
+    from .node import JSONPathNode
+    from .node import JSONPathNodeList
+    from .parse import Parser
+    from .predicate import JSONPathPredicate
+    from .query import JSONPathQuery
 
 __all__ = (
     "JSONValue",
     "JSONPathEnvironment",
+    "JSONPathComplexityError",
     "JSONPathError",
     "JSONPathIndexError",
+    "JSONPathLimitError",
     "JSONPathNameError",
     "JSONPathRecursionError",
     "JSONPathSyntaxError",
     "JSONPathTypeError",
     "NOTHING",
     "Lexer",
+    "RegexLexer",
     "JSONPathNode",
     "JSONPathNodeList",
     "Parser",
+    "JSONPathPredicate",
     "JSONPathQuery",
     "find",
+    "find_many",
     "find_one",
     "finditer",
+    "afind",
+    "afinditer",
+    "afinditer_stream",
     "compile",
+    "compile_filter",
+    "filter_iter",
 )
 
+# Exported names and the submodules they are imported from.
+_LAZY_IMPORTS = {
+    "JSONValue": ".environment",
+    "JSONPathEnvironment": ".environment",
+    "JSONPathComplexityError": ".exceptions",
+    "JSONPathError": ".exceptions",
+    "JSONPathIndexError": ".exceptions",
+    "JSONPathLimitError": ".exceptions",
+    "JSONPathNameError": ".exceptions",
+    "JSONPathRecursionError": ".exceptions",
+    "JSONPathSyntaxError": ".exceptions",
+    "JSONPathTypeError": ".exceptions",
+    "NOTHING": ".node",
+    "Lexer": ".lex",
+    "RegexLexer": ".lex",
+    "JSONPathNode": ".node",
+    "JSONPathNodeList": ".node",
+    "Parser": ".parse",
+    "JSONPathPredicate": ".predicate",
+    "JSONPathQuery": ".query",
+}
+
+_default_env: Optional[JSONPathEnvironment] = None
+
+# Held while creating the default environment, so threads calling `find()`
+# and friends for the first time share one environment. `_thread` is built in
+# to the interpreter, so this doesn't cost us an import of `threading`.
+_default_env_lock = allocate_lock()
+
+
+def __getattr__(name: str) -> object:
+    if name == "DEFAULT_ENV":
+        return _get_default_env()
+
+    try:
+        module = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    obj = getattr(import_module(module, __name__), name)
+    globals()[name] = obj
+    return obj
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *_LAZY_IMPORTS, "DEFAULT_ENV"})
+
+
+def _get_default_env() -> JSONPathEnvironment:
+    global _default_env  # noqa: PLW0603
+    if _default_env is None:
+        from .environment import JSONPathEnvironment  # noqa: PLC0415
+
+        with _default_env_lock:
+            if _default_env is None:
+                _default_env = JSONPathEnvironment()
+    return _default_env
+
+
 # For convenience
-DEFAULT_ENV = JSONPathEnvironment()
-compile = DEFAULT_ENV.compile  # noqa: A001
-finditer = DEFAULT_ENV.finditer
-find = DEFAULT_ENV.find
-find_one = DEFAULT_ENV.find_one
+
+
+def compile(query: str) -> JSONPathQuery:  # noqa: A001
+    """Compile JSONPath expression _query_ using the default environment.
+
+    See `JSONPathEnvironment.compile()`.
+    """
+    return _get_default_env().compile(query)
+
+
+def finditer(
+    query: str,
+    value: JSONValue,
+    *,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> Iterable[JSONPathNode]:
+    """Apply _query_ to _value_ using the default environment, lazily.
+
+    See `JSONPathEnvironment.finditer()`.
+    """
+    return _get_default_env().finditer(query, value, limit=limit, offset=offset)
+
+
+def find(
+    query: str,
+    value: JSONValue,
+    *,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> JSONPathNodeList:
+    """Apply _query_ to _value_ using the default environment.
+
+    See `JSONPathEnvironment.find()`.
+    """
+    return _get_default_env().find(query, value, limit=limit, offset=offset)
+
+
+def find_one(query: str, value: JSONValue) -> Optional[JSONPathNode]:
+    """Return the first node from applying _query_ to _value_.
+
+    See `JSONPathEnvironment.find_one()`.
+    """
+    return _get_default_env().find_one(query, value)
+
+
+def find_many(queries: Iterable[str], value: JSONValue) -> List[JSONPathNodeList]:
+    """Apply each of _queries_ to _value_ using the default environment.
+
+    See `JSONPathEnvironment.find_many()`.
+    """
+    return _get_default_env().find_many(queries, value)
+
+
+def afinditer(
+    query: str,
+    value: JSONValue,
+    *,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> AsyncIterator[JSONPathNode]:
+    """Apply _query_ to _value_ using the default environment, for asyncio.
+
+    See `JSONPathEnvironment.afinditer()`.
+    """
+    return _get_default_env().afinditer(query, value, limit=limit, offset=offset)
+
+
+async def afind(
+    query: str,
+    value: JSONValue,
+    *,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    executor: Optional[Executor] = None,
+) -> JSONPathNodeList:
+    """Apply _query_ to _value_ using the default environment, for asyncio.
+
+    See `JSONPathEnvironment.afind()`.
+    """
+    return await _get_default_env().afind(
+        query, value, limit=limit, offset=offset, executor=executor
+    )
+
+
+def afinditer_stream(
+    query: str,
+    stream: AsyncIterable[bytes],
+    *,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> AsyncIterator[JSONPathNode]:
+    """Apply _query_ to a JSON document as it arrives from _stream_.
+
+    See `JSONPathEnvironment.afinditer_stream()`.
+    """
+    return _get_default_env().afinditer_stream(
+        query, stream, limit=limit, offset=offset
+    )
+
+
+def compile_filter(expression: str) -> JSONPathPredicate:
+    """Compile filter expression _expression_ using the default environment.
+
+    See `JSONPathEnvironment.compile_filter()`.
+    """
+    return _get_default_env().compile_filter(expression)
+
+
+def filter_iter(
+    predicate: Union[str, JSONPathPredicate], values: Iterable[JSONValue]
+) -> Iterator[JSONValue]:
+    """Generate values from _values_ that match _predicate_.
+
+    _predicate_ can be a compiled `JSONPathPredicate` or a filter expression,
+    which will be compiled using the default environment.
+
+    See `JSONPathPredicate.filter_iter()`.
+    """
+    if isinstance(predicate, str):
+        predicate = _get_default_env().compile_filter(predicate)
+    return predicate.filter_iter(values)
@@ -0,0 +1,250 @@
+"""Caches for compiled JSONPath queries.
+
+Caches are safe to share between threads, including on free-threaded builds
+of CPython, and lookups don't take a lock. Entries are held in a plain `dict`,
+which can be read while another thread holds the cache's lock to add or evict
+entries. A cache hit only marks its entry as recently used. Eviction gives
+marked entries a second chance, moving them to the most recently used end, so
+eviction order is close to, but not exactly, least recently used. Hits and
+misses are counted separately for each thread, so no counts are lost.
+"""
+
+from __future__ import annotations
+
+import threading
+from enum import Enum
+from typing import TYPE_CHECKING
+from typing import Dict
+from typing import Generic
+from typing import Hashable
+from typing import List
+from typing import Literal
+from typing import NamedTuple
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import TypeVar
+from typing import Union
+from weakref import WeakValueDictionary
+
+if TYPE_CHECKING:
+    from .query import JSONPathQuery
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class _Missing(Enum):
+    MISSING = 0
+
+
+MISSING = _Missing.MISSING
+"""Returned by `LRUCache.lookup()` when a key is not in the cache."""
+
+
+class CacheInfo(NamedTuple):
+    """Hit and miss statistics for a cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _LocalCounts(threading.local):
+    """A `[hits, misses]` list for each thread, registered on first use."""
+
+    counts: List[int]
+
+    def __init__(self, owner: ThreadCounts) -> None:
+        self.counts = [0, 0]
+        owner.register(self.counts)
+
+
+class ThreadCounts:
+    """Hit and miss counts, kept separately for each thread.
+
+    A thread only ever changes its own counts, so counting doesn't need a
+    lock. Counts from threads that have finished are added to a total the
+    next time a new thread starts counting.
+
+    Attributes:
+        local: Counts for the current thread, as `local.counts`, a list of
+            hits and misses.
+    """
+
+    __slots__ = ("local", "_lock", "_threads", "_finished")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._threads: List[Tuple[threading.Thread, List[int]]] = []
+        self._finished = [0, 0]
+        self.local = _LocalCounts(self)
+
+    def register(self, counts: List[int]) -> None:
+        """Start counting _counts_ for the current thread."""
+        with self._lock:
+            threads = []
+            for thread, _counts in self._threads:
+                if thread.is_alive():
+                    threads.append((thread, _counts))
+                else:
+                    self._finished[0] += _counts[0]
+                    self._finished[1] += _counts[1]
+            threads.append((threading.current_thread(), counts))
+            self._threads = threads
+
+    def totals(self) -> Tuple[int, int]:
+        """Return hits and misses counted by all threads."""
+        with self._lock:
+            hits, misses = self._finished
+            for _, counts in self._threads:
+                hits += counts[0]
+                misses += counts[1]
+        return hits, misses
+
+    def reset(self) -> None:
+        """Set all counts back to zero."""
+        with self._lock:
+            self._threads = []
+            self._finished = [0, 0]
+        self.local = _LocalCounts(self)
+
+
+class LRUCache(Generic[K, V]):
+    """A size-bounded, approximately least recently used cache.
+
+    An `LRUCache` can be shared between threads without locking on lookup.
+
+    Arguments:
+        maxsize: The maximum number of entries to hold in the cache. If
+            _maxsize_ is less than one, nothing is cached.
+    """
+
+    __slots__ = ("maxsize", "_data", "_used", "_lock", "_counts")
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        # Oldest first. Only changed while holding `_lock`.
+        self._data: Dict[K, V] = {}
+        # Keys that have been looked up since they were last given a second
+        # chance. Added to without holding `_lock`.
+        self._used: Set[K] = set()
+        self._lock = threading.Lock()
+        self._counts = ThreadCounts()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def hits(self) -> int:
+        """The number of lookups that found an entry."""
+        return self._counts.totals()[0]
+
+    @property
+    def misses(self) -> int:
+        """The number of lookups that did not find an entry."""
+        return self._counts.totals()[1]
+
+    def lookup(self, key: K) -> Union[V, Literal[_Missing.MISSING]]:
+        """Return the value for _key_, or `MISSING` if it is not cached."""
+        value = self._data.get(key, MISSING)
+        if value is MISSING:
+            self._counts.local.counts[1] += 1
+        else:
+            self._counts.local.counts[0] += 1
+            self._used.add(key)
+        return value
+
+    def store(self, key: K, value: V) -> None:
+        """Add _value_ to the cache, evicting an old entry if necessary."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key: K, value: V) -> None:
+        """Add _value_ to the cache. Call while holding `_lock`."""
+        data = self._data
+        used = self._used
+
+        data.pop(key, None)
+        data[key] = value
+        used.discard(key)
+
+        while len(data) > self.maxsize:
+            oldest = next(iter(data))
+            if oldest in used:
+                used.discard(oldest)
+                data[oldest] = data.pop(oldest)
+            else:
+                del data[oldest]
+
+        if len(used) > len(data):
+            # Forget keys marked by lookups that raced with their eviction.
+            used.intersection_update(data)
+
+    def info(self) -> CacheInfo:
+        """Return hit and miss statistics for this cache."""
+        hits, misses = self._counts.totals()
+        return CacheInfo(hits, misses, self.maxsize, len(self._data))
+
+    def clear(self) -> None:
+        """Remove all entries from the cache and reset statistics."""
+        with self._lock:
+            self._data.clear()
+            self._used.clear()
+        self._counts.reset()
+
+
+class QueryCache(LRUCache[str, "JSONPathQuery"]):
+    """A size-bounded, least recently used cache of compiled JSONPath queries.
+
+    Queries are cached by the string they were compiled from. Queries that
+    differ only cosmetically, like `$.a`, `$['a']` and `$["a"]`, have the same
+    canonical form, and share one `JSONPathQuery` instance.
+
+    A shared instance keeps the tokens of the first query string it was
+    compiled from, so positions reported by errors raised while applying it
+    refer to that string, available as `err.token.query`, even when it was
+    retrieved with a different spelling.
+
+    Arguments:
+        maxsize: The maximum number of query strings to hold in the cache. If
+            _maxsize_ is less than one, nothing is cached.
+    """
+
+    __slots__ = ("_canonical",)
+
+    def __init__(self, maxsize: int = 256) -> None:
+        super().__init__(maxsize)
+        # Canonical query strings to compiled queries. An entry is removed when
+        # its query is no longer referenced by `_data` or anyone else.
+        self._canonical: WeakValueDictionary[str, JSONPathQuery] = WeakValueDictionary()
+
+    def get(self, query: str) -> Optional[JSONPathQuery]:
+        """Return the compiled query for _query_, or `None` if it is not cached."""
+        compiled = self.lookup(query)
+        return None if compiled is MISSING else compiled
+
+    def put(self, query: str, compiled: JSONPathQuery) -> JSONPathQuery:
+        """Add _compiled_ to the cache, keyed by its source string _query_.
+
+        Returns:
+            A previously cached query with the same canonical form as
+            _compiled_, if there is one, or _compiled_ otherwise.
+        """
+        if self.maxsize <= 0:
+            return compiled
+
+        with self._lock:
+            compiled = self._canonical.setdefault(compiled.canonical(), compiled)
+            self._store(query, compiled)
+
+        return compiled
+
+    def clear(self) -> None:
+        """Remove all queries from the cache and reset statistics."""
+        with self._lock:
+            self._canonical.clear()
+        super().clear()
@@ -4,7 +4,6 @@ import argparse
 import json
 import sys
 
-import jsonpath_rfc9535 as jsonpath
 from jsonpath_rfc9535.__about__ import __version__
 from jsonpath_rfc9535.exceptions import JSONPathIndexError
 from jsonpath_rfc9535.exceptions import JSONPathSyntaxError
@@ -50,6 +49,15 @@ def setup_parser() -> argparse.ArgumentParser:  # noqa: D103
         help="Show stack traces.",
     )
 
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help=(
+            "Describe how the JSONPath expression will be evaluated, "
+            "instead of applying it to a JSON document."
+        ),
+    )
+
     parser.add_argument(
         "--pretty",
         action="store_true",
@@ -103,8 +111,13 @@ def handle_path_command(args: argparse.Namespace) -> None:  # noqa: PLR0912, D10
     else:
         query = args.query_file.read().strip()
 
+    # Import the environment here, so `--help` and `--version` don't need it.
+    from jsonpath_rfc9535.environment import JSONPathEnvironment  # noqa: PLC0415
+
+    env = JSONPathEnvironment()
+
     try:
-        path = jsonpath.JSONPathEnvironment().compile(query)
+        path = env.compile(query)
     except JSONPathSyntaxError as err:
         if args.debug:
             raise
@@ -121,6 +134,10 @@ def handle_path_command(args: argparse.Namespace) -> None:  # noqa: PLR0912, D10
         sys.stderr.write(f"index error: {err}\n")
         sys.exit(1)
 
+    if args.explain:
+        args.output.write(env.explain(query) + "\n")
+        return
+
     try:
         data = json.load(args.file)
         values = path.find(data).values()
@@ -0,0 +1,387 @@
+"""Filter evaluation over large arrays, one column at a time, using NumPy.
+
+A filter made up of singular relative queries, like `@.price` or `@[0]`,
+compared to literals, and combined with `&&`, `||` and `!`, can be applied to
+every item in an array at once. Each distinct query is applied to every item
+to build a column of values, and each comparison becomes a vectorized
+operation on that column.
+
+This is only used if NumPy is installed, and only for arrays with at least
+`JSONPathEnvironment.columnar_filter_threshold` items. If NumPy is not
+installed, or an array contains values we can't compare exactly in a NumPy
+array, like integers that don't fit in a float without rounding, filters are
+evaluated one item at a time as usual.
+"""
+
+from __future__ import annotations
+
+from abc import ABC
+from abc import abstractmethod
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from .filter_expressions import ComparisonExpression
+from .filter_expressions import FilterExpression
+from .filter_expressions import FilterExpressionLiteral
+from .filter_expressions import LogicalExpression
+from .filter_expressions import PrefixExpression
+from .filter_expressions import RelativeFilterQuery
+from .node import NOTHING
+from .node import Nothing
+from .segments import JSONPathChildSegment
+from .selectors import IndexSelector
+from .selectors import NameSelector
+
+if TYPE_CHECKING:
+    from .filter_expressions import Expression
+
+Path = Tuple[Union[str, int], ...]
+
+# Integers outside this range can't be converted to a float without rounding.
+MAX_EXACT_INT = 2**53
+
+# Value types we know how to compare column-wise. Anything else, including
+# subclasses of these types, falls back to item-by-item evaluation.
+_KNOWN_TYPES = frozenset(
+    [str, int, float, bool, type(None), dict, list, Nothing],
+)
+
+# Comparison operators with their operands swapped.
+_MIRRORED = {"<": ">", ">": "<", "<=": ">=", ">=": "<=", "==": "==", "!=": "!="}
+
+
+@lru_cache(maxsize=1)
+def _numpy() -> Any:
+    """Return the `numpy` module, or `None` if NumPy is not installed."""
+    try:
+        import numpy as np  # noqa: PLC0415
+    except ImportError:  # pragma: no cover
+        return None
+    return np
+
+
+def numpy_available() -> bool:
+    """Return `True` if NumPy is installed."""
+    return _numpy() is not None
+
+
+class ColumnarFilter:
+    """A filter expression that can be applied to a whole array at once.
+
+    Use `plan_filter()` to get a `ColumnarFilter` for a filter expression.
+
+    Arguments:
+        predicate: The filter expression, rewritten as operations on columns.
+    """
+
+    __slots__ = ("predicate",)
+
+    def __init__(self, predicate: _Predicate) -> None:
+        self.predicate = predicate
+
+    def select(self, items: List[object]) -> Optional[List[int]]:
+        """Return the indices of _items_ that match this filter.
+
+        Returns `None` if NumPy is not installed or _items_ can't be filtered
+        column-wise, in which case the filter should be applied to each item
+        in turn.
+        """
+        np = _numpy()
+        if np is None:
+            return None
+
+        try:
+            mask = self.predicate.mask(_Table(np, items))
+        except _InexactError:
+            return None
+
+        indices: List[int] = np.flatnonzero(mask).tolist()
+        return indices
+
+
+def plan_filter(expression: FilterExpression) -> Optional[ColumnarFilter]:
+    """Return a `ColumnarFilter` for _expression_, or `None` if it has no plan.
+
+    Subclasses of `FilterExpression`, like those used for profiling and
+    resource limits, are never planned, as they need to see each evaluation.
+    """
+    if type(expression) is not FilterExpression:
+        return None
+    predicate = _plan(expression.expression)
+    return None if predicate is None else ColumnarFilter(predicate)
+
+
+def _plan(expression: Expression) -> Optional[_Predicate]:  # noqa: PLR0911
+    if isinstance(expression, LogicalExpression):
+        left = _plan(expression.left)
+        right = _plan(expression.right)
+        if left is None or right is None:
+            return None
+        return _Logical(left, expression.operator, right)
+
+    if isinstance(expression, PrefixExpression):
+        operand = _plan(expression.right)
+        if expression.operator != "!" or operand is None:
+            return None
+        return _Not(operand)
+
+    if isinstance(expression, ComparisonExpression):
+        operator = expression.operator
+        query, literal = expression.left, expression.right
+        if isinstance(query, FilterExpressionLiteral):
+            query, literal = literal, query
+            operator = _MIRRORED[operator]
+
+        path = _path(query)
+        if path is None or not isinstance(literal, FilterExpressionLiteral):
+            return None
+        if not _comparable_literal(literal.value):
+            return None
+        return _Comparison(path, operator, literal.value)
+
+    # A bare `@` is tested for truthiness, not existence.
+    path = _path(expression)
+    if path:
+        return _Exists(path)
+
+    return None
+
+
+def _path(expression: Expression) -> Optional[Path]:
+    """Return names and indices from a singular relative query, or `None`."""
+    if not isinstance(expression, RelativeFilterQuery):
+        return None
+
+    path: List[Union[str, int]] = []
+    for segment in expression.query.segments:
+        if not isinstance(segment, JSONPathChildSegment) or len(segment.selectors) != 1:
+            return None
+        selector = segment.selectors[0]
+        if isinstance(selector, NameSelector):
+            path.append(selector.name)
+        elif isinstance(selector, IndexSelector):
+            path.append(selector.index)
+        else:
+            return None
+
+    return tuple(path)
+
+
+def _comparable_literal(value: object) -> bool:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return -MAX_EXACT_INT <= value <= MAX_EXACT_INT
+    return value is None or isinstance(value, (str, float, bool))
+
+
+class _InexactError(Exception):
+    """Column-wise evaluation might not match item-by-item evaluation."""
+
+
+class _Table:
+    """Columns of values extracted from a list of items, built on demand."""
+
+    __slots__ = ("np", "items", "_values", "_numbers", "_strings")
+
+    def __init__(self, np: Any, items: List[object]) -> None:
+        self.np = np
+        self.items = items
+        self._values: Dict[Path, List[object]] = {}
+        self._numbers: Dict[Path, Tuple[Any, Any, Any]] = {}
+        self._strings: Dict[Path, Tuple[Any, Any]] = {}
+
+    def values(self, path: Path) -> List[object]:
+        """Return the value at _path_ for each item, or `NOTHING` if missing."""
+        try:
+            return self._values[path]
+        except KeyError:
+            pass
+
+        column = self.items
+        for key in path:
+            if isinstance(key, str):
+                column = [
+                    v.get(key, NOTHING) if isinstance(v, dict) else NOTHING
+                    for v in column
+                ]
+            else:
+                column = [
+                    v[key]
+                    if isinstance(v, list) and -len(v) <= key < len(v)
+                    else NOTHING
+                    for v in column
+                ]
+
+        if not set(map(type, column)) <= _KNOWN_TYPES:
+            raise _InexactError
+
+        self._values[path] = column
+        return column
+
+    def numbers(self, path: Path) -> Tuple[Any, Any, Any]:
+        """Return number and Boolean masks, and float values, for _path_.
+
+        Booleans are numbers when ordering values, but not when testing for
+        equality, just like `_lt()` and `_eq()` in `filter_expressions`.
+        """
+        try:
+            return self._numbers[path]
+        except KeyError:
+            pass
+
+        np = self.np
+        column = self.values(path)
+        count = len(column)
+
+        is_number = np.fromiter(
+            (isinstance(v, (int, float)) for v in column), dtype=bool, count=count
+        )
+        is_bool = np.fromiter(
+            (isinstance(v, bool) for v in column), dtype=bool, count=count
+        )
+
+        if any(
+            isinstance(v, int) and not -MAX_EXACT_INT <= v <= MAX_EXACT_INT
+            for v in column
+        ):
+            raise _InexactError
+
+        floats = np.fromiter(
+            (v if isinstance(v, (int, float)) else np.nan for v in column),
+            dtype=np.float64,
+            count=count,
+        )
+
+        self._numbers[path] = (is_number, is_bool, floats)
+        return self._numbers[path]
+
+    def strings(self, path: Path) -> Tuple[Any, Any]:
+        """Return a string mask and an array of strings for _path_."""
+        try:
+            return self._strings[path]
+        except KeyError:
+            pass
+
+        np = self.np
+        column = self.values(path)
+        count = len(column)
+
+        is_string = np.fromiter(
+            (isinstance(v, str) for v in column), dtype=bool, count=count
+        )
+        # An object array, so strings are compared with Python semantics.
+        strings = np.empty(count, dtype=object)
+        strings[:] = [v if isinstance(v, str) else "" for v in column]
+
+        self._strings[path] = (is_string, strings)
+        return self._strings[path]
+
+
+class _Predicate(ABC):
+    __slots__ = ()
+
+    @abstractmethod
+    def mask(self, table: _Table) -> Any:
+        """Return a Boolean array, one element for each item in _table_."""
+
+
+class _Logical(_Predicate):
+    __slots__ = ("left", "operator", "right")
+
+    def __init__(self, left: _Predicate, operator: str, right: _Predicate) -> None:
+        self.left = left
+        self.operator = operator
+        self.right = right
+
+    def mask(self, table: _Table) -> Any:
+        if self.operator == "&&":
+            return self.left.mask(table) & self.right.mask(table)
+        return self.left.mask(table) | self.right.mask(table)
+
+
+class _Not(_Predicate):
+    __slots__ = ("operand",)
+
+    def __init__(self, operand: _Predicate) -> None:
+        self.operand = operand
+
+    def mask(self, table: _Table) -> Any:
+        return ~self.operand.mask(table)
+
+
+class _Exists(_Predicate):
+    __slots__ = ("path",)
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def mask(self, table: _Table) -> Any:
+        column = table.values(self.path)
+        return table.np.fromiter(
+            (v is not NOTHING for v in column), dtype=bool, count=len(column)
+        )
+
+
+class _Comparison(_Predicate):
+    """A singular relative query compared to a literal, query on the left."""
+
+    __slots__ = ("path", "operator", "value")
+
+    def __init__(self, path: Path, operator: str, value: object) -> None:
+        self.path = path
+        self.operator = operator
+        self.value = value
+
+    def mask(self, table: _Table) -> Any:  # noqa: PLR0911
+        lt, gt, eq = self._compare(table)
+        operator = self.operator
+        if operator == "<":
+            return lt
+        if operator == ">":
+            return gt
+        if operator == "==":
+            return eq
+        if operator == "!=":
+            return ~eq
+        if operator == "<=":
+            return lt | eq
+        if operator == ">=":
+            return gt | eq
+        return table.np.zeros(len(table.items), dtype=bool)
+
+    def _compare(self, table: _Table) -> Tuple[Any, Any, Any]:
+        """Return less than, greater than and equal to masks."""
+        value = self.value
+        np = table.np
+
+        if isinstance(value, str):
+            is_string, strings = table.strings(self.path)
+            return (
+                is_string & (strings < value),
+                is_string & (strings > value),
+                is_string & (strings == value),
+            )
+
+        if isinstance(value, (int, float)):
+            is_number, is_bool, floats = table.numbers(self.path)
+            same_kind = is_bool if isinstance(value, bool) else is_number & ~is_bool
+            return (
+                is_number & (floats < value),
+                is_number & (floats > value),
+                same_kind & (floats == value),
+            )
+
+        # null
+        column = table.values(self.path)
+        count = len(column)
+        never = np.zeros(count, dtype=bool)
+        return (
+            never,
+            never,
+            np.fromiter((v is None for v in column), dtype=bool, count=count),
+        )
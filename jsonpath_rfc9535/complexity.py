@@ -0,0 +1,150 @@
+"""Static complexity estimates for compiled JSONPath queries.
+
+A query's complexity score is a rough, data independent estimate of how
+expensive it is to apply. Each segment, filter, descendant segment, root query
+under a descendant segment and dynamic regex pattern adds to the score.
+Anything inside a filter expression is evaluated once for every candidate
+node, so its cost is doubled for each level of filter nesting.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import NamedTuple
+
+from .filter_expressions import ComparisonExpression
+from .filter_expressions import FilterExpressionLiteral
+from .filter_expressions import FilterQuery
+from .filter_expressions import FunctionExtension
+from .filter_expressions import LogicalExpression
+from .filter_expressions import PrefixExpression
+from .filter_expressions import RootFilterQuery
+from .function_extensions import Match
+from .function_extensions import Search
+from .segments import JSONPathRecursiveDescentSegment
+from .selectors import FilterSelector
+
+if TYPE_CHECKING:
+    from .filter_expressions import Expression
+    from .query import JSONPathQuery
+
+SEGMENT_COST = 1
+FILTER_COST = 2
+DESCENT_COST = 10
+ROOT_QUERY_IN_DESCENT_COST = 20
+DYNAMIC_REGEX_COST = 10
+
+
+class Complexity(NamedTuple):
+    """A query's complexity score and the features that contribute to it.
+
+    Attributes:
+        score: The query's complexity score.
+        descendant_segments: The number of descendant segments, including those
+            in filter queries.
+        descendant_segments_in_filters: The number of descendant segments in
+            filter queries.
+        filter_depth: The deepest nesting of filter selectors.
+        root_queries_in_descent: The number of root queries in filters that
+            are evaluated for nodes selected by a descendant segment.
+        dynamic_regex: The number of `match` and `search` calls with a pattern
+            that is not a string literal.
+    """
+
+    score: int
+    descendant_segments: int
+    descendant_segments_in_filters: int
+    filter_depth: int
+    root_queries_in_descent: int
+    dynamic_regex: int
+
+
+def complexity(query: JSONPathQuery) -> Complexity:
+    """Return the complexity of _query_."""
+    counter = _ComplexityCounter(query)
+    counter.visit_query(query, depth=0, descent=False)
+    return Complexity(
+        score=counter.score,
+        descendant_segments=counter.descendant_segments,
+        descendant_segments_in_filters=counter.descendant_segments_in_filters,
+        filter_depth=counter.filter_depth,
+        root_queries_in_descent=counter.root_queries_in_descent,
+        dynamic_regex=counter.dynamic_regex,
+    )
+
+
+class _ComplexityCounter:
+    __slots__ = (
+        "query",
+        "score",
+        "descendant_segments",
+        "descendant_segments_in_filters",
+        "filter_depth",
+        "root_queries_in_descent",
+        "dynamic_regex",
+    )
+
+    def __init__(self, query: JSONPathQuery) -> None:
+        self.query = query
+        self.score = 0
+        self.descendant_segments = 0
+        self.descendant_segments_in_filters = 0
+        self.filter_depth = 0
+        self.root_queries_in_descent = 0
+        self.dynamic_regex = 0
+
+    def visit_query(self, query: JSONPathQuery, *, depth: int, descent: bool) -> None:
+        """Count features of _query_, nested _depth_ filters deep.
+
+        If _descent_ is `True`, _query_ is evaluated for nodes selected by a
+        descendant segment.
+        """
+        weight = 2**depth
+
+        for segment in query.segments:
+            self.score += SEGMENT_COST * weight
+
+            if isinstance(segment, JSONPathRecursiveDescentSegment):
+                descent = True
+                self.score += DESCENT_COST * weight
+                self.descendant_segments += 1
+                if depth:
+                    self.descendant_segments_in_filters += 1
+
+            for selector in segment.selectors:
+                if isinstance(selector, FilterSelector):
+                    self.score += FILTER_COST * weight
+                    self.filter_depth = max(self.filter_depth, depth + 1)
+                    self.visit_expression(
+                        selector.expression.expression, depth=depth + 1, descent=descent
+                    )
+
+    def visit_expression(
+        self, expression: Expression, *, depth: int, descent: bool
+    ) -> None:
+        """Count features of a filter expression, nested _depth_ filters deep."""
+        if isinstance(expression, (LogicalExpression, ComparisonExpression)):
+            self.visit_expression(expression.left, depth=depth, descent=descent)
+            self.visit_expression(expression.right, depth=depth, descent=descent)
+        elif isinstance(expression, PrefixExpression):
+            self.visit_expression(expression.right, depth=depth, descent=descent)
+        elif isinstance(expression, FilterQuery):
+            if isinstance(expression, RootFilterQuery) and descent:
+                self.score += ROOT_QUERY_IN_DESCENT_COST * 2**depth
+                self.root_queries_in_descent += 1
+            self.visit_query(expression.query, depth=depth, descent=descent)
+        elif isinstance(expression, FunctionExtension):
+            func = self.query.env.function_extensions.get(expression.name)
+            if (
+                isinstance(func, (Match, Search))
+                and len(expression.args) == 2  # noqa: PLR2004
+                and not (
+                    isinstance(expression.args[1], FilterExpressionLiteral)
+                    and isinstance(expression.args[1].value, str)
+                )
+            ):
+                self.score += DYNAMIC_REGEX_COST * 2**depth
+                self.dynamic_regex += 1
+
+            for arg in expression.args:
+                self.visit_expression(arg, depth=depth, descent=descent)
@@ -0,0 +1,225 @@
+"""Cooperative evaluation of compiled JSONPath queries for asyncio.
+
+`JSONPathQuery.afinditer()` resolves a query with copies of its segments in
+which every selector is wrapped in a `CooperativeSelector`, and filter
+selectors are replaced with `CooperativeFilterSelector`. Once every
+`JSONPathEnvironment.async_yield_interval` nodes visited or filter
+evaluations, a cooperative selector yields `PAUSE` in place of a node. `PAUSE`
+is passed through each following segment untouched, and `afinditer()` awaits
+`asyncio.sleep(0)` when it sees one, giving other tasks a chance to run.
+
+Cooperative segments are built once per query and shared by every call to
+`afinditer()`. Each call gets a new `Clock`, which is made active in the
+current thread while the call's next node is being resolved, in the same way
+as `jsonpath_rfc9535.limits.Meter`.
+
+Queries embedded in filter expressions are evaluated synchronously, each time
+a filter is evaluated, so they don't pause. Cooperative filter selectors test
+one item at a time, never using `jsonpath_rfc9535.columnar`, as applying a
+filter to a large array at once would block the event loop.
+
+Synchronous methods like `JSONPathQuery.find()` never use these segments.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+from typing import Type
+
+from .limits import LimitedSelector
+from .node import PAUSE
+from .segments import JSONPathSegment
+from .selectors import FilterSelector
+from .selectors import JSONPathSelector
+
+if TYPE_CHECKING:
+    from .environment import JSONPathEnvironment
+    from .environment import JSONValue
+    from .node import JSONPathNode
+    from .node import JSONPathNodeList
+
+
+class Clock:
+    """Counts nodes visited by one application of a query's cooperative selectors."""
+
+    __slots__ = ("interval", "visits")
+
+    def __init__(self, interval: int) -> None:
+        self.interval = max(interval, 1)
+        self.visits = 0
+
+    def tick(self) -> bool:
+        """Count a node visited, returning `True` if it's time to pause."""
+        self.visits += 1
+        if self.visits >= self.interval:
+            self.visits = 0
+            return True
+        return False
+
+
+class _ActiveClock(threading.local):
+    clock: Optional[Clock] = None
+
+
+# The clock for the query currently being applied in this thread, if any.
+_active = _ActiveClock()
+
+
+def clocked(nodes: Iterable[JSONPathNode], clock: Clock) -> Iterable[JSONPathNode]:
+    """Generate nodes from _nodes_ with _clock_ active."""
+    it = iter(nodes)
+
+    while True:
+        previous = _active.clock
+        _active.clock = clock
+        try:
+            node = next(it)
+        except StopIteration:
+            return
+        finally:
+            _active.clock = previous
+        yield node
+
+
+def cooperative_segments(
+    segments: Tuple[JSONPathSegment, ...],
+) -> Tuple[JSONPathSegment, ...]:
+    """Return copies of _segments_ that pause when the active clock says so."""
+    return tuple(CooperativeSegment(_pause_segment(s)) for s in segments)
+
+
+def _pause_segment(segment: JSONPathSegment) -> JSONPathSegment:
+    # Profiled segments only exist if the environment has a profiler.
+    if segment.env.profiler is not None:
+        from .profiling import ProfiledSegment  # noqa: PLC0415
+
+        if isinstance(segment, ProfiledSegment):
+            return ProfiledSegment(_pause_segment(segment.segment), segment.profile)
+
+    return segment.__class__(
+        env=segment.env,
+        token=segment.token,
+        selectors=tuple(
+            CooperativeSelector(_pause_selector(s)) for s in segment.selectors
+        ),
+    )
+
+
+def _pause_selector(selector: JSONPathSelector) -> JSONPathSelector:
+    if selector.env.profiler is not None:
+        from .profiling import ProfiledSelector  # noqa: PLC0415
+
+        if isinstance(selector, ProfiledSelector):
+            return ProfiledSelector(
+                _pause_selector(selector.selector), selector.profile
+            )
+
+    if isinstance(selector, LimitedSelector):
+        return LimitedSelector(_pause_selector(selector.selector))
+
+    if isinstance(selector, FilterSelector):
+        return CooperativeFilterSelector(selector)
+
+    return selector
+
+
+class CooperativeSegment(JSONPathSegment):
+    """A segment that passes `PAUSE` from preceding segments through untouched.
+
+    Nodes are given to the wrapped segment one at a time, so `PAUSE` is
+    yielded as soon as it arrives.
+    """
+
+    __slots__ = ("segment",)
+
+    def __init__(self, segment: JSONPathSegment) -> None:
+        super().__init__(
+            env=segment.env, token=segment.token, selectors=segment.selectors
+        )
+        self.segment = segment
+
+    def __str__(self) -> str:
+        return str(self.segment)
+
+    def resolve(self, nodes: Iterable[JSONPathNode]) -> Iterable[JSONPathNode]:
+        """Apply the wrapped segment to each node in _nodes_."""
+        resolve = self.segment.resolve
+        for node in nodes:
+            if node is PAUSE:
+                yield node
+            else:
+                yield from resolve((node,))
+
+
+class CooperativeSelector(JSONPathSelector):
+    """A selector that yields `PAUSE` once every so many nodes visited."""
+
+    __slots__ = ("selector",)
+
+    def __init__(self, selector: JSONPathSelector) -> None:
+        super().__init__(env=selector.env, token=selector.token)
+        self.selector = selector
+
+    def __str__(self) -> str:
+        return str(self.selector)
+
+    def resolve(self, node: JSONPathNode) -> Iterable[JSONPathNode]:
+        """Apply the wrapped selector to _node_, pausing first if it's time."""
+        clock = _active.clock
+        if clock is not None and clock.tick():
+            yield PAUSE
+        yield from self.selector.resolve(node)
+
+
+class CooperativeFilterSelector(FilterSelector):
+    """A filter selector that yields `PAUSE` once every so many evaluations."""
+
+    __slots__ = ()
+
+    def __init__(self, selector: FilterSelector) -> None:
+        super().__init__(
+            env=selector.env, token=selector.token, expression=selector.expression
+        )
+        self.columns = None
+
+    def resolve(self, node: JSONPathNode) -> Iterable[JSONPathNode]:
+        """Select members of _node_ with our filter, pausing when it's time."""
+        for key, val in self._matching_members(node):
+            yield PAUSE if key is PAUSE else node.new_child(val, key, node)
+
+    def _members(self, value: object) -> Iterable[Any]:
+        """Generate members of _value_ to test, with `PAUSE` pairs between them."""
+        clock = _active.clock
+        for member in super()._members(value):
+            if clock is not None and clock.tick():
+                yield PAUSE, PAUSE
+            yield member
+
+
+# Environments created in executor processes, one for each environment class.
+_process_envs: Dict[Type[JSONPathEnvironment], JSONPathEnvironment] = {}
+
+
+def find_in_process(
+    env_class: Type[JSONPathEnvironment],
+    query: str,
+    value: JSONValue,
+    limit: Optional[int],
+    offset: int,
+) -> JSONPathNodeList:
+    """Apply _query_ to _value_ in an executor process.
+
+    Compiled queries are not sent to other processes. Instead, _query_ is
+    compiled by an instance of _env_class_, created the first time it is
+    needed in each process.
+    """
+    env = _process_envs.get(env_class)
+    if env is None:
+        env = _process_envs[env_class] = env_class()
+    return env.find(query, value, limit=limit, offset=offset)
@@ -6,17 +6,25 @@ control recursion limits, for example.
 
 from __future__ import annotations
 
+import re
 from typing import TYPE_CHECKING
 from typing import Any
+from typing import AsyncIterable
+from typing import AsyncIterator
 from typing import Dict
 from typing import Iterable
 from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Type
 from typing import Union
 
 from . import function_extensions
+from .cache import QueryCache
+from .exceptions import JSONPathComplexityError
+from .exceptions import JSONPathError
 from .exceptions import JSONPathNameError
+from .exceptions import JSONPathSyntaxError
 from .exceptions import JSONPathTypeError
 from .filter_expressions import ComparisonExpression
 from .filter_expressions import FilterExpressionLiteral
@@ -25,16 +33,30 @@ from .filter_expressions import FunctionExtension
 from .filter_expressions import LogicalExpression
 from .function_extensions import ExpressionType
 from .function_extensions import FilterFunction
-from .lex import tokenize
+from .lex import RE_PROPERTY
+from .lex import Lexer
+from .lex import RegexLexer
+from .lex import iter_tokens
+from .node import JSONPathNodeList
 from .parse import Parser
+from .parse import parse_index
 from .query import JSONPathQuery
+from .segments import JSONPathChildSegment
+from .selectors import FilterSelector
+from .selectors import IndexSelector
+from .selectors import NameSelector
+from .tokens import Token
 from .tokens import TokenStream
+from .tokens import TokenType
 
 if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
     from .filter_expressions import Expression
     from .node import JSONPathNode
-    from .node import JSONPathNodeList
-    from .tokens import Token
+    from .predicate import JSONPathPredicate
+    from .profiling import Profiler
+    from .segments import JSONPathSegment
 
 
 JSONValue = Union[
@@ -48,10 +70,44 @@ JSONValue = Union[
 ]
 """JSON-like data, as you would get from `json.load()`."""
 
+# A shorthand name, a quoted name without escape sequences, or an index
+# without leading zeros. Whitespace is not allowed.
+_SIMPLE_SEGMENT = (
+    rf"\.({RE_PROPERTY.pattern})"
+    r"|\['([^'\\\x00-\x1f]*)'\]"
+    r'|\["([^"\\\x00-\x1f]*)"\]'
+    r"|\[(0|-?[1-9][0-9]*)\]"
+)
+
+RE_SIMPLE_SEGMENT = re.compile(_SIMPLE_SEGMENT)
+RE_SIMPLE_QUERY = re.compile(rf"\$(?:{_SIMPLE_SEGMENT})*")
+
+# Settings used when compiling a query. Changing one of these on an
+# environment clears its query cache.
+_COMPILE_SETTINGS = frozenset(
+    [
+        "max_int_index",
+        "min_int_index",
+        "optimize_queries",
+        "profile_queries",
+        "columnar_filter_threshold",
+    ]
+)
+
 
 class JSONPathEnvironment:
     """JSONPath configuration.
 
+    ## Thread safety
+
+    An environment, and the queries it compiles, can be shared between
+    threads, including on free-threaded builds of CPython. Compiling doesn't
+    change the parser, and applying a query to data doesn't change the query.
+    The query and regex caches don't take a lock on lookup.
+
+    Configure an environment, including `function_extensions`, before sharing
+    it. Changing an environment while other threads are using it is not safe.
+
     ## Class attributes
 
     Attributes:
@@ -62,16 +118,74 @@ class JSONPathEnvironment:
         max_recursion_depth (int): The maximum number of dict/objects and/or
             arrays/lists the recursive descent selector can visit before a
             `JSONPathRecursionError` is thrown.
+        max_nodes_visited (Optional[int]): The maximum number of nodes selectors
+            can be applied to while applying a query to data, including nodes
+            visited by descendant segments and queries embedded in filters,
+            before a `JSONPathLimitError` is raised. Defaults to `None`, no
+            limit.
+        max_nodes_produced (Optional[int]): The maximum number of nodes selectors
+            can select while applying a query to data, including nodes passed
+            on to the next segment, before a `JSONPathLimitError` is raised.
+            Defaults to `None`, no limit.
+        max_filter_evaluations (Optional[int]): The maximum number of times filter
+            expressions can be evaluated while applying a query to data
+            before a `JSONPathLimitError` is raised. Defaults to `None`, no
+            limit.
+        evaluation_timeout (Optional[float]): The maximum number of seconds
+            applying a query to data can take before a `JSONPathLimitError` is
+            raised. This is checked periodically, so a query can run for a
+            little longer. Defaults to `None`, no limit.
+        max_query_complexity (Optional[int]): The maximum complexity score of a
+            query compiled by this environment. `compile()` raises a
+            `JSONPathComplexityError` for queries with a higher score. See
+            `JSONPathQuery.complexity()`. Defaults to `None`, no limit.
+        lexer_class (Lexer): The lexer to use when tokenizing JSONPath expressions.
+            Defaults to `RegexLexer`.
         parser_class (Parser): The parser to use when parsing tokens from the lexer.
+        optimize_queries (bool): If `True`, compiled queries fold constant filter
+            expressions and simplify filters before they are applied to data.
+            Defaults to `True`.
+        regex_cache_size (int): The maximum number of compiled I-Regexp patterns
+            to cache for the `match` and `search` function extensions. Defaults
+            to `128`.
+        query_cache_size (int): The maximum number of query strings to cache
+            compiled queries for. Defaults to `256`.
+        profile_queries (bool): If `True`, queries compiled by this environment
+            record statistics about the nodes they visit and produce, filter
+            evaluations, regex calls and time spent in each segment. See
+            `JSONPathEnvironment.profiler`. Defaults to `False`.
+        columnar_filter_threshold (Optional[int]): The minimum length of an
+            array for filters to be applied to all of its items at once with
+            NumPy, if NumPy is installed. Only filters that compare singular
+            relative queries, like `@.price`, to literals, combined with `&&`,
+            `||` and `!`, are applied this way. Set to `None` to always apply
+            filters one item at a time. Defaults to `1000`.
+        async_yield_interval (int): The number of nodes visited or filter
+            evaluations between giving control back to the event loop when
+            applying a query with `afind()` or `afinditer()`. Defaults to
+            `1000`.
         nondeterministic (bool): If `True`, enable nondeterminism when iterating objects
             and visiting nodes with the recursive descent segment. Defaults to `False`.
     """
 
+    lexer_class: Type[Lexer] = RegexLexer
     parser_class: Type[Parser] = Parser
 
     max_int_index = (2**53) - 1
     min_int_index = -(2**53) + 1
     max_recursion_depth = 100
+    max_nodes_visited: Optional[int] = None
+    max_nodes_produced: Optional[int] = None
+    max_filter_evaluations: Optional[int] = None
+    evaluation_timeout: Optional[float] = None
+    max_query_complexity: Optional[int] = None
+    regex_cache_size = 128
+    query_cache_size = 256
+
+    optimize_queries = True
+    profile_queries = False
+    columnar_filter_threshold: Optional[int] = 1000
+    async_yield_interval = 1000
 
     nondeterministic = False
 
@@ -79,17 +193,65 @@ class JSONPathEnvironment:
         self.parser: Parser = self.parser_class(env=self)
         """The parser bound to this environment."""
 
+        self.regex_cache = function_extensions.RegexCache(self.regex_cache_size)
+        """Compiled I-Regexp patterns shared by `match` and `search`.
+
+        Use `regex_cache.info()` to get cache hit and miss statistics.
+        """
+
+        self.query_cache = QueryCache(self.query_cache_size)
+        """Compiled queries, shared by queries with the same canonical form.
+
+        Use `query_cache.info()` to get cache hit and miss statistics.
+        """
+
+        self.profiler: Optional[Profiler] = None
+        """Profiles for queries compiled by this environment, or `None` if
+        `profile_queries` has never been `True`.
+
+        Use `profiler.profile(query)` to get statistics for a compiled query, or
+        `profiler.report()` for all compiled queries.
+        """
+
+        if self.profile_queries:
+            self._start_profiler()
+
         self.function_extensions: Dict[str, FilterFunction] = {}
         """A list of function extensions available to filters."""
 
         self.setup_function_extensions()
 
+    def __setattr__(self, name: str, value: object) -> None:
+        super().__setattr__(name, value)
+        if name in _COMPILE_SETTINGS and hasattr(self, "query_cache"):
+            # Queries compiled with the old value must not be reused.
+            self.query_cache.clear()
+            if name == "profile_queries" and value and self.profiler is None:
+                self._start_profiler()
+
+    def _start_profiler(self) -> None:
+        from .profiling import Profiler  # noqa: PLC0415
+
+        self.profiler = Profiler()
+
     def compile(self, query: str) -> JSONPathQuery:  # noqa: A003
         """Prepare a JSONPath expression ready for repeated application.
 
         Arguments:
             query: A JSONPath expression.
 
+        Compiled queries are cached. Queries with the same canonical form, like
+        `$.a` and `$['a']`, share one `JSONPathQuery` instance. Errors raised
+        while applying a shared instance report positions in the query string
+        it was first compiled from.
+
+        Setting `max_int_index`, `min_int_index`, `optimize_queries`,
+        `profile_queries` or `columnar_filter_threshold` on this environment
+        clears the cache, so later calls compile queries with the new value.
+        Queries compiled earlier keep the old value. Resource limits and
+        `max_query_complexity` don't clear the cache, as they are checked
+        each time a query is applied or returned from the cache.
+
         Returns:
             A `JSONPathQuery` ready to match against a JSON-like value.
 
@@ -97,52 +259,337 @@ class JSONPathEnvironment:
             JSONPathSyntaxError: If _query_ is invalid.
             JSONPathTypeError: If filter functions are given arguments of an
                 unacceptable type.
+            JSONPathComplexityError: If the query's complexity score is
+                greater than `max_query_complexity`.
         """
-        tokens = tokenize(query)
-        stream = TokenStream(tokens)
-        return JSONPathQuery(env=self, segments=tuple(self.parser.parse(stream)))
+        compiled = self.query_cache.get(query)
+        if compiled is not None:
+            # `max_query_complexity` might have changed since _query_ was cached.
+            if self.max_query_complexity is not None:
+                self._check_complexity(compiled)
+            return compiled
+
+        if RE_SIMPLE_QUERY.fullmatch(query):
+            compiled = JSONPathQuery(env=self, segments=self._parse_simple_query(query))
+        else:
+            stream = TokenStream(iter_tokens(query, self.lexer_class))
+            compiled = JSONPathQuery(
+                env=self, segments=tuple(self.parser.parse(stream))
+            )
+
+        self._check_complexity(compiled)
+        return self.query_cache.put(query, compiled)
+
+    def _check_complexity(self, query: JSONPathQuery) -> None:
+        if self.max_query_complexity is not None:
+            complexity = query.complexity()
+            if complexity.score > self.max_query_complexity:
+                raise JSONPathComplexityError(
+                    f"query complexity {complexity.score} exceeds "
+                    f"maximum {self.max_query_complexity}",
+                    complexity=complexity,
+                )
+
+    def canonical(self, query: str) -> str:
+        """Return the canonical form of JSONPath expression _query_.
+
+        Arguments:
+            query: A JSONPath expression.
+
+        Returns:
+            _query_ in canonical form, like `$['a'][0]` for `$.a[0]`.
+
+        Raises:
+            JSONPathSyntaxError: If _query_ is invalid.
+            JSONPathTypeError: If filter functions are given arguments of an
+                unacceptable type.
+        """
+        return self.compile(query).canonical()
+
+    def explain(self, query: str) -> str:
+        """Return a description of how JSONPath expression _query_ is evaluated.
+
+        This is like `JSONPathQuery.explain()`, but also describes how _query_
+        is compiled.
+
+        Arguments:
+            query: A JSONPath expression.
+
+        Raises:
+            JSONPathSyntaxError: If _query_ is invalid.
+            JSONPathTypeError: If filter functions are given arguments of an
+                unacceptable type.
+        """
+        from .explain import explain  # noqa: PLC0415
+
+        if RE_SIMPLE_QUERY.fullmatch(query):
+            compiled = "simple query, built without the lexer and parser"
+        else:
+            compiled = f"{self.lexer_class.__name__} and {self.parser_class.__name__}"
+
+        return explain(self.compile(query), compiled)
+
+    def compile_filter(self, expression: str) -> JSONPathPredicate:
+        """Prepare filter expression _expression_ for testing JSON-like values.
+
+        _expression_ is what you'd write after `?` in a filter selector, like
+        `@.price > 10 && match(@.sku, 'A.*')`. The resulting predicate is
+        applied to a value directly, without wrapping it in an array and
+        without creating any nodes. Both `@` and `$` refer to the value being
+        tested.
+
+        Arguments:
+            expression: A JSONPath filter expression.
+
+        Returns:
+            A `JSONPathPredicate`, a callable returning `True` or `False` for a
+            JSON-like value.
+
+        Raises:
+            JSONPathSyntaxError: If _expression_ is invalid.
+            JSONPathTypeError: If filter functions are given arguments of an
+                unacceptable type.
+            JSONPathComplexityError: If the expression's complexity score is
+                greater than `max_query_complexity`.
+        """
+        from .predicate import JSONPathPredicate  # noqa: PLC0415
+
+        # The lexer only scans filter expressions inside a filter selector.
+        query = f"$[?{expression}]"
+        try:
+            stream = TokenStream(iter_tokens(query, self.lexer_class))
+            segments = tuple(self.parser.parse(stream))
+        except JSONPathError as err:
+            if err.token is not None:
+                err.token = _filter_token(err.token, expression)
+            raise
+
+        # Guard against expressions like `@.a][?@.b` closing the filter early.
+        selectors = [selector for segment in segments for selector in segment.selectors]
+        if len(selectors) > 1:
+            raise JSONPathSyntaxError(
+                "expected a single filter expression",
+                token=_filter_token(selectors[1].token, expression),
+            )
+
+        selector = selectors[0]
+        assert isinstance(selector, FilterSelector)
+        self._check_complexity(JSONPathQuery(env=self, segments=segments))
+        return JSONPathPredicate(env=self, expression=selector.expression)
+
+    def _parse_simple_query(self, query: str) -> Tuple[JSONPathSegment, ...]:
+        """Build segments for a query matched by `RE_SIMPLE_QUERY`.
+
+        This is equivalent to, but faster than, using the lexer and parser for
+        queries made up of name and index selectors only.
+        """
+        segments: List[JSONPathSegment] = []
+
+        for match in RE_SIMPLE_SEGMENT.finditer(query, 1):
+            group = match.lastindex
+            assert group is not None
+            value = match.group(group)
+            start = match.start(group)
+
+            if group == 1:  # noqa: PLR2004
+                token = Token(TokenType.PROPERTY, value, start, query)
+                selector: Union[NameSelector, IndexSelector] = NameSelector(
+                    env=self, token=token, name=value
+                )
+            else:
+                token = Token(TokenType.LBRACKET, "[", match.start(), query)
+                if group == 4:  # noqa: PLR2004
+                    index_token = Token(TokenType.INDEX, value, start, query)
+                    selector = IndexSelector(
+                        env=self, token=index_token, index=parse_index(index_token)
+                    )
+                else:
+                    selector = NameSelector(
+                        env=self,
+                        token=Token(
+                            TokenType.SINGLE_QUOTE_STRING
+                            if group == 2  # noqa: PLR2004
+                            else TokenType.DOUBLE_QUOTE_STRING,
+                            value,
+                            start,
+                            query,
+                        ),
+                        name=value,
+                    )
+
+            segments.append(
+                JSONPathChildSegment(env=self, token=token, selectors=(selector,))
+            )
+
+        return tuple(segments)
 
     def finditer(
         self,
         query: str,
         value: JSONValue,
+        *,
+        limit: Optional[int] = None,
+        offset: int = 0,
     ) -> Iterable[JSONPathNode]:
         """Generate `JSONPathNode` instances for each match of _query_ in _value_.
 
         Arguments:
             query: A JSONPath expression.
             value: JSON-like data to query, as you'd get from `json.load`.
+            limit: The maximum number of nodes to produce. Defaults to `None`,
+                no limit.
+            offset: The number of matching nodes to skip before producing
+                nodes. Defaults to `0`.
 
         Returns:
             An iterator yielding `JSONPathNode` objects for each match.
 
         Raises:
+            ValueError: If _limit_ or _offset_ is negative.
             JSONPathSyntaxError: If the query is invalid.
             JSONPathTypeError: If a filter expression attempts to use types in
                 an incompatible way.
+            JSONPathLimitError: If applying the query exceeds one of this
+                environment's resource limits.
         """
-        return self.compile(query).finditer(value)
+        return self.compile(query).finditer(value, limit=limit, offset=offset)
 
     def find(
         self,
         query: str,
         value: JSONValue,
+        *,
+        limit: Optional[int] = None,
+        offset: int = 0,
     ) -> JSONPathNodeList:
         """Apply the JSONPath expression _query_ to JSON-like data _value_.
 
         Arguments:
             query: A JSONPath expression.
             value: JSON-like data to query, as you'd get from `json.load`.
+            limit: The maximum number of nodes to return. Defaults to `None`,
+                no limit.
+            offset: The number of matching nodes to skip. Defaults to `0`.
 
         Returns:
             A list of `JSONPathNode` instance.
 
         Raises:
+            ValueError: If _limit_ or _offset_ is negative.
+            JSONPathSyntaxError: If the query is invalid.
+            JSONPathTypeError: If a filter expression attempts to use types in
+                an incompatible way.
+            JSONPathLimitError: If applying the query exceeds one of this
+                environment's resource limits.
+        """
+        return self.compile(query).find(value, limit=limit, offset=offset)
+
+    def afinditer(
+        self,
+        query: str,
+        value: JSONValue,
+        *,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> AsyncIterator[JSONPathNode]:
+        """Generate nodes for each match of _query_ in _value_, asynchronously.
+
+        See `JSONPathQuery.afinditer()`.
+
+        Arguments:
+            query: A JSONPath expression.
+            value: JSON-like data to query, as you'd get from `json.load`.
+            limit: The maximum number of nodes to produce. Defaults to `None`,
+                no limit.
+            offset: The number of matching nodes to skip before producing
+                nodes. Defaults to `0`.
+
+        Returns:
+            An asynchronous iterator yielding `JSONPathNode` objects for each
+            match.
+
+        Raises:
+            ValueError: If _limit_ or _offset_ is negative.
+            JSONPathSyntaxError: If the query is invalid.
+            JSONPathTypeError: If a filter expression attempts to use types in
+                an incompatible way.
+            JSONPathLimitError: If applying the query exceeds one of this
+                environment's resource limits.
+        """
+        return self.compile(query).afinditer(value, limit=limit, offset=offset)
+
+    async def afind(
+        self,
+        query: str,
+        value: JSONValue,
+        *,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        executor: Optional[Executor] = None,
+    ) -> JSONPathNodeList:
+        """Apply _query_ to _value_ without blocking the event loop.
+
+        See `JSONPathQuery.afind()`.
+
+        Arguments:
+            query: A JSONPath expression.
+            value: JSON-like data to query, as you'd get from `json.load`.
+            limit: The maximum number of nodes to return. Defaults to `None`,
+                no limit.
+            offset: The number of matching nodes to skip. Defaults to `0`.
+            executor: An optional `concurrent.futures.Executor` to apply the
+                query in.
+
+        Returns:
+            A list of `JSONPathNode` instances.
+
+        Raises:
+            ValueError: If _limit_ or _offset_ is negative.
+            JSONPathSyntaxError: If the query is invalid.
+            JSONPathTypeError: If a filter expression attempts to use types in
+                an incompatible way.
+            JSONPathLimitError: If applying the query exceeds one of this
+                environment's resource limits.
+        """
+        return await self.compile(query).afind(
+            value, limit=limit, offset=offset, executor=executor
+        )
+
+    def afinditer_stream(
+        self,
+        query: str,
+        stream: AsyncIterable[bytes],
+        *,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> AsyncIterator[JSONPathNode]:
+        """Generate nodes for each match of _query_ in a JSON byte stream.
+
+        See `JSONPathQuery.afinditer_stream()`.
+
+        Arguments:
+            query: A JSONPath expression.
+            stream: An asynchronous iterable of UTF-8 encoded chunks of a JSON
+                document.
+            limit: The maximum number of nodes to produce. Defaults to `None`,
+                no limit.
+            offset: The number of matching nodes to skip before producing
+                nodes. Defaults to `0`.
+
+        Returns:
+            An asynchronous iterator yielding `JSONPathNode` objects for each
+            match.
+
+        Raises:
+            ValueError: If _limit_ or _offset_ is negative.
             JSONPathSyntaxError: If the query is invalid.
+            json.JSONDecodeError: If _stream_ is not a valid JSON document.
             JSONPathTypeError: If a filter expression attempts to use types in
                 an incompatible way.
+            JSONPathLimitError: If applying the query exceeds one of this
+                environment's resource limits.
         """
-        return self.compile(query).find(value)
+        return self.compile(query).afinditer_stream(stream, limit=limit, offset=offset)
 
     def find_one(
         self,
@@ -163,15 +610,89 @@ class JSONPathEnvironment:
             JSONPathSyntaxError: If the query is invalid.
             JSONPathTypeError: If a filter expression attempts to use types in
                 an incompatible way.
+            JSONPathLimitError: If applying the query exceeds one of this
+                environment's resource limits.
         """
         return self.compile(query).find_one(value)
 
+    def count(self, query: str, value: JSONValue) -> int:
+        """Return the number of nodes matched by applying _query_ to _value_.
+
+        Arguments:
+            query: A JSONPath expression.
+            value: JSON-like data to query, as you'd get from `json.load`.
+
+        Raises:
+            JSONPathSyntaxError: If the query is invalid.
+            JSONPathTypeError: If a filter expression attempts to use types in
+                an incompatible way.
+            JSONPathLimitError: If applying the query exceeds one of this
+                environment's resource limits.
+        """
+        return self.compile(query).count(value)
+
+    def exists(self, query: str, value: JSONValue) -> bool:
+        """Return `True` if _query_ matches at least one node in _value_.
+
+        Arguments:
+            query: A JSONPath expression.
+            value: JSON-like data to query, as you'd get from `json.load`.
+
+        Raises:
+            JSONPathSyntaxError: If the query is invalid.
+            JSONPathTypeError: If a filter expression attempts to use types in
+                an incompatible way.
+            JSONPathLimitError: If applying the query exceeds one of this
+                environment's resource limits.
+        """
+        return self.compile(query).exists(value)
+
+    def find_many(
+        self,
+        queries: Iterable[str],
+        value: JSONValue,
+    ) -> List[JSONPathNodeList]:
+        """Apply each JSONPath expression in _queries_ to JSON-like data _value_.
+
+        Each distinct query, by canonical form, is applied to _value_ once.
+
+        Arguments:
+            queries: JSONPath expressions.
+            value: JSON-like data to query, as you'd get from `json.load`.
+
+        Returns:
+            A list of `JSONPathNode` instances for each query in _queries_, in
+            the same order as _queries_.
+
+        Raises:
+            JSONPathSyntaxError: If any of _queries_ are invalid.
+            JSONPathTypeError: If a filter expression attempts to use types in
+                an incompatible way.
+            JSONPathLimitError: If applying a query exceeds one of this
+                environment's resource limits.
+        """
+        compiled = [self.compile(query) for query in queries]
+        results: Dict[str, JSONPathNodeList] = {}
+        node_lists: List[JSONPathNodeList] = []
+
+        for query in compiled:
+            key = query.canonical()
+            if key not in results:
+                results[key] = query.find(value)
+                node_lists.append(results[key])
+            else:
+                node_lists.append(JSONPathNodeList(results[key]))
+
+        return node_lists
+
     def setup_function_extensions(self) -> None:
         """Initialize function extensions."""
         self.function_extensions["length"] = function_extensions.Length()
         self.function_extensions["count"] = function_extensions.Count()
-        self.function_extensions["match"] = function_extensions.Match()
-        self.function_extensions["search"] = function_extensions.Search()
+        self.function_extensions["match"] = function_extensions.Match(self.regex_cache)
+        self.function_extensions["search"] = function_extensions.Search(
+            self.regex_cache
+        )
         self.function_extensions["value"] = function_extensions.Value()
 
     def validate_function_extension_signature(
@@ -243,3 +764,9 @@ class JSONPathEnvironment:
         if isinstance(func, FilterFunction):
             return func.return_type
         return None
+
+
+def _filter_token(token: Token, expression: str) -> Token:
+    """Return a copy of _token_ positioned in _expression_ instead of `$[?...]`."""
+    index = min(max(token.index - 3, 0), len(expression))
+    return Token(token.type_, token.value, index, expression, token.message)
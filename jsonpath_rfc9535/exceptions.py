@@ -6,6 +6,8 @@ from typing import TYPE_CHECKING
 from typing import Optional
 
 if TYPE_CHECKING:
+    from .complexity import Complexity
+    from .limits import EvaluationStats
     from .tokens import Token
 
 
@@ -102,3 +104,31 @@ class JSONPathRecursionError(JSONPathError):
     def __init__(self, *args: object, token: Token) -> None:
         super().__init__(*args)
         self.token = token
+
+
+class JSONPathLimitError(JSONPathError):
+    """An exception raised when applying a query exceeds a resource limit.
+
+    Arguments:
+        args: Arguments passed to `Exception`.
+        token: The token that caused the error.
+        stats: Work done applying the query before the limit was exceeded.
+    """
+
+    def __init__(self, *args: object, token: Token, stats: EvaluationStats) -> None:
+        super().__init__(*args)
+        self.token = token
+        self.stats = stats
+
+
+class JSONPathComplexityError(JSONPathError):
+    """An exception raised when a query's complexity score is too high.
+
+    Arguments:
+        args: Arguments passed to `Exception`.
+        complexity: The query's complexity score and contributing features.
+    """
+
+    def __init__(self, *args: object, complexity: Complexity) -> None:
+        super().__init__(*args)
+        self.complexity = complexity
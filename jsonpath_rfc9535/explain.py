@@ -0,0 +1,209 @@
+"""Human readable query plans for compiled JSONPath queries."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import List
+from typing import Optional
+
+from .columnar import numpy_available
+from .filter_expressions import ComparisonExpression
+from .filter_expressions import FilterExpressionLiteral
+from .filter_expressions import FilterQuery
+from .filter_expressions import FunctionExtension
+from .filter_expressions import LogicalExpression
+from .filter_expressions import PrefixExpression
+from .filter_expressions import RootFilterQuery
+from .function_extensions import Match
+from .function_extensions import Search
+from .function_extensions._pattern import describe_pattern
+from .optimize import optimize_segments
+from .segments import JSONPathRecursiveDescentSegment
+from .selectors import FilterSelector
+from .selectors import IndexSelector
+from .selectors import KeysSelector
+from .selectors import NameSelector
+from .selectors import SliceSelector
+from .selectors import WildcardSelector
+
+if TYPE_CHECKING:
+    from .filter_expressions import Expression
+    from .query import JSONPathQuery
+    from .segments import JSONPathSegment
+    from .selectors import JSONPathSelector
+
+INDENT = "  "
+
+_SELECTOR_KINDS = {
+    NameSelector: "name",
+    IndexSelector: "index",
+    SliceSelector: "slice",
+    WildcardSelector: "wildcard",
+    FilterSelector: "filter",
+    KeysSelector: "keys",
+}
+
+
+def explain(query: JSONPathQuery, compiled: Optional[str] = None) -> str:
+    """Return a description of how _query_ will be evaluated.
+
+    Arguments:
+        query: A compiled JSONPath query.
+        compiled: An optional description of how _query_ was compiled.
+
+    Returns:
+        A multi-line string describing _query_'s segments, selectors and
+        filter expressions, optimizations applied at compile time, fast paths
+        used at evaluation time and features that are expensive to evaluate.
+    """
+    return _Explainer(query).explain(compiled)
+
+
+class _Explainer:
+    __slots__ = (
+        "query",
+        "plan",
+        "optimizations",
+        "fast_paths",
+        "descent",
+        "root_queries",
+        "relative_queries",
+        "dynamic_regex",
+    )
+
+    def __init__(self, query: JSONPathQuery) -> None:
+        self.query = query
+        self.plan: List[str] = []
+        self.optimizations: List[str] = []
+        self.fast_paths: List[str] = []
+        self.descent = 0
+        self.root_queries = 0
+        self.relative_queries = 0
+        self.dynamic_regex = 0
+
+    def explain(self, compiled: Optional[str] = None) -> str:
+        env = self.query.env
+        self._visit_query(self.query, 1)
+
+        lines = [f"query: {self.query}"]
+
+        if compiled:
+            lines.append(f"compile: {compiled}")
+
+        lines.append(
+            "evaluation: lazy, "
+            + ("nondeterministic" if env.nondeterministic else "deterministic")
+            + (", optimized" if env.optimize_queries else ", not optimized")
+            + (", profiled" if env.profile_queries else "")
+        )
+
+        lines.append("plan:")
+        lines.extend(self.plan or [f"{INDENT}root node"])
+        lines.append("optimizations:")
+        lines.extend(f"{INDENT}{note}" for note in self.optimizations or ["none"])
+        lines.append("fast paths:")
+        lines.extend(f"{INDENT}{note}" for note in self.fast_paths or ["none"])
+        lines.append("cost:")
+        lines.append(f"{INDENT}singular query: {_yes(self.query.singular_query())}")
+        lines.append(f"{INDENT}descendant segments: {self.descent}")
+        lines.append(f"{INDENT}root queries in filters: {self.root_queries}")
+        lines.append(f"{INDENT}relative queries in filters: {self.relative_queries}")
+        lines.append(f"{INDENT}dynamic regex patterns: {self.dynamic_regex}")
+        lines.append(f"{INDENT}complexity score: {self.query.complexity().score}")
+
+        return "\n".join(lines)
+
+    def _visit_query(self, query: JSONPathQuery, depth: int, prefix: str = "") -> None:
+        if query.env.optimize_queries:
+            notes: List[str] = []
+            optimized = optimize_segments(query.segments, notes)
+            self.optimizations.extend(prefix + note for note in notes)
+        else:
+            optimized = query.segments
+
+        for segment in optimized:
+            for selector in segment.selectors:
+                if isinstance(selector, KeysSelector):
+                    self.fast_paths.append(
+                        f"{prefix}keys selector `{selector}` selects names with "
+                        "dict lookups, and indices and slices as ranges"
+                    )
+                elif isinstance(selector, FilterSelector) and selector.columns:
+                    self.fast_paths.append(
+                        f"{prefix}filter `{selector}` is applied to arrays of "
+                        f"{query.env.columnar_filter_threshold} or more items "
+                        "a column at a time"
+                        + ("" if numpy_available() else ", if NumPy is installed")
+                    )
+
+        for segment in query.segments:
+            self._visit_segment(segment, depth)
+
+    def _visit_segment(self, segment: JSONPathSegment, depth: int) -> None:
+        if isinstance(segment, JSONPathRecursiveDescentSegment):
+            self.descent += 1
+            kind = "descendant segment, visits every node below its input nodes"
+        else:
+            kind = "child segment"
+
+        self.plan.append(f"{INDENT * depth}{segment}  {kind}")
+
+        for selector in segment.selectors:
+            self._visit_selector(selector, depth + 1)
+
+    def _visit_selector(self, selector: JSONPathSelector, depth: int) -> None:
+        kind = _SELECTOR_KINDS.get(type(selector), type(selector).__name__)
+        self.plan.append(f"{INDENT * depth}{selector}  {kind} selector")
+
+        if isinstance(selector, FilterSelector):
+            self._visit_expression(selector.expression.expression, depth + 1)
+
+    def _visit_expression(self, expression: Expression, depth: int) -> None:  # noqa: PLR0912
+        indent = INDENT * depth
+
+        if isinstance(expression, (LogicalExpression, ComparisonExpression)):
+            self.plan.append(f"{indent}{expression.operator}")
+            self._visit_expression(expression.left, depth + 1)
+            self._visit_expression(expression.right, depth + 1)
+        elif isinstance(expression, PrefixExpression):
+            self.plan.append(f"{indent}{expression.operator}")
+            self._visit_expression(expression.right, depth + 1)
+        elif isinstance(expression, FilterQuery):
+            if isinstance(expression, RootFilterQuery):
+                self.root_queries += 1
+                kind = "root query, evaluated for every candidate node"
+            else:
+                self.relative_queries += 1
+                kind = "relative query"
+
+            if expression.query.singular_query():
+                kind += ", singular"
+
+            self.plan.append(f"{indent}{expression}  {kind}")
+            self._visit_query(expression.query, depth + 1, f"{expression}: ")
+        elif isinstance(expression, FunctionExtension):
+            self.plan.append(f"{indent}{expression.name}()  function extension")
+            self._visit_function(expression)
+            for arg in expression.args:
+                self._visit_expression(arg, depth + 1)
+        elif isinstance(expression, FilterExpressionLiteral):
+            self.plan.append(f"{indent}{expression}  literal")
+        else:
+            self.plan.append(f"{indent}{expression}")
+
+    def _visit_function(self, expression: FunctionExtension) -> None:
+        func = self.query.env.function_extensions.get(expression.name)
+        if not isinstance(func, (Match, Search)) or len(expression.args) != 2:  # noqa: PLR2004
+            return
+
+        pattern = expression.args[1]
+        if isinstance(pattern, FilterExpressionLiteral) and isinstance(
+            pattern.value, str
+        ):
+            self.fast_paths.append(f"{expression}: {describe_pattern(pattern.value)}")
+        else:
+            self.dynamic_regex += 1
+
+
+def _yes(value: bool) -> str:  # noqa: FBT001
+    return "yes" if value else "no"
@@ -12,9 +12,12 @@ from typing import TypeVar
 
 from jsonpath_rfc9535.function_extensions.filter_function import ExpressionType
 from jsonpath_rfc9535.function_extensions.filter_function import FilterFunction
+from jsonpath_rfc9535.function_extensions.filter_function import NodesArgument
 
 from .exceptions import JSONPathTypeError
+from .node import NOTHING
 from .node import JSONPathNodeList
+from .node import Nothing as Nothing  # noqa: PLC0414
 from .serialize import canonical_string
 
 if TYPE_CHECKING:
@@ -48,6 +51,7 @@ class Expression(ABC):
 PRECEDENCE_LOWEST = 1
 PRECEDENCE_LOGICAL_OR = 3
 PRECEDENCE_LOGICAL_AND = 4
+PRECEDENCE_RELATIONAL = 5
 PRECEDENCE_PREFIX = 7
 
 
@@ -95,6 +99,10 @@ class FilterExpression(Expression):
             expr = f"!{operand}"
             return f"({expr})" if parent_precedence > PRECEDENCE_PREFIX else expr
 
+        if isinstance(expression, ComparisonExpression):
+            expr = str(expression)
+            return f"({expr})" if parent_precedence > PRECEDENCE_RELATIONAL else expr
+
         return str(expression)
 
 
@@ -276,6 +284,14 @@ class FilterQuery(Expression, ABC):
     def __eq__(self, other: object) -> bool:
         return isinstance(other, FilterQuery) and str(self) == str(other)
 
+    @abstractmethod
+    def count(self, context: FilterContext) -> int:
+        """Return the number of nodes this query selects in the given _context_."""
+
+    @abstractmethod
+    def values(self, context: FilterContext) -> List[object]:
+        """Return values of nodes this query selects in the given _context_."""
+
 
 class RelativeFilterQuery(FilterQuery):
     """A JSONPath expression starting at the current node."""
@@ -294,6 +310,18 @@ class RelativeFilterQuery(FilterQuery):
 
         return JSONPathNodeList(self.query.find(context.current))
 
+    def count(self, context: FilterContext) -> int:
+        """Return the number of nodes this query selects in the given _context_."""
+        if not isinstance(context.current, (list, dict)):
+            return 1 if self.query.empty() else 0
+        return self.query.count(context.current)
+
+    def values(self, context: FilterContext) -> List[object]:
+        """Return values of nodes this query selects in the given _context_."""
+        if not isinstance(context.current, (list, dict)):
+            return [context.current] if self.query.empty() else []
+        return [node.value for node in self.query.finditer(context.current)]
+
 
 class RootFilterQuery(FilterQuery):
     """A JSONPath expression starting at the root node."""
@@ -307,6 +335,14 @@ class RootFilterQuery(FilterQuery):
         """Evaluate the filter expression in the given _context_."""
         return JSONPathNodeList(self.query.find(context.root))
 
+    def count(self, context: FilterContext) -> int:
+        """Return the number of nodes this query selects in the given _context_."""
+        return self.query.count(context.root)
+
+    def values(self, context: FilterContext) -> List[object]:
+        """Return values of nodes this query selects in the given _context_."""
+        return [node.value for node in self.query.finditer(context.root)]
+
 
 class FunctionExtension(Expression):
     """A filter function."""
@@ -335,7 +371,17 @@ class FunctionExtension(Expression):
             func = context.env.function_extensions[self.name]
         except KeyError:
             return NOTHING
-        args = [arg.evaluate(context) for arg in self.args]
+        if func.nodes_arguments is None:
+            args = [arg.evaluate(context) for arg in self.args]
+        else:
+            args = [
+                _nodes_argument(arg, form, context)
+                if typ == ExpressionType.NODES
+                else arg.evaluate(context)
+                for arg, typ, form in zip(  # noqa: B905
+                    self.args, func.arg_types, func.nodes_arguments
+                )
+            ]
         return func(*self._unpack_node_lists(func, args))
 
     def _unpack_node_lists(
@@ -365,6 +411,29 @@ class FunctionExtension(Expression):
         return _args
 
 
+def _nodes_argument(
+    arg: Expression, form: NodesArgument, context: FilterContext
+) -> object:
+    """Evaluate function argument _arg_ of type `NODES` in the given _context_.
+
+    Embedded queries produce the number of nodes or their values directly,
+    without building a node list.
+    """
+    if form == NodesArgument.COUNT:
+        if isinstance(arg, FilterQuery):
+            return arg.count(context)
+        nodes = arg.evaluate(context)
+        return len(nodes) if isinstance(nodes, JSONPathNodeList) else nodes
+
+    if form == NodesArgument.VALUES:
+        if isinstance(arg, FilterQuery):
+            return arg.values(context)
+        nodes = arg.evaluate(context)
+        return nodes.values() if isinstance(nodes, JSONPathNodeList) else nodes
+
+    return arg.evaluate(context)
+
+
 class FilterContext:
     """Contextual information and data for evaluating a filter expression."""
 
@@ -389,26 +458,6 @@ class FilterContext:
         return f"FilterContext(current={self.current})"
 
 
-class Nothing:
-    """The special result "Nothing"."""
-
-    __slots__ = ()
-
-    def __eq__(self, other: object) -> bool:
-        return isinstance(other, Nothing) or (
-            isinstance(other, JSONPathNodeList) and other.empty()
-        )
-
-    def __str__(self) -> str:
-        return "<NOTHING>"
-
-    def __repr__(self) -> str:
-        return "<NOTHING>"
-
-
-NOTHING = Nothing()
-
-
 def _is_truthy(obj: object) -> bool:
     """Test for truthiness when evaluating filter expressions."""
     if isinstance(obj, JSONPathNodeList) and len(obj) == 0:
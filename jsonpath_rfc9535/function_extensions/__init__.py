@@ -1,18 +1,25 @@
 # noqa: D104
+from jsonpath_rfc9535.cache import CacheInfo
+
+from ._pattern import RegexCache
 from .count import Count
 from .filter_function import ExpressionType
 from .filter_function import FilterFunction
+from .filter_function import NodesArgument
 from .length import Length
 from .match import Match
 from .search import Search
 from .value import Value
 
 __all__ = (
+    "CacheInfo",
     "Count",
     "ExpressionType",
     "FilterFunction",
     "Length",
     "Match",
+    "NodesArgument",
+    "RegexCache",
     "Search",
     "Value",
 )
@@ -1,7 +1,36 @@
+"""I-Regexp pattern translation and caching.
+
+`regex` and `iregexp_check` are imported when the first pattern is compiled,
+not when this module is imported. Literal patterns don't need `regex` at all.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import FrozenSet
 from typing import List
+from typing import Optional
+from typing import Protocol
+from typing import Tuple
+
+from jsonpath_rfc9535.cache import MISSING
+from jsonpath_rfc9535.cache import LRUCache
+
+# The value of `regex.VERSION1`, so we don't have to import `regex` to use it.
+VERSION1 = 256
+
+# Characters with special meaning in an I-Regexp pattern, or in a translated
+# `regex` pattern, like the `^` and `$` anchors.
+_META = frozenset(".\\?*+{}()|[]^$")
+
+# Characters that can follow a backslash to stand for themselves.
+_ESCAPABLE = frozenset("()*+-.?[\\]^{|}")
+
+_SURROGATE = re.compile("[\ud800-\udfff]")
 
 
 def map_re(pattern: str) -> str:
+    """Translate I-Regexp _pattern_ to an equivalent `regex` pattern."""
     escaped = False
     char_class = False
     parts: List[str] = []
@@ -29,3 +58,194 @@ def map_re(pattern: str) -> str:
             parts.append(ch)
 
     return "".join(parts)
+
+
+class CompiledPattern(Protocol):
+    """A compiled I-Regexp pattern, as held by a `RegexCache`."""
+
+    def fullmatch(self, string: str) -> object:
+        """Return a truthy value if all of _string_ matches this pattern."""
+
+    def search(self, string: str) -> object:
+        """Return a truthy value if any part of _string_ matches this pattern."""
+
+
+class RegexCache(LRUCache[Tuple[str, int], Optional[CompiledPattern]]):
+    """A size-bounded, least recently used cache of compiled I-Regexp patterns.
+
+    Patterns are validated with `iregexp_check`, translated with `map_re` and
+    compiled once per (pattern, flags) pair. Invalid patterns are cached too,
+    as `None`, so we don't repeatedly check them.
+
+    Literal patterns, prefix patterns like `abc.*` and alternations of literals
+    are compiled to objects that use `str` operations instead of the regex
+    engine.
+
+    A `RegexCache` can be shared between threads. Two threads that miss the
+    same pattern at the same time might both compile it.
+
+    Arguments:
+        maxsize: The maximum number of patterns to hold in the cache. If
+            _maxsize_ is less than one, nothing is cached.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, maxsize: int = 128) -> None:
+        super().__init__(maxsize)
+
+    def get(self, pattern: str, flags: int = 0) -> Optional[CompiledPattern]:
+        """Return a compiled regex for I-Regexp _pattern_.
+
+        Returns `None` if _pattern_ is not a valid I-Regexp pattern.
+        """
+        key = (pattern, flags)
+        compiled = self.lookup(key)
+        if compiled is MISSING:
+            compiled = _compile(pattern, flags)
+            self.store(key, compiled)
+        return compiled
+
+
+def _compile(pattern: str, flags: int) -> Optional[CompiledPattern]:
+    from iregexp_check import check  # noqa: PLC0415
+
+    if not check(pattern):
+        return None
+
+    fast = _fast_path(pattern)
+    if fast is not None:
+        return fast
+
+    import regex  # noqa: PLC0415
+
+    try:
+        return regex.compile(map_re(pattern), flags)
+    except regex.error:
+        return None
+
+
+def describe_pattern(pattern: str) -> str:
+    """Return a short description of how I-Regexp _pattern_ will be matched."""
+    from iregexp_check import check  # noqa: PLC0415
+
+    if not check(pattern):
+        return "invalid I-Regexp pattern, never matches"
+
+    fast = _fast_path(pattern)
+    if isinstance(fast, _LiteralPattern):
+        return "literal pattern, matched with str operations"
+    if isinstance(fast, _PrefixPattern):
+        return "prefix pattern, matched with str operations"
+    if isinstance(fast, _AlternationPattern):
+        return "alternation of literals, matched with str operations"
+    return "matched with the regex engine"
+
+
+def _fast_path(pattern: str) -> Optional[CompiledPattern]:  # noqa: PLR0911
+    """Return a `str` based equivalent of _pattern_, if one is available.
+
+    Assumes _pattern_ is a valid I-Regexp pattern.
+    """
+    branches: List[str] = []
+    chars: List[str] = []
+    index = 0
+    length = len(pattern)
+
+    while index < length:
+        ch = pattern[index]
+        if ch == "\\":
+            if index + 1 < length and pattern[index + 1] in _ESCAPABLE:
+                chars.append(pattern[index + 1])
+                index += 2
+                continue
+            return None
+
+        if ch == "|":
+            branches.append("".join(chars))
+            chars = []
+        elif ch == "." and index == length - 2 and pattern[-1] == "*":
+            if branches:
+                return None
+            return _PrefixPattern("".join(chars))
+        elif ch in _META:
+            return None
+        else:
+            chars.append(ch)
+
+        index += 1
+
+    if not branches:
+        return _LiteralPattern("".join(chars))
+
+    branches.append("".join(chars))
+    return _AlternationPattern(frozenset(branches))
+
+
+def _dot_star(string: str) -> bool:
+    """Return `True` if _string_ matches the translated I-Regexp pattern `.*`.
+
+    The dot matches anything except for carriage returns and line feeds, and
+    surrogates are consumed in pairs.
+    """
+    if "\n" in string or "\r" in string:
+        return False
+
+    if string.isascii() or not _SURROGATE.search(string):
+        return True
+
+    run = 0
+    for ch in string:
+        if "\ud800" <= ch <= "\udfff":
+            run += 1
+        elif run % 2:
+            return False
+        else:
+            run = 0
+
+    return run % 2 == 0
+
+
+class _LiteralPattern:
+    """A pattern without any special characters."""
+
+    __slots__ = ("literal",)
+
+    def __init__(self, literal: str) -> None:
+        self.literal = literal
+
+    def fullmatch(self, string: str) -> bool:
+        return string == self.literal
+
+    def search(self, string: str) -> bool:
+        return self.literal in string
+
+
+class _PrefixPattern:
+    """A literal followed by `.*`."""
+
+    __slots__ = ("prefix",)
+
+    def __init__(self, prefix: str) -> None:
+        self.prefix = prefix
+
+    def fullmatch(self, string: str) -> bool:
+        return string.startswith(self.prefix) and _dot_star(string[len(self.prefix) :])
+
+    def search(self, string: str) -> bool:
+        return self.prefix in string
+
+
+class _AlternationPattern:
+    """Two or more literal branches."""
+
+    __slots__ = ("branches",)
+
+    def __init__(self, branches: FrozenSet[str]) -> None:
+        self.branches = branches
+
+    def fullmatch(self, string: str) -> bool:
+        return string in self.branches
+
+    def search(self, string: str) -> bool:
+        return any(branch in string for branch in self.branches)
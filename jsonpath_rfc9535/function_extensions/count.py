@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+from typing import Union
 
 from .filter_function import ExpressionType
 from .filter_function import FilterFunction
+from .filter_function import NodesArgument
 
 if TYPE_CHECKING:
     from jsonpath_rfc9535.node import JSONPathNodeList
@@ -16,7 +18,10 @@ class Count(FilterFunction):
 
     arg_types = [ExpressionType.NODES]
     return_type = ExpressionType.VALUE
+    nodes_arguments = [NodesArgument.COUNT]
 
-    def __call__(self, node_list: JSONPathNodeList) -> int:
+    def __call__(self, node_list: Union[JSONPathNodeList, int]) -> int:
         """Return the number of nodes in the node list."""
+        if isinstance(node_list, int):
+            return node_list
         return len(node_list)
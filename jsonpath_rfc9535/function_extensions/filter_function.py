@@ -4,6 +4,7 @@ from abc import abstractmethod
 from enum import Enum
 from typing import Any
 from typing import List
+from typing import Optional
 
 
 class ExpressionType(Enum):
@@ -14,9 +15,30 @@ class ExpressionType(Enum):
     NODES = 3
 
 
+class NodesArgument(Enum):
+    """How an argument of type `NODES` is passed to a filter function."""
+
+    NODE_LIST = 1
+    """A `JSONPathNodeList`."""
+
+    VALUES = 2
+    """A list of node values."""
+
+    COUNT = 3
+    """The number of nodes, as an `int`."""
+
+
 class FilterFunction(ABC):
     """Base class for typed function extensions."""
 
+    nodes_arguments: Optional[List[NodesArgument]] = None
+    """How each argument of type `NODES` is passed to the function.
+
+    If not `None`, this list has one item for each item in `arg_types`. Items
+    for arguments of other types are ignored. Functions that only need the
+    number of nodes or their values can avoid building a node list.
+    """
+
     @property
     @abstractmethod
     def arg_types(self) -> List[ExpressionType]:
@@ -3,10 +3,10 @@
 from collections.abc import Sized
 from typing import Union
 
-from jsonpath_rfc9535.filter_expressions import NOTHING
-from jsonpath_rfc9535.filter_expressions import Nothing
 from jsonpath_rfc9535.function_extensions import ExpressionType
 from jsonpath_rfc9535.function_extensions import FilterFunction
+from jsonpath_rfc9535.node import NOTHING
+from jsonpath_rfc9535.node import Nothing
 
 
 class Length(FilterFunction):
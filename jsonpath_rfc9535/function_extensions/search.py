@@ -1,27 +1,37 @@
 """The standard `search` function extension."""
 
-import regex as re
-from iregexp_check import check
+from __future__ import annotations
+
+from typing import Optional
 
 from jsonpath_rfc9535.function_extensions import ExpressionType
 from jsonpath_rfc9535.function_extensions import FilterFunction
 
-from ._pattern import map_re
+from ._pattern import VERSION1
+from ._pattern import RegexCache
 
 
 class Search(FilterFunction):
-    """The standard `search` function."""
+    """The standard `search` function.
+
+    Arguments:
+        cache: A `RegexCache` used to store compiled patterns. If `None`, a
+            new cache is created for this function.
+    """
 
     arg_types = [ExpressionType.VALUE, ExpressionType.VALUE]
     return_type = ExpressionType.LOGICAL
 
+    def __init__(self, cache: Optional[RegexCache] = None) -> None:
+        self.cache = cache if cache is not None else RegexCache()
+
     def __call__(self, string: str, pattern: object) -> bool:
         """Return `True` if _string_ contains _pattern_, or `False` otherwise."""
-        if not isinstance(pattern, str) or not check(pattern):
+        if not isinstance(pattern, str) or not isinstance(string, str):
             return False
 
-        try:
-            # re.search caches compiled patterns internally
-            return bool(re.search(map_re(pattern), string, re.VERSION1))
-        except (TypeError, re.error):
+        compiled = self.cache.get(pattern, VERSION1)
+        if compiled is None:
             return False
+
+        return bool(compiled.search(string))
@@ -2,14 +2,14 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import List
+from typing import Union
 
-from jsonpath_rfc9535.filter_expressions import NOTHING
 from jsonpath_rfc9535.function_extensions import ExpressionType
 from jsonpath_rfc9535.function_extensions import FilterFunction
-
-if TYPE_CHECKING:
-    from jsonpath_rfc9535.node import JSONPathNodeList
+from jsonpath_rfc9535.function_extensions import NodesArgument
+from jsonpath_rfc9535.node import NOTHING
+from jsonpath_rfc9535.node import JSONPathNodeList
 
 
 class Value(FilterFunction):
@@ -17,9 +17,10 @@ class Value(FilterFunction):
 
     arg_types = [ExpressionType.NODES]
     return_type = ExpressionType.VALUE
+    nodes_arguments = [NodesArgument.VALUES]
 
-    def __call__(self, nodes: JSONPathNodeList) -> object:
+    def __call__(self, nodes: Union[JSONPathNodeList, List[object]]) -> object:
         """Return the first node in a node list if it has only one item."""
         if len(nodes) == 1:
-            return nodes[0].value
+            return nodes[0].value if isinstance(nodes, JSONPathNodeList) else nodes[0]
         return NOTHING
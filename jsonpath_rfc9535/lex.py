@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import re
 from typing import Callable
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Pattern
 from typing import Tuple
+from typing import Type
 
 from .exceptions import JSONPathLexerError
 from .exceptions import JSONPathSyntaxError
@@ -17,7 +19,12 @@ from .tokens import TokenType
 # ruff: noqa: D102
 
 RE_WHITESPACE = re.compile(r"[ \n\r\t]+")
-RE_PROPERTY = re.compile(r"[\u0080-\uFFFFa-zA-Z_][\u0080-\uFFFFa-zA-Z0-9_-]*")
+# Equivalent to `[\u0080-\uFFFFa-zA-Z_][\u0080-\uFFFFa-zA-Z0-9_-]*`. Negated
+# character classes are much faster to compile than a large positive range.
+RE_PROPERTY = re.compile(
+    r"[^\x00-\x40\x5b-\x5e\x60\x7b-\x7f\U00010000-\U0010ffff]"
+    r"[^\x00-\x2c\x2e\x2f\x3a-\x40\x5b-\x5e\x60\x7b-\x7f\U00010000-\U0010ffff]*"
+)
 RE_INDEX = re.compile(r"-?[0-9]+")
 RE_INT = re.compile(r"-?[0-9]+(?:[eE]\+?[0-9]+)?")
 # RE_FLOAT includes numbers with a negative exponent and no decimal point.
@@ -74,6 +81,24 @@ class Lexer:
         while state is not None:
             state = state()
 
+    def scan(self) -> Iterator[Token]:
+        """Generate tokens from this lexer's JSONPath expression.
+
+        Unlike `run()`, tokens are not collected in `Lexer.tokens`. Scanning
+        stops when the consumer stops pulling tokens.
+        """
+        return self._drain(self.lex_root)
+
+    def _drain(self, state: Optional[StateFn]) -> Iterator[Token]:
+        """Run state functions from _state_, yielding tokens as they are emitted."""
+        tokens = self.tokens
+        while state is not None:
+            index = len(tokens)
+            state = state()
+            emitted = tokens[index:]
+            del tokens[index:]
+            yield from emitted
+
     def emit(self, t: TokenType) -> None:
         """Append a token of type _t_ to the output tokens list."""
         self.tokens.append(
@@ -477,33 +502,354 @@ class Lexer:
                 return None
 
 
+_NAME = RE_PROPERTY.pattern
+_SINGLE_QUOTED = r"[^'\\]*(?:\\[bfnrtu/\\'][^'\\]*)*"
+_DOUBLE_QUOTED = r'[^"\\]*(?:\\[bfnrtu/\\"][^"\\]*)*'
+
+# Master regular expressions, one for each `RegexLexer` state. Every top-level
+# alternative is a single capturing group, so `match.lastindex` identifies the
+# kind of token matched. Don't add capturing groups without updating the
+# corresponding tuple of token types.
+
+RE_SEGMENT = re.compile(
+    r"[ \n\r\t]*(?:"
+    rf"\.({_NAME})"
+    r"|(\[)"
+    r"|\.(\*)"
+    rf"|\.\.({_NAME})"
+    r"|\.\.(\*)"
+    r"|\.\.(\[)"
+    r")"
+)
+
+_SEGMENT_TYPES = (
+    TokenType.INIT,  # Group 0 is the entire match
+    TokenType.PROPERTY,
+    TokenType.LBRACKET,
+    TokenType.WILD,
+    TokenType.PROPERTY,
+    TokenType.WILD,
+    TokenType.LBRACKET,
+)
+
+RE_BRACKETED = re.compile(
+    r"[ \n\r\t]*(?:"
+    r"(\])"
+    rf"|'({_SINGLE_QUOTED})'"
+    r"|(-?[0-9]+)"
+    r"|(,)"
+    rf'|"({_DOUBLE_QUOTED})"'
+    r"|(:)"
+    r"|(\*)"
+    r"|(\?)"
+    r")"
+)
+
+_BRACKETED_TYPES = (
+    TokenType.INIT,
+    TokenType.RBRACKET,
+    TokenType.SINGLE_QUOTE_STRING,
+    TokenType.INDEX,
+    TokenType.COMMA,
+    TokenType.DOUBLE_QUOTE_STRING,
+    TokenType.COLON,
+    TokenType.WILD,
+    TokenType.FILTER,
+)
+
+RE_FILTER = re.compile(
+    r"[ \n\r\t]*(?:"
+    r"(@)"
+    r"|(\$)"
+    r"|(\.)"
+    r"|(\])"
+    r"|(,)"
+    r"|(\()"
+    r"|(\))"
+    rf"|'({_SINGLE_QUOTED})'"
+    rf'|"({_DOUBLE_QUOTED})"'
+    r"|(==)"
+    r"|(!=)"
+    r"|(<=)"
+    r"|(<)"
+    r"|(>=)"
+    r"|(>)"
+    r"|(&&)"
+    r"|(\|\|)"
+    r"|(!)"
+    r"|(true)"
+    r"|(false)"
+    r"|(null)"
+    r"|([a-z][a-z_0-9]*)\("
+    r"|(:?-?[0-9]+\.[0-9]+(?:[eE][+-]?[0-9]+)?|-?[0-9]+[eE]-[0-9]+)"
+    r"|(-?[0-9]+(?:[eE]\+?[0-9]+)?)"
+    r")"
+)
+
+_FILTER_TYPES = (
+    TokenType.INIT,
+    TokenType.CURRENT,
+    TokenType.ROOT,
+    TokenType.DOT,
+    TokenType.RBRACKET,
+    TokenType.COMMA,
+    TokenType.LPAREN,
+    TokenType.RPAREN,
+    TokenType.SINGLE_QUOTE_STRING,
+    TokenType.DOUBLE_QUOTE_STRING,
+    TokenType.EQ,
+    TokenType.NE,
+    TokenType.LE,
+    TokenType.LT,
+    TokenType.GE,
+    TokenType.GT,
+    TokenType.AND,
+    TokenType.OR,
+    TokenType.NOT,
+    TokenType.TRUE,
+    TokenType.FALSE,
+    TokenType.NULL,
+    TokenType.FUNCTION,
+    TokenType.FLOAT,
+    TokenType.INT,
+)
+
+_STATE_SEGMENT = 1
+_STATE_BRACKETED = 2
+_STATE_FILTER = 3
+
+# Group numbers from the master regular expressions that need special handling.
+_SEGMENT_LBRACKET = 2
+_SEGMENT_WILD = 3
+_SEGMENT_DESCENDANT_LBRACKET = 6
+_BRACKETED_RBRACKET = 1
+_BRACKETED_FILTER = 8
+_FILTER_ROOT = 2
+_FILTER_DOT = 3
+_FILTER_RBRACKET = 4
+_FILTER_COMMA = 5
+_FILTER_LPAREN = 6
+_FILTER_RPAREN = 7
+_FILTER_FUNCTION = 22
+
+_DOUBLE_DOT = TokenType.DOUBLE_DOT
+
+
+class RegexLexer(Lexer):
+    """A JSONPath expression lexical scanner driven by regular expressions.
+
+    Rather than stepping through a query one character at a time, each token
+    is matched with a single "master" regular expression for the current
+    lexer state. When a master expression does not match, we hand over to
+    `Lexer`'s character-level state functions for the remainder of the query,
+    so tokens, error messages and error positions are identical to those
+    produced by `Lexer`.
+    """
+
+    __slots__ = ()
+
+    def run(self) -> None:
+        """Start scanning this lexer's JSONPath expression."""
+        for token in self.scan():
+            self.tokens.append(token)
+
+    def scan(self) -> Iterator[Token]:  # noqa: PLR0911, PLR0912, PLR0915
+        """Generate tokens from this lexer's JSONPath expression."""
+        query = self.query
+        length = len(query)
+        bracket_stack = self.bracket_stack
+        func_call_stack = self.func_call_stack
+        filter_depth = self.filter_depth
+        match_segment = RE_SEGMENT.match
+        match_bracketed = RE_BRACKETED.match
+        match_filter = RE_FILTER.match
+        token = Token
+
+        if not query.startswith("$"):
+            yield from self._hand_over(self.lex_root, 0, filter_depth)
+            return
+
+        yield Token(TokenType.ROOT, "$", 0, query)
+        pos = 1
+        state = _STATE_SEGMENT
+
+        while True:
+            if state == _STATE_SEGMENT:
+                match = match_segment(query, pos)
+                if match is None:
+                    if pos == length:
+                        yield Token(TokenType.EOF, "", pos, query)
+                        self.start = self.pos = pos
+                        self.filter_depth = filter_depth
+                        return
+
+                    whitespace = RE_WHITESPACE.match(query, pos)
+                    next_pos = whitespace.end() if whitespace else pos
+                    if (
+                        filter_depth
+                        and next_pos < length
+                        and query[next_pos] not in ".["
+                    ):
+                        state = _STATE_FILTER
+                        continue
+
+                    # Trailing whitespace or an invalid segment.
+                    yield from self._hand_over(self.lex_segment, pos, filter_depth)
+                    return
+
+                group: int = match.lastindex  # type: ignore
+                start, pos = match.span(group)
+
+                if group > _SEGMENT_WILD:
+                    yield token(_DOUBLE_DOT, "..", start - 2, query)
+
+                yield token(_SEGMENT_TYPES[group], query[start:pos], start, query)
+
+                if group in (_SEGMENT_LBRACKET, _SEGMENT_DESCENDANT_LBRACKET):
+                    bracket_stack.append(("[", start))
+                    state = _STATE_BRACKETED
+
+            elif state == _STATE_BRACKETED:
+                match = match_bracketed(query, pos)
+                if match is None:
+                    yield from self._hand_over(
+                        self.lex_inside_bracketed_segment, pos, filter_depth
+                    )
+                    return
+
+                group = match.lastindex  # type: ignore
+                start, end = match.span(group)
+
+                if group == _BRACKETED_RBRACKET:
+                    if not bracket_stack or bracket_stack[-1][0] != "[":
+                        yield from self._hand_over(
+                            self.lex_inside_bracketed_segment, pos, filter_depth
+                        )
+                        return
+                    bracket_stack.pop()
+                    state = _STATE_SEGMENT
+                elif group == _BRACKETED_FILTER:
+                    filter_depth += 1
+                    state = _STATE_FILTER
+
+                yield token(_BRACKETED_TYPES[group], query[start:end], start, query)
+                pos = match.end()
+
+            else:
+                match = match_filter(query, pos)
+                if match is None:
+                    yield from self._hand_over(
+                        self.lex_inside_filter, pos, filter_depth
+                    )
+                    return
+
+                group = match.lastindex  # type: ignore
+                start, end = match.span(group)
+
+                if group <= _FILTER_ROOT:
+                    state = _STATE_SEGMENT
+                elif group == _FILTER_DOT:
+                    pos = start
+                    state = _STATE_SEGMENT
+                    continue
+                elif group == _FILTER_RBRACKET:
+                    pos = start
+                    filter_depth -= 1
+                    state = _STATE_BRACKETED
+                    continue
+                elif group == _FILTER_COMMA:
+                    if not func_call_stack:
+                        filter_depth -= 1
+                        state = _STATE_BRACKETED
+                elif group == _FILTER_LPAREN:
+                    bracket_stack.append(("(", start))
+                    if func_call_stack:
+                        func_call_stack[-1] += 1
+                elif group == _FILTER_RPAREN:
+                    if not bracket_stack or bracket_stack[-1][0] != "(":
+                        yield from self._hand_over(
+                            self.lex_inside_filter, pos, filter_depth
+                        )
+                        return
+                    bracket_stack.pop()
+                    if func_call_stack:
+                        if func_call_stack[-1] == 1:
+                            func_call_stack.pop()
+                        else:
+                            func_call_stack[-1] -= 1
+                elif group == _FILTER_FUNCTION:
+                    func_call_stack.append(1)
+                    bracket_stack.append(("(", end))
+
+                yield token(_FILTER_TYPES[group], query[start:end], start, query)
+                pos = match.end()
+
+    def _hand_over(
+        self, state: StateFn, pos: int, filter_depth: int
+    ) -> Iterator[Token]:
+        """Continue scanning from _pos_ one character at a time."""
+        self.start = self.pos = pos
+        self.filter_depth = filter_depth
+        return self._drain(state)
+
+
 def lex(query: str) -> Tuple[Lexer, List[Token]]:
     """Return a lexer for _query_ and an array to be populated with Tokens."""
     lexer = Lexer(query)
     return lexer, lexer.tokens
 
 
-def tokenize(query: str) -> List[Token]:
-    """Scan JSONPath expression _query_ and return a list of tokens."""
-    lexer, tokens = lex(query)
-    lexer.run()
+def tokenize(query: str, lexer_class: Type[Lexer] = RegexLexer) -> List[Token]:
+    """Scan JSONPath expression _query_ and return a list of tokens.
 
-    if tokens and tokens[-1].type_ == TokenType.ERROR:
-        raise JSONPathSyntaxError(tokens[-1].message, token=tokens[-1])
+    Arguments:
+        query: A JSONPath expression.
+        lexer_class: The lexer used to scan _query_. Defaults to `RegexLexer`.
 
-    # Check for remaining opening brackets that have not been closed.
-    if lexer.bracket_stack:
-        ch, index = lexer.bracket_stack[-1]
-        msg = f"unbalanced {'brackets' if ch == '[' else 'parentheses'}"
-        raise JSONPathSyntaxError(
-            msg,
-            token=Token(
-                TokenType.ERROR,
-                lexer.query[index],
-                index,
-                lexer.query,
+    Returns:
+        A list of tokens, ending with an `EOF` token.
+
+    Raises:
+        JSONPathSyntaxError: If _query_ is invalid.
+    """
+    return list(iter_tokens(query, lexer_class))
+
+
+def iter_tokens(query: str, lexer_class: Type[Lexer] = RegexLexer) -> Iterator[Token]:
+    """Generate tokens from JSONPath expression _query_, one at a time.
+
+    Tokens are scanned on demand, so a consumer that stops early, like a
+    parser that has found a syntax error, does not scan the rest of _query_.
+
+    Arguments:
+        query: A JSONPath expression.
+        lexer_class: The lexer used to scan _query_. Defaults to `RegexLexer`.
+
+    Returns:
+        An iterator of tokens, ending with an `EOF` token.
+
+    Raises:
+        JSONPathSyntaxError: When an invalid token is reached.
+    """
+    lexer = lexer_class(query)
+
+    for token in lexer.scan():
+        if token.type_ == TokenType.ERROR:
+            raise JSONPathSyntaxError(token.message, token=token)
+
+        # Check for remaining opening brackets that have not been closed.
+        if token.type_ == TokenType.EOF and lexer.bracket_stack:
+            ch, index = lexer.bracket_stack[-1]
+            msg = f"unbalanced {'brackets' if ch == '[' else 'parentheses'}"
+            raise JSONPathSyntaxError(
                 msg,
-            ),
-        )
+                token=Token(
+                    TokenType.ERROR,
+                    lexer.query[index],
+                    index,
+                    lexer.query,
+                    msg,
+                ),
+            )
 
-    return tokens
+        yield token
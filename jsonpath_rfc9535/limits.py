@@ -0,0 +1,265 @@
+"""Resource limits for applying compiled JSONPath queries to data.
+
+If any of `JSONPathEnvironment.max_nodes_visited`, `max_nodes_produced`,
+`max_filter_evaluations` or `evaluation_timeout` are set when a query is
+applied, the query resolves its selectors with the metered selectors defined
+here, wrapping profiled selectors if profiling is enabled too. Otherwise the
+query uses its usual selectors and no metering code runs. Limits are checked
+each time a query is applied, so they take effect for queries compiled before
+they were set.
+
+Each application of a query gets a new `Meter`. Queries embedded in filter
+expressions share the meter of the query they are embedded in, so limits apply
+to all of the work done to apply a query.
+"""
+
+from __future__ import annotations
+
+import threading
+from time import monotonic
+from typing import TYPE_CHECKING
+from typing import Iterable
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from .exceptions import JSONPathLimitError
+from .filter_expressions import FilterExpression
+from .node import PAUSE
+from .selectors import FilterSelector
+from .selectors import JSONPathSelector
+
+if TYPE_CHECKING:
+    from .environment import JSONPathEnvironment
+    from .filter_expressions import FilterContext
+    from .node import JSONPathNode
+    from .segments import JSONPathSegment
+    from .tokens import Token
+
+# The deadline is checked once every this many nodes visited or filter
+# evaluations, so we're not calling `time.monotonic()` for every node.
+DEADLINE_CHECK_INTERVAL = 64
+
+_NO_LIMIT = float("inf")
+
+
+class EvaluationStats(NamedTuple):
+    """Work done applying a query to data.
+
+    Attributes:
+        nodes_visited: The number of nodes selectors have been applied to.
+        nodes_produced: The number of nodes selected by selectors, including
+            nodes that are passed on to the next segment.
+        filter_evaluations: The number of times a filter expression has been
+            evaluated.
+        elapsed: Seconds since the query was first applied.
+    """
+
+    nodes_visited: int
+    nodes_produced: int
+    filter_evaluations: int
+    elapsed: float
+
+
+class Meter:
+    """Count work done applying a query and enforce an environment's limits."""
+
+    __slots__ = (
+        "nodes_visited",
+        "nodes_produced",
+        "filter_evaluations",
+        "max_nodes_visited",
+        "max_nodes_produced",
+        "max_filter_evaluations",
+        "start",
+        "deadline",
+    )
+
+    def __init__(self, env: JSONPathEnvironment) -> None:
+        self.nodes_visited = 0
+        self.nodes_produced = 0
+        self.filter_evaluations = 0
+        self.max_nodes_visited = _limit(env.max_nodes_visited)
+        self.max_nodes_produced = _limit(env.max_nodes_produced)
+        self.max_filter_evaluations = _limit(env.max_filter_evaluations)
+        self.start = monotonic()
+        self.deadline = (
+            self.start + env.evaluation_timeout
+            if env.evaluation_timeout is not None
+            else _NO_LIMIT
+        )
+
+    def stats(self) -> EvaluationStats:
+        """Return a snapshot of work done so far."""
+        return EvaluationStats(
+            self.nodes_visited,
+            self.nodes_produced,
+            self.filter_evaluations,
+            monotonic() - self.start,
+        )
+
+    def visit(self, token: Token) -> None:
+        """Count a node visited by a selector."""
+        self.nodes_visited += 1
+        if self.nodes_visited > self.max_nodes_visited:
+            raise self._error("nodes visited", token)
+        if not self.nodes_visited % DEADLINE_CHECK_INTERVAL:
+            self._check_deadline(token)
+
+    def produce(self, token: Token) -> None:
+        """Count a node produced by a selector."""
+        self.nodes_produced += 1
+        if self.nodes_produced > self.max_nodes_produced:
+            raise self._error("nodes produced", token)
+
+    def evaluate(self, token: Token) -> None:
+        """Count an evaluation of a filter expression."""
+        self.filter_evaluations += 1
+        if self.filter_evaluations > self.max_filter_evaluations:
+            raise self._error("filter evaluations", token)
+        if not self.filter_evaluations % DEADLINE_CHECK_INTERVAL:
+            self._check_deadline(token)
+
+    def _check_deadline(self, token: Token) -> None:
+        if monotonic() > self.deadline:
+            raise JSONPathLimitError(
+                "evaluation timeout exceeded", token=token, stats=self.stats()
+            )
+
+    def _error(self, what: str, token: Token) -> JSONPathLimitError:
+        return JSONPathLimitError(
+            f"maximum {what} exceeded", token=token, stats=self.stats()
+        )
+
+
+def _limit(value: Optional[int]) -> float:
+    return _NO_LIMIT if value is None else value
+
+
+class _ActiveMeter(threading.local):
+    meter: Optional[Meter] = None
+
+
+# The meter for the query currently being applied in this thread, if any.
+_active = _ActiveMeter()
+
+
+def has_limits(env: JSONPathEnvironment) -> bool:
+    """Return `True` if _env_ has any resource limits set."""
+    return (
+        env.max_nodes_visited is not None
+        or env.max_nodes_produced is not None
+        or env.max_filter_evaluations is not None
+        or env.evaluation_timeout is not None
+    )
+
+
+def limit_segments(
+    segments: Tuple[JSONPathSegment, ...],
+) -> Tuple[JSONPathSegment, ...]:
+    """Return copies of _segments_ with metered selectors."""
+    return tuple(_limit_segment(segment) for segment in segments)
+
+
+def _limit_segment(segment: JSONPathSegment) -> JSONPathSegment:
+    # Profiled segments only exist if the environment has a profiler.
+    if segment.env.profiler is not None:
+        from .profiling import ProfiledSegment  # noqa: PLC0415
+
+        if isinstance(segment, ProfiledSegment):
+            return ProfiledSegment(_limit_segment(segment.segment), segment.profile)
+
+    return segment.__class__(
+        env=segment.env,
+        token=segment.token,
+        selectors=tuple(_limit_selector(s) for s in segment.selectors),
+    )
+
+
+def _limit_selector(selector: JSONPathSelector) -> JSONPathSelector:
+    if selector.env.profiler is not None:
+        from .profiling import ProfiledSelector  # noqa: PLC0415
+
+        if isinstance(selector, ProfiledSelector):
+            return ProfiledSelector(
+                _limit_selector(selector.selector), selector.profile
+            )
+
+    if isinstance(selector, FilterSelector):
+        selector = FilterSelector(
+            env=selector.env,
+            token=selector.token,
+            expression=LimitedFilterExpression(selector.expression),
+        )
+
+    return LimitedSelector(selector)
+
+
+def metered(
+    env: JSONPathEnvironment,
+    nodes: Iterable[JSONPathNode],
+    meter: Optional[Meter] = None,
+) -> Iterable[JSONPathNode]:
+    """Generate nodes from _nodes_ with a meter active.
+
+    If a meter is already active, we're applying a query embedded in a filter
+    expression and the existing meter is used. Otherwise _meter_ is used, or a
+    new meter if _meter_ is not given.
+    """
+    meter = _active.meter or meter or Meter(env)
+    it = iter(nodes)
+
+    while True:
+        previous = _active.meter
+        _active.meter = meter
+        try:
+            node = next(it)
+        except StopIteration:
+            return
+        finally:
+            _active.meter = previous
+        yield node
+
+
+class LimitedSelector(JSONPathSelector):
+    """A selector that counts nodes visited and produced by another selector."""
+
+    __slots__ = ("selector",)
+
+    def __init__(self, selector: JSONPathSelector) -> None:
+        super().__init__(env=selector.env, token=selector.token)
+        self.selector = selector
+
+    def __str__(self) -> str:
+        return str(self.selector)
+
+    def resolve(self, node: JSONPathNode) -> Iterable[JSONPathNode]:
+        """Apply the wrapped selector to _node_, counting nodes."""
+        meter = _active.meter
+        if meter is None:
+            yield from self.selector.resolve(node)
+            return
+
+        token = self.token
+        meter.visit(token)
+        for _node in self.selector.resolve(node):
+            if _node is not PAUSE:
+                meter.produce(token)
+            yield _node
+
+
+class LimitedFilterExpression(FilterExpression):
+    """A filter expression that counts evaluations of another filter expression."""
+
+    __slots__ = ("filter_expression",)
+
+    def __init__(self, filter_expression: FilterExpression) -> None:
+        super().__init__(filter_expression.token, filter_expression.expression)
+        self.filter_expression = filter_expression
+
+    def evaluate(self, context: FilterContext) -> bool:
+        """Evaluate the wrapped filter expression in the given _context_."""
+        meter = _active.meter
+        if meter is not None:
+            meter.evaluate(self.token)
+        return self.filter_expression.evaluate(context)
@@ -0,0 +1,196 @@
+"""Change the values matched by a compiled JSONPath query.
+
+`JSONPathQuery.update()` and `JSONPathQuery.set()` apply a query once,
+lazily, recording the array or object holding each match and the match's
+name or index. The query's last segment finds these locations without
+creating a `JSONPathNode` for each match, where its selectors allow. Changes
+are written after the query has been applied, so filter expressions only
+ever see the original data.
+
+Locations are grouped by depth and written deepest first. A match nested
+inside another match, like those produced by descendant segments, is
+changed before its ancestor, so the array or object it belongs to is still
+part of the document when it is written, and the ancestor's new value is
+computed from its already changed descendants.
+
+`JSONPathQuery.delete()` groups locations by the array or object they
+belong to instead, removing all of an array's matched elements at once, so
+deleting _k_ elements from an array of _n_ elements takes O(n) time rather
+than O(nk).
+
+When called with `copy=True`, these methods leave their data untouched.
+`CopyOnWrite` makes a shallow copy of each array or object on the way from
+the root to a location, once, and the change is written to the copy. Arrays
+and objects that don't contain a match are shared between the original data
+and the result.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+from .segments import JSONPathRecursiveDescentSegment
+
+if TYPE_CHECKING:
+    from .node import JSONPathNode
+    from .segments import JSONPathSegment
+    from .segments import Location
+
+# Arrays or objects holding matched values, and the name or index of each
+# match, grouped by depth.
+Targets = Dict[int, List[Tuple[Any, Union[int, str]]]]
+
+
+def distinct(segments: Tuple[JSONPathSegment, ...]) -> bool:
+    """Return `True` if _segments_ can't produce the same node more than once.
+
+    A segment with one selector selects each child or descendant of a node
+    at most once. Nodes given to the first descendant segment are all at
+    the same depth, so none of them are descendants of another.
+    """
+    descendant_segments = 0
+    for segment in segments:
+        if len(segment.selectors) != 1:
+            return False
+        if isinstance(segment, JSONPathRecursiveDescentSegment):
+            descendant_segments += 1
+    return descendant_segments <= 1
+
+
+def node_locations(nodes: Iterable[JSONPathNode]) -> Iterable[Location]:
+    """Generate the location of each node in _nodes_, none of which is the root."""
+    for node in nodes:
+        parent = node.parent
+        yield parent.value, node.location[-1], parent.location  # type: ignore
+
+
+class CopyOnWrite:
+    """Copies arrays and objects on the way to locations that will change.
+
+    Every location must be copied before any of them are written to, as
+    `update()`, `assign()` and `delete()` do.
+
+    Arguments:
+        root: The JSON-like data locations were found in. It is not changed.
+
+    Attributes:
+        root: _root_, or a shallow copy of it once a location has been copied.
+    """
+
+    __slots__ = ("root", "_copies")
+
+    def __init__(self, root: object) -> None:
+        self.root: Any = root
+        self._copies: Dict[Tuple[Union[int, str], ...], Any] = {}
+
+    def locations(self, locations: Iterable[Location]) -> Iterable[Location]:
+        """Generate _locations_ with arrays and objects replaced by copies."""
+        for _, key, location in locations:
+            yield self._copy(location), key, location
+
+    def _copy(self, location: Tuple[Union[int, str], ...]) -> Any:
+        """Return our copy of the array or object at _location_."""
+        copy = self._copies.get(location)
+        if copy is None:
+            if location:
+                parent = self._copy(location[:-1])
+                copy = parent[location[-1]] = parent[location[-1]].copy()
+            else:
+                copy = self.root = self.root.copy()
+            self._copies[location] = copy
+        return copy
+
+
+def targets(locations: Iterable[Location], *, unique: bool) -> Targets:
+    """Group _locations_ by depth.
+
+    Arguments:
+        locations: (array or object, name or index, location of the array or
+            object) tuples.
+        unique: If `False`, skip locations we've already seen.
+    """
+    groups: Targets = {}
+    seen: Set[Tuple[int, Union[int, str]]] = set()
+
+    for container, key, location in locations:
+        if not unique:
+            if (id(container), key) in seen:
+                continue
+            seen.add((id(container), key))
+
+        depth = len(location)
+        group = groups.get(depth)
+        if group is None:
+            group = groups[depth] = []
+        group.append((container, key))
+
+    return groups
+
+
+def update(
+    locations: Iterable[Location],
+    func: Callable[[Any], object],
+    *,
+    unique: bool,
+) -> None:
+    """Replace the value at each of _locations_ with the result of _func_.
+
+    Arguments:
+        locations: (array or object, name or index, location of the array or
+            object) tuples.
+        func: A function called with each matched value, returning its
+            replacement.
+        unique: `True` if _locations_ can't contain the same location twice.
+            Otherwise duplicates are ignored, so _func_ is called once for
+            each matched value.
+    """
+    groups = targets(locations, unique=unique)
+    for depth in sorted(groups, reverse=True):
+        for container, key in groups[depth]:
+            container[key] = func(container[key])
+
+
+def assign(locations: Iterable[Location], obj: object) -> None:
+    """Replace the value at each of _locations_ with _obj_."""
+    # Writing the same value twice is harmless, so we don't look for duplicates.
+    groups = targets(locations, unique=True)
+    for depth in sorted(groups, reverse=True):
+        for container, key in groups[depth]:
+            container[key] = obj
+
+
+def delete(locations: Iterable[Location]) -> None:
+    """Remove the value at each of _locations_ from its array or object.
+
+    Duplicate locations are ignored. Arrays keep their identity, as they
+    might be referenced from elsewhere in the document.
+    """
+    groups: Dict[int, Tuple[Any, List[Union[int, str]]]] = {}
+
+    for container, key, _ in locations:
+        group = groups.get(id(container))
+        if group is None:
+            groups[id(container)] = (container, [key])
+        else:
+            group[1].append(key)
+
+    # Every location in an array or object is removed at once, so names and
+    # indices still refer to the values they did when the query was applied.
+    for container, keys in groups.values():
+        if isinstance(container, list):
+            if len(keys) == 1:
+                del container[keys[0]]  # type: ignore
+            else:
+                indices = set(keys)
+                container[:] = [v for i, v in enumerate(container) if i not in indices]
+        else:
+            for key in keys:
+                container.pop(key, None)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+from typing import Any
 from typing import List
 from typing import Optional
 from typing import Tuple
@@ -110,3 +111,38 @@ class JSONPathNodeList(List[JSONPathNode]):
 
     def __str__(self) -> str:
         return f"NodeList{super().__str__()}"
+
+
+class Nothing:
+    """The special result "Nothing"."""
+
+    __slots__ = ()
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Nothing) or (
+            isinstance(other, JSONPathNodeList) and other.empty()
+        )
+
+    def __str__(self) -> str:
+        return "<NOTHING>"
+
+    def __repr__(self) -> str:
+        return "<NOTHING>"
+
+
+NOTHING = Nothing()
+
+
+class Pause:
+    """The type of `PAUSE`, yielded by cooperative evaluation in place of a node.
+
+    See `jsonpath_rfc9535.cooperative`.
+    """
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<PAUSE>"
+
+
+PAUSE: Any = Pause()
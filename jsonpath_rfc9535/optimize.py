@@ -0,0 +1,234 @@
+"""Compile-time rewriting of parsed JSONPath segments.
+
+The functions in this module return new segments, selectors and filter
+expressions that are equivalent to, but cheaper to evaluate than, those built
+by the parser. Parsed segments are never modified in place, so a query's
+string representation is unchanged by optimization.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .filter_expressions import BooleanLiteral
+from .filter_expressions import ComparisonExpression
+from .filter_expressions import Expression
+from .filter_expressions import FilterExpression
+from .filter_expressions import FilterExpressionLiteral
+from .filter_expressions import FunctionExtension
+from .filter_expressions import LogicalExpression
+from .filter_expressions import PrefixExpression
+from .filter_expressions import _compare
+from .selectors import FilterSelector
+from .selectors import IndexSelector
+from .selectors import KeysSelector
+from .selectors import NameSelector
+from .selectors import SliceSelector
+from .selectors import WildcardSelector
+
+if TYPE_CHECKING:
+    from .segments import JSONPathSegment
+    from .selectors import JSONPathSelector
+
+# Expressions that always evaluate to `True` or `False`.
+_BOOLEAN_EXPRESSIONS = (
+    BooleanLiteral,
+    ComparisonExpression,
+    LogicalExpression,
+    PrefixExpression,
+)
+
+
+def optimize_segments(
+    segments: Tuple[JSONPathSegment, ...],
+    notes: Optional[List[str]] = None,
+) -> Tuple[JSONPathSegment, ...]:
+    """Return segments equivalent to _segments_ that are faster to resolve.
+
+    Constant filter subexpressions are folded and double negation is removed.
+    A filter that is always true is replaced with a wildcard selector, and a
+    filter that is always false is removed from its segment.
+
+    Two or more adjacent name, index and slice selectors (with a step of 1)
+    are merged into a single `KeysSelector`.
+
+    Arguments:
+        segments: Segments, as built by the parser.
+        notes: If given, a short description of each rewrite is appended to
+            this list.
+    """
+    return tuple(
+        _merge_keys(_optimize_segment(segment, notes), notes) for segment in segments
+    )
+
+
+def _merge_keys(
+    segment: JSONPathSegment, notes: Optional[List[str]] = None
+) -> JSONPathSegment:
+    """Merge runs of name, index and slice selectors in _segment_."""
+    selectors: List[JSONPathSelector] = []
+    run: List[JSONPathSelector] = []
+    changed = False
+
+    for selector in (*segment.selectors, None):
+        if _is_key(selector):
+            assert selector is not None
+            run.append(selector)
+            continue
+
+        if len(run) > 1:
+            changed = True
+            keys = KeysSelector(env=segment.env, token=run[0].token, selectors=run)
+            selectors.append(keys)
+            if notes is not None:
+                notes.append(f"merged `{keys}` into one keys selector")
+        else:
+            selectors.extend(run)
+
+        run = []
+        if selector is not None:
+            selectors.append(selector)
+
+    if not changed:
+        return segment
+
+    return segment.__class__(
+        env=segment.env, token=segment.token, selectors=tuple(selectors)
+    )
+
+
+def _is_key(selector: Optional[JSONPathSelector]) -> bool:
+    return isinstance(selector, (NameSelector, IndexSelector)) or (
+        isinstance(selector, SliceSelector) and selector.slice.step in (None, 1)
+    )
+
+
+def _optimize_segment(
+    segment: JSONPathSegment, notes: Optional[List[str]] = None
+) -> JSONPathSegment:
+    """Fold constant filter expressions in _segment_."""
+    selectors: List[JSONPathSelector] = []
+    changed = False
+
+    for selector in segment.selectors:
+        if isinstance(selector, FilterSelector):
+            expression = fold(selector.expression.expression, truthy=True)
+
+            if isinstance(expression, BooleanLiteral):
+                changed = True
+                if expression.value:
+                    selectors.append(
+                        WildcardSelector(env=selector.env, token=selector.token)
+                    )
+                    if notes is not None:
+                        notes.append(
+                            f"replaced always true filter `{selector}` with `*`"
+                        )
+                elif notes is not None:
+                    notes.append(f"removed always false filter `{selector}`")
+                continue
+
+            if expression is not selector.expression.expression:
+                changed = True
+                folded = FilterSelector(
+                    env=selector.env,
+                    token=selector.token,
+                    expression=FilterExpression(selector.expression.token, expression),
+                )
+                selectors.append(folded)
+                if notes is not None:
+                    notes.append(f"simplified filter `{selector}` to `{folded}`")
+                continue
+
+        selectors.append(selector)
+
+    if not changed:
+        return segment
+
+    return segment.__class__(
+        env=segment.env, token=segment.token, selectors=tuple(selectors)
+    )
+
+
+def fold(expression: Expression, *, truthy: bool) -> Expression:  # noqa: PLR0911, PLR0912
+    """Fold constant subexpressions of _expression_.
+
+    Arguments:
+        expression: A filter expression, as built by the parser.
+        truthy: If `True`, only the truthiness of _expression_'s result is
+            significant, as is the case for the operands of logical operators.
+            Otherwise the folded expression must evaluate to exactly the same
+            value, as is required for function extension arguments.
+
+    Returns:
+        An equivalent expression, or _expression_ itself if it can't be
+        simplified.
+    """
+    if isinstance(expression, ComparisonExpression):
+        left = fold(expression.left, truthy=False)
+        right = fold(expression.right, truthy=False)
+
+        if isinstance(left, FilterExpressionLiteral) and isinstance(
+            right, FilterExpressionLiteral
+        ):
+            return BooleanLiteral(
+                expression.token,
+                _compare(left.value, expression.operator, right.value),
+            )
+
+        if left is not expression.left or right is not expression.right:
+            return ComparisonExpression(
+                expression.token, left, expression.operator, right
+            )
+
+        return expression
+
+    if isinstance(expression, LogicalExpression):
+        left = fold(expression.left, truthy=True)
+        right = fold(expression.right, truthy=True)
+
+        # Identity element for the operator.
+        identity = expression.operator == "&&"
+
+        for operand, other in ((left, right), (right, left)):
+            if isinstance(operand, BooleanLiteral):
+                if operand.value is not identity:
+                    # `false && x` or `true || x`
+                    return BooleanLiteral(expression.token, not identity)
+                if truthy or isinstance(other, _BOOLEAN_EXPRESSIONS):
+                    # `true && x` or `false || x`
+                    return other
+
+        if left is not expression.left or right is not expression.right:
+            return LogicalExpression(expression.token, left, expression.operator, right)
+
+        return expression
+
+    if isinstance(expression, PrefixExpression) and expression.operator == "!":
+        right = fold(expression.right, truthy=True)
+
+        if isinstance(right, BooleanLiteral):
+            return BooleanLiteral(expression.token, not right.value)
+
+        if (
+            isinstance(right, PrefixExpression)
+            and right.operator == "!"
+            and (truthy or isinstance(right.right, _BOOLEAN_EXPRESSIONS))
+        ):
+            # `!!x`
+            return right.right
+
+        if right is not expression.right:
+            return PrefixExpression(expression.token, expression.operator, right)
+
+        return expression
+
+    if isinstance(expression, FunctionExtension):
+        args = [fold(arg, truthy=False) for arg in expression.args]
+        if any(arg is not old for arg, old in zip(args, expression.args)):  # noqa: B905
+            return FunctionExtension(expression.token, expression.name, args)
+
+    return expression
@@ -13,6 +13,7 @@ from typing import Tuple
 from jsonpath_rfc9535.function_extensions.filter_function import ExpressionType
 from jsonpath_rfc9535.function_extensions.filter_function import FilterFunction
 
+from .exceptions import JSONPathIndexError
 from .exceptions import JSONPathSyntaxError
 from .exceptions import JSONPathTypeError
 from .filter_expressions import BooleanLiteral
@@ -50,6 +51,15 @@ if TYPE_CHECKING:
 # ruff: noqa: D102
 
 
+def parse_index(token: Token) -> int:
+    """Return the value of index or slice token _token_ as an int."""
+    try:
+        return int(token.value)
+    except ValueError as err:
+        # More digits than Python will convert, which is out of range anyway.
+        raise JSONPathIndexError("index out of range", token=token) from err
+
+
 class Parser:
     """A JSONPath expression parser bound to a `JSONPathEnvironment`."""
 
@@ -212,7 +222,7 @@ class Parser:
 
         # 1: or :
         if _maybe_index(stream.current):
-            start = int(stream.current.value)
+            start = parse_index(stream.current)
             stream.next_token()
 
         stream.expect(TokenType.COLON)
@@ -220,7 +230,7 @@ class Parser:
 
         # 1 or 1: or : or ?
         if _maybe_index(stream.current):
-            stop = int(stream.current.value)
+            stop = parse_index(stream.current)
             stream.next_token()
             if stream.current.type_ == TokenType.COLON:
                 stream.next_token()
@@ -230,7 +240,7 @@ class Parser:
 
         # 1 or ?
         if _maybe_index(stream.current):
-            step = int(stream.current.value)
+            step = parse_index(stream.current)
             stream.next_token()
 
         stream.push(stream.current)
@@ -264,7 +274,7 @@ class Parser:
                         IndexSelector(
                             env=self.env,
                             token=stream.current,
-                            index=int(stream.current.value),
+                            index=parse_index(stream.current),
                         )
                     )
             elif stream.current.type_ in (
@@ -363,10 +373,11 @@ class Parser:
         if value.startswith("0") and len(value) > 1:
             raise JSONPathSyntaxError("invalid integer literal", token=stream.current)
 
-        # Convert to float first to handle scientific notation.
+        # Convert to float first to handle scientific notation. Exponents too
+        # large for a float overflow to infinity, which can't be an integer.
         try:
             return IntegerLiteral(stream.current, value=int(float(value)))
-        except ValueError as err:
+        except (ValueError, OverflowError) as err:
             raise JSONPathSyntaxError(
                 "invalid integer literal", token=stream.current
             ) from err
@@ -378,7 +389,7 @@ class Parser:
 
         try:
             return FloatLiteral(stream.current, value=float(stream.current.value))
-        except ValueError as err:
+        except (ValueError, OverflowError) as err:
             raise JSONPathSyntaxError(
                 "invalid float literal", token=stream.current
             ) from err
@@ -0,0 +1,91 @@
+"""Filter expressions compiled for testing JSON values directly."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Iterable
+from typing import Iterator
+
+from .exceptions import JSONPathTypeError
+from .filter_expressions import FilterContext
+from .filter_expressions import FilterExpression
+from .optimize import fold
+
+if TYPE_CHECKING:
+    from .environment import JSONPathEnvironment
+    from .environment import JSONValue
+
+
+class JSONPathPredicate:
+    """A compiled filter expression that tests JSON-like values.
+
+    A predicate applies a filter expression, like `@.price > 10`, to a value
+    directly, rather than to the members of an array or object. The current
+    node identifier, `@`, and the root node identifier, `$`, both refer to the
+    value being tested, as if each value were its own JSON document.
+
+    Use `JSONPathEnvironment.compile_filter()` to get a `JSONPathPredicate`.
+
+    Arguments:
+        env: The `JSONPathEnvironment` this predicate is bound to.
+        expression: The filter expression, as built by the parser.
+    """
+
+    __slots__ = ("env", "expression", "_expression")
+
+    def __init__(
+        self,
+        *,
+        env: JSONPathEnvironment,
+        expression: FilterExpression,
+    ) -> None:
+        self.env = env
+        self.expression = expression
+
+        self._expression = (
+            FilterExpression(expression.token, fold(expression.expression, truthy=True))
+            if env.optimize_queries
+            else expression
+        )
+
+    def __str__(self) -> str:
+        return str(self.expression)
+
+    def __call__(self, value: JSONValue) -> bool:
+        """Return `True` if _value_ matches this predicate.
+
+        Raises:
+            JSONPathTypeError: If the filter expression attempts to use types in
+                an incompatible way.
+        """
+        context = FilterContext(env=self.env, current=value, root=value)
+        try:
+            return self._expression.evaluate(context)
+        except JSONPathTypeError as err:
+            if not err.token:
+                err.token = self.expression.token
+            raise
+
+    def filter_iter(self, values: Iterable[JSONValue]) -> Iterator[JSONValue]:
+        """Generate values from _values_ that match this predicate.
+
+        _values_ is consumed lazily, so it can be a stream of records that
+        does not fit in memory.
+
+        Raises:
+            JSONPathTypeError: If the filter expression attempts to use types in
+                an incompatible way.
+        """
+        context = FilterContext(env=self.env, current=None, root=None)
+        evaluate = self._expression.evaluate
+
+        for value in values:
+            context.current = value
+            context.root = value
+            try:
+                if evaluate(context):
+                    yield value
+            except JSONPathTypeError as err:
+                if not err.token:
+                    err.token = self.expression.token
+                raise
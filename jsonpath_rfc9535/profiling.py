@@ -0,0 +1,440 @@
+"""Opt-in instrumentation for compiled JSONPath queries.
+
+When `JSONPathEnvironment.profile_queries` is `True`, each query compiled by
+the environment resolves its segments with the instrumented segments and
+selectors defined here, which record what they do in a `QueryProfile`. When
+profiling is disabled, queries are resolved with their usual segments and
+selectors, so no profiling code runs at all.
+"""
+
+from __future__ import annotations
+
+import threading
+from time import perf_counter_ns
+from typing import TYPE_CHECKING
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from weakref import WeakKeyDictionary
+
+from .filter_expressions import ComparisonExpression
+from .filter_expressions import FilterExpression
+from .filter_expressions import FilterQuery
+from .filter_expressions import FunctionExtension
+from .filter_expressions import LogicalExpression
+from .filter_expressions import PrefixExpression
+from .function_extensions import Match
+from .function_extensions import Search
+from .node import PAUSE
+from .segments import JSONPathSegment
+from .selectors import FilterSelector
+from .selectors import JSONPathSelector
+
+if TYPE_CHECKING:
+    from .filter_expressions import Expression
+    from .filter_expressions import FilterContext
+    from .node import JSONPathNode
+    from .query import JSONPathQuery
+    from .tokens import Token
+
+
+class SelectorProfile:
+    """Statistics for one selector of a profiled query.
+
+    Attributes:
+        selector: The selector's string representation.
+        entered: The number of nodes the selector has been applied to.
+        emitted: The number of nodes the selector has produced.
+        filter_evaluations: The number of times the selector's filter
+            expression has been evaluated. Always zero for selectors other
+            than filter selectors.
+        function_calls: The number of calls to each function extension, by
+            name, made by the selector's filter expression.
+        regex_calls: The number of calls to the `match` and `search` function
+            extensions made by the selector's filter expression.
+        subqueries: Profiles for queries embedded in the selector's filter
+            expression, like `@.a` in `$[?@.a]`.
+    """
+
+    __slots__ = (
+        "selector",
+        "entered",
+        "emitted",
+        "filter_evaluations",
+        "function_calls",
+        "regex_calls",
+        "subqueries",
+    )
+
+    def __init__(self, selector: str) -> None:
+        self.selector = selector
+        self.entered = 0
+        self.emitted = 0
+        self.filter_evaluations = 0
+        self.function_calls: Dict[str, int] = {}
+        self.regex_calls = 0
+        self.subqueries: List[QueryProfile] = []
+
+    def reset(self) -> None:
+        """Set all counts back to zero."""
+        self.entered = 0
+        self.emitted = 0
+        self.filter_evaluations = 0
+        self.function_calls.clear()
+        self.regex_calls = 0
+
+    def as_dict(self) -> Dict[str, object]:
+        """Return this profile as a dictionary of plain Python objects."""
+        return {
+            "selector": self.selector,
+            "entered": self.entered,
+            "emitted": self.emitted,
+            "filter_evaluations": self.filter_evaluations,
+            "function_calls": dict(self.function_calls),
+            "regex_calls": self.regex_calls,
+            "subqueries": [query.as_dict() for query in self.subqueries],
+        }
+
+
+class SegmentProfile:
+    """Statistics for one segment of a profiled query.
+
+    Attributes:
+        segment: The segment's string representation.
+        entered: The number of nodes the segment has been applied to.
+        emitted: The number of nodes the segment has produced.
+        elapsed: Wall time spent in this segment, in nanoseconds. Time spent
+            producing nodes in preceding segments is not included, but time
+            spent evaluating embedded filter queries is.
+        selectors: Profiles for each of the segment's selectors.
+    """
+
+    __slots__ = ("segment", "entered", "emitted", "elapsed", "selectors")
+
+    def __init__(self, segment: str, selectors: List[SelectorProfile]) -> None:
+        self.segment = segment
+        self.entered = 0
+        self.emitted = 0
+        self.elapsed = 0
+        self.selectors = selectors
+
+    def reset(self) -> None:
+        """Set all counts back to zero."""
+        self.entered = 0
+        self.emitted = 0
+        self.elapsed = 0
+        for selector in self.selectors:
+            selector.reset()
+
+    def as_dict(self) -> Dict[str, object]:
+        """Return this profile as a dictionary of plain Python objects."""
+        return {
+            "segment": self.segment,
+            "entered": self.entered,
+            "emitted": self.emitted,
+            "elapsed": self.elapsed,
+            "selectors": [selector.as_dict() for selector in self.selectors],
+        }
+
+
+class QueryProfile:
+    """Statistics for a profiled query, accumulated over every application.
+
+    Segments and selectors are those used to resolve the query, which might
+    differ from those in the query's string representation if the query has
+    been optimized.
+
+    Attributes:
+        query: The query's string representation.
+        segments: Profiles for each of the query's segments.
+    """
+
+    __slots__ = ("query", "segments")
+
+    def __init__(self, query: str, segments: List[SegmentProfile]) -> None:
+        self.query = query
+        self.segments = segments
+
+    def __str__(self) -> str:
+        lines = [self.query]
+        for segment in self.segments:
+            lines.append(
+                f"  {segment.segment}  entered={segment.entered} "
+                f"emitted={segment.emitted} elapsed={segment.elapsed}ns"
+            )
+            for selector in segment.selectors:
+                line = (
+                    f"    {selector.selector}  entered={selector.entered} "
+                    f"emitted={selector.emitted}"
+                )
+                if selector.filter_evaluations:
+                    line += f" filter_evaluations={selector.filter_evaluations}"
+                if selector.regex_calls:
+                    line += f" regex_calls={selector.regex_calls}"
+                lines.append(line)
+        return "\n".join(lines)
+
+    @property
+    def elapsed(self) -> int:
+        """Total wall time spent resolving this query, in nanoseconds."""
+        return sum(segment.elapsed for segment in self.segments)
+
+    def reset(self) -> None:
+        """Set all counts back to zero."""
+        for segment in self.segments:
+            segment.reset()
+
+    def as_dict(self) -> Dict[str, object]:
+        """Return this profile as a dictionary of plain Python objects."""
+        return {
+            "query": self.query,
+            "elapsed": self.elapsed,
+            "segments": [segment.as_dict() for segment in self.segments],
+        }
+
+
+class Profiler:
+    """Record statistics for queries compiled by a `JSONPathEnvironment`.
+
+    Profiles are held for as long as their compiled query is alive.
+
+    Queries can be compiled, and reports taken, from any thread. Counts are
+    updated without a lock, so they are exact when each query is applied by
+    one thread at a time, but some updates might be lost if a profiled query
+    is applied by several threads at once.
+    """
+
+    __slots__ = ("_profiles", "_lock")
+
+    def __init__(self) -> None:
+        self._profiles: WeakKeyDictionary[JSONPathQuery, QueryProfile] = (
+            WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def instrument(
+        self,
+        query: JSONPathQuery,
+        segments: Tuple[JSONPathSegment, ...],
+    ) -> Tuple[JSONPathSegment, ...]:
+        """Return instrumented copies of _segments_ and start profiling _query_.
+
+        Arguments:
+            query: The query being profiled.
+            segments: The segments _query_ will be resolved with.
+        """
+        profiled = tuple(self._instrument_segment(segment) for segment in segments)
+        profile = QueryProfile(str(query), [segment.profile for segment in profiled])
+        with self._lock:
+            self._profiles[query] = profile
+        return profiled
+
+    def profile(self, query: JSONPathQuery) -> Optional[QueryProfile]:
+        """Return the profile for _query_, or `None` if it is not profiled."""
+        return self._profiles.get(query)
+
+    def report(self) -> List[QueryProfile]:
+        """Return profiles for all live queries.
+
+        Profiles for queries embedded in filter expressions are included with
+        the profile of the filter selector they belong to, not at the top level.
+        """
+        with self._lock:
+            profiles = list(self._profiles.values())
+        embedded = {
+            id(subquery)
+            for profile in profiles
+            for segment in profile.segments
+            for selector in segment.selectors
+            for subquery in selector.subqueries
+        }
+        return [profile for profile in profiles if id(profile) not in embedded]
+
+    def reset(self) -> None:
+        """Set counts for all live queries back to zero."""
+        with self._lock:
+            profiles = list(self._profiles.values())
+        for profile in profiles:
+            profile.reset()
+
+    def _instrument_segment(self, segment: JSONPathSegment) -> ProfiledSegment:
+        selectors = tuple(
+            self._instrument_selector(selector) for selector in segment.selectors
+        )
+        resolver = segment.__class__(
+            env=segment.env, token=segment.token, selectors=selectors
+        )
+        return ProfiledSegment(
+            resolver,
+            SegmentProfile(str(segment), [s.profile for s in selectors]),
+        )
+
+    def _instrument_selector(self, selector: JSONPathSelector) -> ProfiledSelector:
+        profile = SelectorProfile(str(selector))
+
+        if isinstance(selector, FilterSelector):
+            selector = FilterSelector(
+                env=selector.env,
+                token=selector.token,
+                expression=ProfiledFilterExpression(
+                    selector.expression.token,
+                    self._instrument_expression(
+                        selector.expression.expression, profile
+                    ),
+                    profile,
+                ),
+            )
+
+        return ProfiledSelector(selector, profile)
+
+    def _instrument_expression(
+        self, expression: Expression, profile: SelectorProfile
+    ) -> Expression:
+        """Return a copy of _expression_ that counts function extension calls."""
+        if isinstance(expression, FunctionExtension):
+            return ProfiledFunctionExtension(
+                expression.token,
+                expression.name,
+                [self._instrument_expression(arg, profile) for arg in expression.args],
+                profile,
+            )
+
+        if isinstance(expression, FilterQuery):
+            subquery = self._profiles.get(expression.query)
+            if subquery is not None:
+                profile.subqueries.append(subquery)
+            return expression
+
+        if isinstance(expression, (ComparisonExpression, LogicalExpression)):
+            return expression.__class__(
+                expression.token,
+                self._instrument_expression(expression.left, profile),
+                expression.operator,
+                self._instrument_expression(expression.right, profile),
+            )
+
+        if isinstance(expression, PrefixExpression):
+            return PrefixExpression(
+                expression.token,
+                expression.operator,
+                self._instrument_expression(expression.right, profile),
+            )
+
+        return expression
+
+
+class ProfiledSegment(JSONPathSegment):
+    """A segment that records statistics about another segment."""
+
+    __slots__ = ("segment", "profile")
+
+    def __init__(self, segment: JSONPathSegment, profile: SegmentProfile) -> None:
+        super().__init__(
+            env=segment.env, token=segment.token, selectors=segment.selectors
+        )
+        self.segment = segment
+        self.profile = profile
+
+    def __str__(self) -> str:
+        return str(self.segment)
+
+    def resolve(self, nodes: Iterable[JSONPathNode]) -> Iterable[JSONPathNode]:
+        """Apply the wrapped segment to _nodes_, recording statistics."""
+        profile = self.profile
+        it = iter(self.segment.resolve(self._enter(nodes)))
+
+        while True:
+            start = perf_counter_ns()
+            try:
+                node = next(it)
+            except StopIteration:
+                profile.elapsed += perf_counter_ns() - start
+                return
+            profile.elapsed += perf_counter_ns() - start
+            if node is not PAUSE:
+                profile.emitted += 1
+            yield node
+
+    def _enter(self, nodes: Iterable[JSONPathNode]) -> Iterator[JSONPathNode]:
+        """Count nodes from _nodes_, excluding time spent producing them."""
+        profile = self.profile
+        it = iter(nodes)
+
+        while True:
+            start = perf_counter_ns()
+            try:
+                node = next(it)
+            except StopIteration:
+                profile.elapsed -= perf_counter_ns() - start
+                return
+            profile.elapsed -= perf_counter_ns() - start
+            profile.entered += 1
+            yield node
+
+
+class ProfiledSelector(JSONPathSelector):
+    """A selector that records statistics about another selector."""
+
+    __slots__ = ("selector", "profile")
+
+    def __init__(self, selector: JSONPathSelector, profile: SelectorProfile) -> None:
+        super().__init__(env=selector.env, token=selector.token)
+        self.selector = selector
+        self.profile = profile
+
+    def __str__(self) -> str:
+        return str(self.selector)
+
+    def resolve(self, node: JSONPathNode) -> Iterable[JSONPathNode]:
+        """Apply the wrapped selector to _node_, recording statistics."""
+        profile = self.profile
+        profile.entered += 1
+        for _node in self.selector.resolve(node):
+            if _node is not PAUSE:
+                profile.emitted += 1
+            yield _node
+
+
+class ProfiledFilterExpression(FilterExpression):
+    """A filter expression that counts its evaluations."""
+
+    __slots__ = ("profile",)
+
+    def __init__(
+        self, token: Token, expression: Expression, profile: SelectorProfile
+    ) -> None:
+        super().__init__(token, expression)
+        self.profile = profile
+
+    def evaluate(self, context: FilterContext) -> bool:
+        """Evaluate the filter expression in the given _context_."""
+        self.profile.filter_evaluations += 1
+        return super().evaluate(context)
+
+
+class ProfiledFunctionExtension(FunctionExtension):
+    """A function extension call that counts its calls."""
+
+    __slots__ = ("profile",)
+
+    def __init__(
+        self,
+        token: Token,
+        name: str,
+        args: Sequence[Expression],
+        profile: SelectorProfile,
+    ) -> None:
+        super().__init__(token, name, args)
+        self.profile = profile
+
+    def evaluate(self, context: FilterContext) -> object:
+        """Evaluate the filter expression in the given _context_."""
+        profile = self.profile
+        profile.function_calls[self.name] = profile.function_calls.get(self.name, 0) + 1
+        if isinstance(context.env.function_extensions.get(self.name), (Match, Search)):
+            profile.regex_calls += 1
+        return super().evaluate(context)
@@ -2,21 +2,42 @@
 
 from __future__ import annotations
 
+from functools import partial
+from itertools import islice
 from typing import TYPE_CHECKING
+from typing import Any
+from typing import AsyncIterable
+from typing import AsyncIterator
+from typing import Callable
+from typing import Generator
 from typing import Iterable
 from typing import Optional
 from typing import Tuple
-
+from typing import Union
+
+from .complexity import Complexity
+from .complexity import complexity
+from .limits import Meter
+from .limits import has_limits
+from .limits import limit_segments
+from .limits import metered
+from .node import PAUSE
 from .node import JSONPathNode
 from .node import JSONPathNodeList
+from .optimize import optimize_segments
 from .segments import JSONPathRecursiveDescentSegment
 from .selectors import IndexSelector
 from .selectors import NameSelector
 
 if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
     from .environment import JSONPathEnvironment
     from .environment import JSONValue
+    from .mutate import CopyOnWrite
     from .segments import JSONPathSegment
+    from .segments import Location
+    from .stream import MemberTest
 
 
 class JSONPathQuery:
@@ -32,7 +53,16 @@ class JSONPathQuery:
         segments: The `JSONPathSegment` instances that make up this query.
     """
 
-    __slots__ = ("env", "segments")
+    __slots__ = (
+        "env",
+        "segments",
+        "_segments",
+        "_limited_segments",
+        "_cooperative_segments",
+        "_limited_cooperative_segments",
+        "_complexity",
+        "__weakref__",
+    )
 
     def __init__(
         self,
@@ -43,29 +73,74 @@ class JSONPathQuery:
         self.env = env
         self.segments = segments
 
+        # Segments used when applying this query to data. These might differ
+        # from `segments`, but will always produce the same nodes.
+        self._segments = (
+            optimize_segments(segments) if env.optimize_queries else segments
+        )
+
+        if env.profile_queries:
+            assert env.profiler is not None
+            self._segments = env.profiler.instrument(self, self._segments)
+
+        # Copies of `_segments` that count work done applying this query, used
+        # while the environment sets resource limits. Limits are checked each
+        # time this query is applied, as they can be set after it's compiled.
+        self._limited_segments: Optional[Tuple[JSONPathSegment, ...]] = None
+
+        # Segments used by `afinditer()`, built the first time they're needed.
+        self._cooperative_segments: Optional[Tuple[JSONPathSegment, ...]] = None
+        self._limited_cooperative_segments: Optional[Tuple[JSONPathSegment, ...]] = None
+
+        # Our complexity score, calculated the first time it's needed.
+        self._complexity: Optional[Complexity] = None
+
     def __str__(self) -> str:
         return "$" + "".join(str(segment) for segment in self.segments)
 
     def __hash__(self) -> int:
         return hash(self.segments)
 
+    def canonical(self) -> str:
+        """Return the canonical string representation of this query.
+
+        Queries that differ only cosmetically, like `$.a`, `$['a']` and
+        `$["a"]`, have the same canonical form.
+        """
+        return str(self)
+
     def finditer(
         self,
         value: JSONValue,
+        *,
+        limit: Optional[int] = None,
+        offset: int = 0,
     ) -> Iterable[JSONPathNode]:
         """Generate `JSONPathNode` instances for each match of this query in value.
 
+        Nodes are produced lazily. Data is only visited, and filters are only
+        evaluated, as far as is needed to produce the next node.
+
         Arguments:
             value: JSON-like data to query, as you'd get from `json.load`.
+            limit: The maximum number of nodes to produce. Defaults to `None`,
+                no limit.
+            offset: The number of matching nodes to skip before producing
+                nodes. Defaults to `0`.
 
         Returns:
             An iterator yielding `JSONPathNode` objects for each match.
 
         Raises:
+            ValueError: If _limit_ or _offset_ is negative.
             JSONPathSyntaxError: If the query is invalid.
             JSONPathTypeError: If a filter expression attempts to use types in
                 an incompatible way.
+            JSONPathLimitError: If applying the query exceeds one of the
+                environment's resource limits.
         """
+        _check_limit_and_offset(limit, offset)
+
         nodes: Iterable[JSONPathNode] = [
             JSONPathNode(
                 value=value,
@@ -75,29 +150,46 @@ class JSONPathQuery:
             )
         ]
 
-        for segment in self.segments:
-            nodes = segment.resolve(nodes)
+        if has_limits(self.env):
+            for segment in self._get_limited_segments():
+                nodes = segment.resolve(nodes)
+            nodes = metered(self.env, nodes)
+        else:
+            for segment in self._segments:
+                nodes = segment.resolve(nodes)
+
+        if limit is not None or offset:
+            return _slice(nodes, offset, limit)
 
         return nodes
 
     def find(
         self,
         value: JSONValue,
+        *,
+        limit: Optional[int] = None,
+        offset: int = 0,
     ) -> JSONPathNodeList:
         """Apply this JSONPath expression to JSON-like _value_ and return a node list.
 
         Arguments:
             value: JSON-like data to query, as you'd get from `json.load`.
+            limit: The maximum number of nodes to return. Data is not visited
+                beyond the last node needed. Defaults to `None`, no limit.
+            offset: The number of matching nodes to skip. Defaults to `0`.
 
         Returns:
             A list of `JSONPathNode` instance.
 
         Raises:
+            ValueError: If _limit_ or _offset_ is negative.
             JSONPathSyntaxError: If the query is invalid.
             JSONPathTypeError: If a filter expression attempts to use types in
                 an incompatible way.
+            JSONPathLimitError: If applying the query exceeds one of the
+                environment's resource limits.
         """
-        return JSONPathNodeList(self.finditer(value))
+        return JSONPathNodeList(self.finditer(value, limit=limit, offset=offset))
 
     apply = find
 
@@ -115,12 +207,558 @@ class JSONPathQuery:
             JSONPathSyntaxError: If the query is invalid.
             JSONPathTypeError: If a filter expression attempts to use types in
                 an incompatible way.
+            JSONPathLimitError: If applying the query exceeds one of the
+                environment's resource limits.
         """
-        try:
-            return next(iter(self.finditer(value)))
-        except StopIteration:
+        for node in self.finditer(value, limit=1):
+            return node
+        return None
+
+    def count(self, value: JSONValue) -> int:
+        """Return the number of nodes matched by applying this query to _value_.
+
+        Matches are counted without building a node list. When the
+        environment sets no resource limits, the last segment counts its
+        matches without creating a `JSONPathNode` for each of them, where its
+        selectors allow.
+
+        Arguments:
+            value: JSON-like data to query, as you'd get from `json.load`.
+
+        Raises:
+            JSONPathTypeError: If a filter expression attempts to use types in
+                an incompatible way.
+            JSONPathLimitError: If applying the query exceeds one of the
+                environment's resource limits.
+        """
+        if not self._segments or has_limits(self.env):
+            return sum(1 for _ in self.finditer(value))
+
+        nodes: Iterable[JSONPathNode] = [
+            JSONPathNode(
+                value=value,
+                location=(),
+                parent=None,
+                root=value,
+            )
+        ]
+
+        for segment in self._segments[:-1]:
+            nodes = segment.resolve(nodes)
+
+        return self._segments[-1].count(nodes)
+
+    def exists(self, value: JSONValue) -> bool:
+        """Return `True` if this query matches at least one node in _value_.
+
+        Data is visited only until the first matching node is found.
+
+        Arguments:
+            value: JSON-like data to query, as you'd get from `json.load`.
+
+        Raises:
+            JSONPathTypeError: If a filter expression attempts to use types in
+                an incompatible way.
+            JSONPathLimitError: If applying the query exceeds one of the
+                environment's resource limits.
+        """
+        return self.find_one(value) is not None
+
+    def update(
+        self,
+        value: JSONValue,
+        func: Callable[[Any], object],
+        *,
+        copy: bool = False,
+    ) -> object:
+        """Replace each value matched by this query with the result of _func_.
+
+        The query is applied once, without building a node list, and matched
+        values are replaced after it has been applied, so filters only ever
+        see the original data. When this query has no resource limits, the
+        last segment finds matches without creating a `JSONPathNode` for each
+        of them, where its selectors allow.
+
+        Values nested inside other matched values are replaced first, so
+        _func_ is called with an ancestor's value after its descendants have
+        been replaced. A value matched more than once is replaced once.
+
+        Arguments:
+            value: JSON-like data to change, as you'd get from `json.load`.
+            func: A function called with each matched value, returning its
+                replacement.
+            copy: If `True`, _value_ is left untouched and a new document is
+                returned. Only arrays and objects on the way to a match are
+                copied, others are shared with _value_, so _func_ must not
+                change its argument in place. Defaults to `False`, changing
+                _value_ in place.
+
+        Returns:
+            _value_ or its copy, or the result of calling _func_ with _value_
+                if this query matches the root value.
+
+        Raises:
+            JSONPathTypeError: If a filter expression attempts to use types in
+                an incompatible way.
+            JSONPathLimitError: If applying the query exceeds one of the
+                environment's resource limits.
+        """
+        if not self._segments:
+            return func(value)
+
+        from .mutate import CopyOnWrite  # noqa: PLC0415
+        from .mutate import distinct  # noqa: PLC0415
+        from .mutate import update  # noqa: PLC0415
+
+        cow = CopyOnWrite(value) if copy else None
+        update(self._locate(value, cow), func, unique=distinct(self.segments))
+        return value if cow is None else cow.root
+
+    def set(self, value: JSONValue, obj: object, *, copy: bool = False) -> object:
+        """Replace each value matched by this query with _obj_.
+
+        Matches are found and replaced as they are by `update()`. The same
+        _obj_ is used for every match, it is not copied.
+
+        Arguments:
+            value: JSON-like data to change, as you'd get from `json.load`.
+            obj: The replacement value.
+            copy: If `True`, _value_ is left untouched and a new document is
+                returned, sharing arrays and objects that don't contain a
+                match with _value_. Defaults to `False`, changing _value_ in
+                place.
+
+        Returns:
+            _value_ or its copy, or _obj_ if this query matches the root value.
+
+        Raises:
+            JSONPathTypeError: If a filter expression attempts to use types in
+                an incompatible way.
+            JSONPathLimitError: If applying the query exceeds one of the
+                environment's resource limits.
+        """
+        if not self._segments:
+            return obj
+
+        from .mutate import CopyOnWrite  # noqa: PLC0415
+        from .mutate import assign  # noqa: PLC0415
+
+        cow = CopyOnWrite(value) if copy else None
+        assign(self._locate(value, cow), obj)
+        return value if cow is None else cow.root
+
+    def delete(self, value: JSONValue, *, copy: bool = False) -> object:
+        """Remove each value matched by this query from its array or object.
+
+        The query is applied once, without building a node list, and matches
+        are removed after it has been applied, so array indices don't shift
+        underneath it. All matched elements of an array are removed in one
+        pass over the array.
+
+        Arguments:
+            value: JSON-like data to change, as you'd get from `json.load`.
+            copy: If `True`, _value_ is left untouched and a new document is
+                returned, sharing arrays and objects that don't contain a
+                match with _value_. Defaults to `False`, changing _value_ in
+                place.
+
+        Returns:
+            _value_ or its copy, or `None` if this query matches the root
+                value.
+
+        Raises:
+            JSONPathTypeError: If a filter expression attempts to use types in
+                an incompatible way.
+            JSONPathLimitError: If applying the query exceeds one of the
+                environment's resource limits.
+        """
+        if not self._segments:
             return None
 
+        from .mutate import CopyOnWrite  # noqa: PLC0415
+        from .mutate import delete  # noqa: PLC0415
+
+        cow = CopyOnWrite(value) if copy else None
+        delete(self._locate(value, cow))
+        return value if cow is None else cow.root
+
+    def _locate(
+        self, value: JSONValue, cow: Optional[CopyOnWrite]
+    ) -> Iterable[Location]:
+        """Generate the location of each match of this query in _value_.
+
+        This query must have at least one segment, so it can't match _value_
+        itself. If _cow_ is not `None`, arrays and objects are replaced with
+        copies from _cow_.
+        """
+        if has_limits(self.env):
+            from .mutate import node_locations  # noqa: PLC0415
+
+            locations = node_locations(self.finditer(value))
+        else:
+            nodes: Iterable[JSONPathNode] = [
+                JSONPathNode(
+                    value=value,
+                    location=(),
+                    parent=None,
+                    root=value,
+                )
+            ]
+
+            for segment in self._segments[:-1]:
+                nodes = segment.resolve(nodes)
+
+            locations = self._segments[-1].locate(nodes)
+
+        return locations if cow is None else cow.locations(locations)
+
+    async def afinditer(
+        self,
+        value: JSONValue,
+        *,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> AsyncIterator[JSONPathNode]:
+        """Generate nodes for each match of this query in _value_, asynchronously.
+
+        This is like `finditer()`, but control is given back to the event loop
+        once every `JSONPathEnvironment.async_yield_interval` nodes visited or
+        filter evaluations, so applying a query to a large value doesn't block
+        other tasks. Queries embedded in filter expressions are not
+        interrupted.
+
+        Arguments:
+            value: JSON-like data to query, as you'd get from `json.load`.
+            limit: The maximum number of nodes to produce. Defaults to `None`,
+                no limit.
+            offset: The number of matching nodes to skip before producing
+                nodes. Defaults to `0`.
+
+        Returns:
+            An asynchronous iterator yielding `JSONPathNode` objects for each
+            match.
+
+        Raises:
+            ValueError: If _limit_ or _offset_ is negative.
+            JSONPathTypeError: If a filter expression attempts to use types in
+                an incompatible way.
+            JSONPathLimitError: If applying the query exceeds one of the
+                environment's resource limits. `evaluation_timeout` includes
+                time spent waiting for other tasks.
+        """
+        import asyncio  # noqa: PLC0415
+
+        from .cooperative import Clock  # noqa: PLC0415
+        from .cooperative import clocked  # noqa: PLC0415
+
+        _check_limit_and_offset(limit, offset)
+
+        nodes: Iterable[JSONPathNode] = [
+            JSONPathNode(
+                value=value,
+                location=(),
+                parent=None,
+                root=value,
+            )
+        ]
+
+        limited = has_limits(self.env)
+        for segment in self._get_cooperative_segments(limited=limited):
+            nodes = segment.resolve(nodes)
+
+        # Every call gets its own clock, so concurrent calls pause independently.
+        nodes = clocked(nodes, Clock(self.env.async_yield_interval))
+
+        if limited:
+            nodes = metered(self.env, nodes)
+
+        stop = None if limit is None else offset + limit
+        count = 0
+        it = iter(nodes)
+
+        try:
+            while stop is None or count < stop:
+                node = next(it, None)
+                if node is None:
+                    return
+                if node is PAUSE:
+                    await asyncio.sleep(0)
+                    continue
+                count += 1
+                if count > offset:
+                    yield node
+        finally:
+            if isinstance(it, Generator):
+                it.close()
+
+    async def afind(
+        self,
+        value: JSONValue,
+        *,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        executor: Optional[Executor] = None,
+    ) -> JSONPathNodeList:
+        """Apply this query to _value_ without blocking the event loop.
+
+        Without an _executor_, nodes are collected from `afinditer()`. With a
+        thread pool executor, `find()` is called in a worker thread. With a
+        `ProcessPoolExecutor`, the query string and _value_ are sent to a
+        worker process, where the query is compiled by an instance of this
+        query's environment class, so that class must be importable, and
+        configured with class attributes, not by modifying an instance. Nodes
+        returned from a worker process refer to a copy of _value_.
+
+        Arguments:
+            value: JSON-like data to query, as you'd get from `json.load`.
+            limit: The maximum number of nodes to return. Defaults to `None`,
+                no limit.
+            offset: The number of matching nodes to skip. Defaults to `0`.
+            executor: An optional `concurrent.futures.Executor` to apply this
+                query in.
+
+        Returns:
+            A list of `JSONPathNode` instances.
+
+        Raises:
+            ValueError: If _limit_ or _offset_ is negative.
+            JSONPathTypeError: If a filter expression attempts to use types in
+                an incompatible way.
+            JSONPathLimitError: If applying the query exceeds one of the
+                environment's resource limits.
+        """
+        _check_limit_and_offset(limit, offset)
+
+        if executor is None:
+            return JSONPathNodeList(
+                [
+                    node
+                    async for node in self.afinditer(value, limit=limit, offset=offset)
+                ]
+            )
+
+        import asyncio  # noqa: PLC0415
+        from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+        from .cooperative import find_in_process  # noqa: PLC0415
+
+        loop = asyncio.get_running_loop()
+
+        if isinstance(executor, ProcessPoolExecutor):
+            return await loop.run_in_executor(
+                executor,
+                partial(
+                    find_in_process, type(self.env), str(self), value, limit, offset
+                ),
+            )
+
+        return await loop.run_in_executor(
+            executor, partial(self.find, value, limit=limit, offset=offset)
+        )
+
+    async def afinditer_stream(  # noqa: PLR0912, PLR0915
+        self,
+        stream: AsyncIterable[bytes],
+        *,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> AsyncIterator[JSONPathNode]:
+        """Generate nodes for each match of this query in a JSON byte stream.
+
+        _stream_ is an asynchronous iterable of UTF-8 encoded chunks of a JSON
+        document, like the body of an HTTP response. Members of the document's
+        top-level array or object are decoded as soon as they have arrived,
+        and nodes are produced for matches in each member without waiting for
+        the rest of the document, as long as this query's first segment has a
+        single name, wildcard or filter selector, or a single index or slice
+        that doesn't count from the end of an array, and no filter in this
+        query uses the root identifier, `$`. Otherwise the whole document is
+        read before this query is applied.
+
+        Matches are produced in the same order as `afinditer()` would produce
+        them, except when the top-level object has duplicate names. Where
+        `json.loads()` keeps only the last member with a given name, each
+        streamed member with that name is tested, and can produce a node
+        holding its own value. Nodes refer to the document's top-level array
+        or object, which is complete once _stream_ has been read in full.
+        Reading stops as soon as _limit_ nodes have been produced.
+
+        When profiling is enabled, the first segment of a streamed query is
+        not included in its profile.
+
+        Arguments:
+            stream: An asynchronous iterable of `bytes`.
+            limit: The maximum number of nodes to produce. Defaults to `None`,
+                no limit.
+            offset: The number of matching nodes to skip before producing
+                nodes. Defaults to `0`.
+
+        Returns:
+            An asynchronous iterator yielding `JSONPathNode` objects for each
+            match.
+
+        Raises:
+            ValueError: If _limit_ or _offset_ is negative.
+            json.JSONDecodeError: If _stream_ is not a valid JSON document.
+            JSONPathTypeError: If a filter expression attempts to use types in
+                an incompatible way.
+            JSONPathLimitError: If applying the query exceeds one of the
+                environment's resource limits. `evaluation_timeout` includes
+                time spent waiting for _stream_.
+        """
+        import asyncio  # noqa: PLC0415
+
+        from .cooperative import Clock  # noqa: PLC0415
+        from .cooperative import clocked  # noqa: PLC0415
+        from .stream import MemberDecoder  # noqa: PLC0415
+        from .stream import member_test  # noqa: PLC0415
+
+        _check_limit_and_offset(limit, offset)
+
+        stop = None if limit is None else offset + limit
+        if stop == 0:
+            return
+
+        decoder = MemberDecoder()
+        limited = has_limits(self.env)
+        segments = self._get_cooperative_segments(limited=limited)[1:]
+        meter = Meter(self.env) if limited else None
+        clock = Clock(self.env.async_yield_interval)
+
+        root: Optional[JSONPathNode] = None
+        test: Optional[MemberTest] = None
+        count = 0
+        members = 0
+        chunks = stream.__aiter__()
+
+        while True:
+            try:
+                chunk = await chunks.__anext__()
+            except StopAsyncIteration:
+                decoder.close()
+            else:
+                decoder.feed(chunk)
+
+            for key, member in decoder.members():
+                if root is None:
+                    document = decoder.document
+                    root = JSONPathNode(
+                        value=document, location=(), parent=None, root=document
+                    )
+                    test = member_test(self, document)
+                    if test is not None and meter is not None:
+                        meter.visit(self.segments[0].token)
+
+                if test is None:
+                    # Wait for the whole document.
+                    continue
+
+                members += 1
+                if members % clock.interval == 0:
+                    await asyncio.sleep(0)
+
+                nodes = clocked(
+                    self._stream_member(
+                        root, test, key, member, segments=segments, meter=meter
+                    ),
+                    clock,
+                )
+                if meter is not None:
+                    nodes = metered(self.env, nodes, meter)
+
+                for node in nodes:
+                    if node is PAUSE:
+                        await asyncio.sleep(0)
+                        continue
+                    count += 1
+                    if count > offset:
+                        yield node
+                    if stop is not None and count >= stop:
+                        return
+
+            if decoder.closed:
+                break
+
+        if test is None:
+            async for node in self.afinditer(
+                decoder.document, limit=limit, offset=offset
+            ):
+                yield node
+
+    def _stream_member(
+        self,
+        root: JSONPathNode,
+        test: MemberTest,
+        key: Union[int, str],
+        value: object,
+        *,
+        segments: Tuple[JSONPathSegment, ...],
+        meter: Optional[Meter],
+    ) -> Iterable[JSONPathNode]:
+        """Generate nodes from a member of _root_, if our first segment selects it."""
+        if not test(key, value):
+            return
+
+        if meter is not None:
+            meter.produce(self.segments[0].token)
+
+        nodes: Iterable[JSONPathNode] = [root.new_child(value, key, root)]
+        for segment in segments:
+            nodes = segment.resolve(nodes)
+        yield from nodes
+
+    # If two threads get to one of these at once, both build equivalent
+    # segments and one of them wins. Segments hold no per-call state, so they
+    # can be shared by concurrent calls, including cooperative segments, which
+    # count visits with the clock of the call that is resolving them.
+
+    def _get_limited_segments(self) -> Tuple[JSONPathSegment, ...]:
+        if self._limited_segments is None:
+            self._limited_segments = limit_segments(self._segments)
+        return self._limited_segments
+
+    def _get_cooperative_segments(
+        self, *, limited: bool
+    ) -> Tuple[JSONPathSegment, ...]:
+        from .cooperative import cooperative_segments  # noqa: PLC0415
+
+        if limited:
+            if self._limited_cooperative_segments is None:
+                self._limited_cooperative_segments = cooperative_segments(
+                    self._get_limited_segments()
+                )
+            return self._limited_cooperative_segments
+
+        if self._cooperative_segments is None:
+            self._cooperative_segments = cooperative_segments(self._segments)
+        return self._cooperative_segments
+
+    def complexity(self) -> Complexity:
+        """Return a static estimate of how expensive this query is to apply.
+
+        The score grows with the number of segments and filters, descendant
+        segments, root queries in filters applied under a descendant segment,
+        and `match` and `search` calls with patterns that are not known until
+        the filter is evaluated. Anything inside a filter counts double for
+        each level of nesting.
+        """
+        if self._complexity is None:
+            self._complexity = complexity(self)
+        return self._complexity
+
+    def explain(self) -> str:
+        """Return a description of how this query will be evaluated.
+
+        The description includes the segments, selectors and filter
+        expressions that make up this query, optimizations applied when the
+        query was compiled, fast paths that will be used when it is applied
+        to data, and features that are expensive to evaluate, like descendant
+        segments and root queries inside filters.
+        """
+        from .explain import explain  # noqa: PLC0415
+
+        return explain(self)
+
     def singular_query(self) -> bool:
         """Return `True` if this JSONPath expression is a singular query."""
         for segment in self.segments:
@@ -139,3 +777,26 @@ class JSONPathQuery:
     def empty(self) -> bool:
         """Return `True` if this query has no segments."""
         return not bool(self.segments)
+
+
+def _check_limit_and_offset(limit: Optional[int], offset: int) -> None:
+    if limit is not None and limit < 0:
+        raise ValueError(f"limit must be a non-negative integer, got {limit!r}")
+    if offset < 0:
+        raise ValueError(f"offset must be a non-negative integer, got {offset!r}")
+
+
+def _slice(
+    nodes: Iterable[JSONPathNode], offset: int, limit: Optional[int]
+) -> Iterable[JSONPathNode]:
+    """Generate nodes from _nodes_, skipping _offset_ and stopping at _limit_.
+
+    When we've produced enough nodes, _nodes_ is closed, which closes each
+    segment's generator in turn, rather than leaving them suspended.
+    """
+    it = iter(nodes)
+    try:
+        yield from islice(it, offset, None if limit is None else offset + limit)
+    finally:
+        if isinstance(it, Generator):
+            it.close()
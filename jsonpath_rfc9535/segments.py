@@ -7,9 +7,11 @@ from abc import ABC
 from abc import abstractmethod
 from collections import deque
 from typing import TYPE_CHECKING
+from typing import Any
 from typing import Deque
 from typing import Iterable
 from typing import Tuple
+from typing import Union
 
 from .exceptions import JSONPathRecursionError
 
@@ -19,6 +21,10 @@ if TYPE_CHECKING:
     from .selectors import JSONPathSelector
     from .tokens import Token
 
+# An array or object, the name or index of one of its members, and the
+# location of the array or object in the document.
+Location = Tuple[Any, Union[int, str], Tuple[Union[int, str], ...]]
+
 
 class JSONPathSegment(ABC):
     """Base class for all JSONPath segments."""
@@ -40,6 +46,26 @@ class JSONPathSegment(ABC):
     def resolve(self, nodes: Iterable[JSONPathNode]) -> Iterable[JSONPathNode]:
         """Apply this segment to each `JSONPathNode` in _nodes_."""
 
+    def count(self, nodes: Iterable[JSONPathNode]) -> int:
+        """Return the number of nodes this segment would select from _nodes_.
+
+        Segments that can count their matches without creating a
+        `JSONPathNode` for each of them override this method.
+        """
+        return sum(1 for _ in self.resolve(nodes))
+
+    def locate(self, nodes: Iterable[JSONPathNode]) -> Iterable[Location]:
+        """Generate the location of each node this segment would select from _nodes_.
+
+        A location is an (array or object, name or index, location of the
+        array or object) tuple. Segments that can locate their matches
+        without creating a `JSONPathNode` for each of them override this
+        method.
+        """
+        for node in self.resolve(nodes):
+            parent = node.parent
+            yield parent.value, node.location[-1], parent.location  # type: ignore
+
 
 class JSONPathChildSegment(JSONPathSegment):
     """The JSONPath child selection segment."""
@@ -50,6 +76,21 @@ class JSONPathChildSegment(JSONPathSegment):
             for selector in self.selectors:
                 yield from selector.resolve(node)
 
+    def count(self, nodes: Iterable[JSONPathNode]) -> int:
+        """Return the number of children this segment would select from _nodes_."""
+        return sum(
+            selector.count(node) for node in nodes for selector in self.selectors
+        )
+
+    def locate(self, nodes: Iterable[JSONPathNode]) -> Iterable[Location]:
+        """Generate the location of each child this segment would select."""
+        for node in nodes:
+            value = node.value
+            location = node.location
+            for selector in self.selectors:
+                for key in selector.keys(node):
+                    yield value, key, location
+
     def __str__(self) -> str:
         return f"[{', '.join(str(itm) for itm in self.selectors)}]"
 
@@ -78,6 +119,37 @@ class JSONPathRecursiveDescentSegment(JSONPathSegment):
                 for selector in self.selectors:
                     yield from selector.resolve(_node)
 
+    def count(self, nodes: Iterable[JSONPathNode]) -> int:
+        """Return the number of descendants this segment would select from _nodes_.
+
+        Nodes are only created for arrays and objects visited on the way down,
+        not for the values being counted.
+        """
+        visitor = (
+            self._nondeterministic_visit if self.env.nondeterministic else self._visit
+        )
+
+        return sum(
+            selector.count(_node)
+            for node in nodes
+            for _node in visitor(node)
+            for selector in self.selectors
+        )
+
+    def locate(self, nodes: Iterable[JSONPathNode]) -> Iterable[Location]:
+        """Generate the location of each descendant this segment would select."""
+        visitor = (
+            self._nondeterministic_visit if self.env.nondeterministic else self._visit
+        )
+
+        for node in nodes:
+            for _node in visitor(node):
+                value = _node.value
+                location = _node.location
+                for selector in self.selectors:
+                    for key in selector.keys(_node):
+                        yield value, key, location
+
     def _visit(self, node: JSONPathNode, depth: int = 1) -> Iterable[JSONPathNode]:
         """Depth-first, pre-order node traversal."""
         if depth > self.env.max_recursion_depth:
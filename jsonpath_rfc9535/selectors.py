@@ -9,15 +9,20 @@ from contextlib import suppress
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Iterable
+from typing import List
 from typing import Optional
 from typing import Sequence
+from typing import Tuple
+from typing import Union
 
 from .exceptions import JSONPathIndexError
 from .exceptions import JSONPathTypeError
 from .filter_expressions import FilterContext
+from .node import PAUSE
 from .serialize import canonical_string
 
 if TYPE_CHECKING:
+    from .columnar import ColumnarFilter
     from .environment import JSONPathEnvironment
     from .filter_expressions import FilterExpression
     from .node import JSONPathNode
@@ -44,6 +49,23 @@ class JSONPathSelector(ABC):
             The `JSONPathNode` instances created by applying this selector to _node_.
         """
 
+    def count(self, node: JSONPathNode) -> int:
+        """Return the number of nodes this selector would select from _node_.
+
+        Selectors that can count their matches without creating a
+        `JSONPathNode` for each of them override this method.
+        """
+        return sum(1 for _ in self.resolve(node))
+
+    def keys(self, node: JSONPathNode) -> Iterable[Union[int, str]]:
+        """Generate the names or indices of values this selector selects from _node_.
+
+        Selectors that can find their matches without creating a
+        `JSONPathNode` for each of them override this method.
+        """
+        for _node in self.resolve(node):
+            yield _node.location[-1]
+
 
 class NameSelector(JSONPathSelector):
     """The name selector."""
@@ -79,6 +101,15 @@ class NameSelector(JSONPathSelector):
             with suppress(KeyError):
                 yield node.new_child(node.value[self.name], self.name, node)
 
+    def count(self, node: JSONPathNode) -> int:
+        """Return `1` if _node_ is a dict/object with our name, `0` otherwise."""
+        return int(isinstance(node.value, dict) and self.name in node.value)
+
+    def keys(self, node: JSONPathNode) -> Iterable[Union[int, str]]:
+        """Generate our name if _node_ is a dict/object with our name."""
+        if isinstance(node.value, dict) and self.name in node.value:
+            yield self.name
+
 
 class IndexSelector(JSONPathSelector):
     """The array index selector."""
@@ -124,6 +155,20 @@ class IndexSelector(JSONPathSelector):
             with suppress(IndexError):
                 yield node.new_child(node.value[self.index], norm_index, node)
 
+    def count(self, node: JSONPathNode) -> int:
+        """Return `1` if _node_ is an array/list with our index, `0` otherwise."""
+        if isinstance(node.value, list):
+            length = len(node.value)
+            return int(-length <= self.index < length)
+        return 0
+
+    def keys(self, node: JSONPathNode) -> Iterable[Union[int, str]]:
+        """Generate our normalized index if _node_ is an array/list with our index."""
+        if isinstance(node.value, list) and (
+            -len(node.value) <= self.index < len(node.value)
+        ):
+            yield self._normalized_index(node.value)
+
 
 class SliceSelector(JSONPathSelector):
     """Array/List slicing selector."""
@@ -174,6 +219,133 @@ class SliceSelector(JSONPathSelector):
             ):
                 yield node.new_child(element, idx, node)
 
+    def count(self, node: JSONPathNode) -> int:
+        """Return the number of elements our slice selects from _node_."""
+        if isinstance(node.value, list) and self.slice.step != 0:
+            return len(range(*self.slice.indices(len(node.value))))
+        return 0
+
+    def keys(self, node: JSONPathNode) -> Iterable[Union[int, str]]:
+        """Generate the indices our slice selects from _node_."""
+        if isinstance(node.value, list) and self.slice.step != 0:
+            yield from range(*self.slice.indices(len(node.value)))
+
+
+class KeysSelector(JSONPathSelector):
+    """Adjacent name, index and slice selectors, merged into one selector.
+
+    Names are applied to dicts/objects and indices and slices are applied to
+    arrays/lists, in the order they appeared in the query, duplicates
+    included. Runs of contiguous, ascending indices are stored as a single
+    slice.
+
+    `KeysSelector` is not produced by the parser. See
+    `jsonpath_rfc9535.optimize`.
+
+    Arguments:
+        env: The `JSONPathEnvironment` this selector is bound to.
+        token: The token of the first selector in _selectors_.
+        selectors: The `NameSelector`, `IndexSelector` and `SliceSelector`
+            instances to merge. Slices must have a step of `1`.
+    """
+
+    __slots__ = ("selectors", "names", "slices")
+
+    def __init__(
+        self,
+        *,
+        env: JSONPathEnvironment,
+        token: Token,
+        selectors: Sequence[JSONPathSelector],
+    ) -> None:
+        super().__init__(env=env, token=token)
+        self.selectors = tuple(selectors)
+        self.names = tuple(s.name for s in selectors if isinstance(s, NameSelector))
+        self.slices = _merge_indices(selectors)
+
+    def __str__(self) -> str:
+        return ", ".join(str(selector) for selector in self.selectors)
+
+    def __eq__(self, __value: object) -> bool:
+        return (
+            isinstance(__value, KeysSelector)
+            and self.selectors == __value.selectors
+            and self.token == __value.token
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.selectors, self.token))
+
+    def resolve(self, node: JSONPathNode) -> Iterable[JSONPathNode]:
+        """Select values from a dict/object by name or from an array/list by index."""
+        value = node.value
+        if isinstance(value, dict):
+            for name in self.names:
+                try:
+                    yield node.new_child(value[name], name, node)
+                except KeyError:
+                    continue
+        elif isinstance(value, list):
+            length = len(value)
+            for slice_ in self.slices:
+                start, stop, _ = slice_.indices(length)
+                for idx in range(start, stop):
+                    yield node.new_child(value[idx], idx, node)
+
+    def count(self, node: JSONPathNode) -> int:
+        """Return the number of values this selector would select from _node_."""
+        value = node.value
+        if isinstance(value, dict):
+            return sum(1 for name in self.names if name in value)
+        if isinstance(value, list):
+            length = len(value)
+            return sum(len(range(*s.indices(length))) for s in self.slices)
+        return 0
+
+    def keys(self, node: JSONPathNode) -> Iterable[Union[int, str]]:
+        """Generate the names or indices this selector selects from _node_."""
+        value = node.value
+        if isinstance(value, dict):
+            for name in self.names:
+                if name in value:
+                    yield name
+        elif isinstance(value, list):
+            length = len(value)
+            for slice_ in self.slices:
+                yield from range(*slice_.indices(length))
+
+
+def _merge_indices(selectors: Sequence[JSONPathSelector]) -> Tuple[slice, ...]:
+    """Return index and slice selectors from _selectors_ as a tuple of slices."""
+    slices: List[slice] = []
+    # The first and last index of the current run of contiguous indices.
+    run: Optional[Tuple[int, int]] = None
+
+    for selector in selectors:
+        if isinstance(selector, IndexSelector):
+            index = selector.index
+            if run is not None and index == run[1] + 1 and index != 0:
+                run = (run[0], index)
+                continue
+            if run is not None:
+                slices.append(_index_slice(*run))
+            run = (index, index)
+        elif isinstance(selector, SliceSelector):
+            if run is not None:
+                slices.append(_index_slice(*run))
+                run = None
+            slices.append(selector.slice)
+
+    if run is not None:
+        slices.append(_index_slice(*run))
+
+    return tuple(slices)
+
+
+def _index_slice(first: int, last: int) -> slice:
+    """Return a slice selecting indices _first_ to _last_, inclusive."""
+    return slice(first, last + 1 if last != -1 else None)
+
 
 class WildcardSelector(JSONPathSelector):
     """The wildcard selector."""
@@ -207,11 +379,24 @@ class WildcardSelector(JSONPathSelector):
             for i, element in enumerate(node.value):
                 yield node.new_child(element, i, node)
 
+    def count(self, node: JSONPathNode) -> int:
+        """Return the number of children of _node_."""
+        if isinstance(node.value, (dict, list)):
+            return len(node.value)
+        return 0
+
+    def keys(self, node: JSONPathNode) -> Iterable[Union[int, str]]:
+        """Generate the names or indices of all children of _node_."""
+        if isinstance(node.value, dict):
+            yield from node.value
+        elif isinstance(node.value, list):
+            yield from range(len(node.value))
+
 
 class FilterSelector(JSONPathSelector):
     """Filter array/list items or dict/object values with a filter expression."""
 
-    __slots__ = ("expression",)
+    __slots__ = ("expression", "columns")
 
     def __init__(
         self,
@@ -223,6 +408,15 @@ class FilterSelector(JSONPathSelector):
         super().__init__(env=env, token=token)
         self.expression = expression
 
+        self.columns: Optional[ColumnarFilter] = None
+        """A plan for applying our expression to large arrays column-wise, or
+        `None` if our expression can't be applied that way."""
+
+        if env.columnar_filter_threshold is not None:
+            from .columnar import plan_filter  # noqa: PLC0415
+
+            self.columns = plan_filter(expression)
+
     def __str__(self) -> str:
         return f"?{self.expression}"
 
@@ -236,41 +430,64 @@ class FilterSelector(JSONPathSelector):
     def __hash__(self) -> int:
         return hash((str(self.expression), self.token))
 
-    def resolve(self, node: JSONPathNode) -> Iterable[JSONPathNode]:  # noqa: PLR0912
+    def resolve(self, node: JSONPathNode) -> Iterable[JSONPathNode]:
         """Select array/list items or dict/object values where with a filter."""
-        if isinstance(node.value, dict):
-            if self.env.nondeterministic:
-                _members = list(node.value.items())
-                random.shuffle(_members)
-                members: Iterable[Any] = iter(_members)
-            else:
-                members = node.value.items()
+        for key, val in self._matching_members(node):
+            yield node.new_child(val, key, node)
 
-            for name, val in members:
-                context = FilterContext(
-                    env=self.env,
-                    current=val,
-                    root=node.root,
-                )
-                try:
-                    if self.expression.evaluate(context):
-                        yield node.new_child(val, name, node)
-                except JSONPathTypeError as err:
-                    if not err.token:
-                        err.token = self.token
-                    raise
+    def keys(self, node: JSONPathNode) -> Iterable[Union[int, str]]:
+        """Generate the names or indices of members of _node_ that pass our filter."""
+        for key, _ in self._matching_members(node):
+            yield key
 
-        elif isinstance(node.value, list):
-            for i, element in enumerate(node.value):
-                context = FilterContext(
-                    env=self.env,
-                    current=element,
-                    root=node.root,
-                )
-                try:
-                    if self.expression.evaluate(context):
-                        yield node.new_child(element, i, node)
-                except JSONPathTypeError as err:
-                    if not err.token:
-                        err.token = self.token
-                    raise
+    def _matching_members(self, node: JSONPathNode) -> Iterable[Tuple[Any, Any]]:
+        """Generate (key, value) pairs of members of _node_ that pass our filter.
+
+        Pairs from `_members()` with `PAUSE` as their key are passed through
+        without being tested.
+        """
+        value = node.value
+        threshold = self.env.columnar_filter_threshold
+        if (
+            self.columns is not None
+            and threshold is not None
+            and isinstance(value, list)
+            and len(value) >= threshold
+        ):
+            indices = self.columns.select(value)
+            if indices is not None:
+                for i in indices:
+                    yield i, value[i]
+                return
+
+        # One context is shared by every member of _node_. Expressions are
+        # evaluated to completion before we move on to the next member, so
+        # nothing sees `current` change underneath it.
+        context = FilterContext(env=self.env, current=None, root=node.root)
+        evaluate = self.expression.evaluate
+
+        for key, val in self._members(value):
+            if key is PAUSE:
+                yield key, val
+                continue
+
+            context.current = val
+            try:
+                if evaluate(context):
+                    yield key, val
+            except JSONPathTypeError as err:
+                if not err.token:
+                    err.token = self.token
+                raise
+
+    def _members(self, value: object) -> Iterable[Any]:
+        """Return (key, value) pairs of members of _value_ to test."""
+        if isinstance(value, dict):
+            if self.env.nondeterministic:
+                members = list(value.items())
+                random.shuffle(members)
+                return members
+            return value.items()
+        if isinstance(value, list):
+            return enumerate(value)
+        return ()
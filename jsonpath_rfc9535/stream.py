@@ -0,0 +1,482 @@
+"""Apply compiled JSONPath queries to JSON documents as they arrive.
+
+`JSONPathQuery.afinditer_stream()` decodes members of a document's top-level
+array or object one at a time with a `MemberDecoder`, as bytes arrive from an
+asynchronous byte stream. A query's first segment is applied to each member as
+soon as it has been decoded, then the query's remaining segments are applied
+to each selected member, so nodes are produced before the whole document has
+been received.
+
+This only works if the first segment is a child segment with a single name,
+index, slice, wildcard or filter selector, where indices and slices don't count
+from the end of an array, and no filter in the query uses the root identifier,
+`$`, as that refers to the whole document. For other queries, the whole
+document is decoded before the query is applied.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from .exceptions import JSONPathTypeError
+from .filter_expressions import ComparisonExpression
+from .filter_expressions import FilterContext
+from .filter_expressions import FilterExpression
+from .filter_expressions import FilterQuery
+from .filter_expressions import FunctionExtension
+from .filter_expressions import LogicalExpression
+from .filter_expressions import PrefixExpression
+from .filter_expressions import RootFilterQuery
+from .limits import LimitedFilterExpression
+from .optimize import fold
+from .segments import JSONPathChildSegment
+from .selectors import FilterSelector
+from .selectors import IndexSelector
+from .selectors import NameSelector
+from .selectors import SliceSelector
+from .selectors import WildcardSelector
+
+if TYPE_CHECKING:
+    from .environment import JSONValue
+    from .filter_expressions import Expression
+    from .query import JSONPathQuery
+
+Key = Union[int, str]
+MemberTest = Callable[[Key, object], bool]
+
+_DECODER = json.JSONDecoder()
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# The end of a number, `true`, `false` or `null`.
+_SCALAR_END = re.compile(r"[ \t\n\r,:\]}]")
+
+# Characters that change string or nesting state outside a string.
+_STRUCTURE = re.compile(r'["\[\]{}]')
+
+# Characters that end a string or start an escape sequence inside a string.
+_STRING_END = re.compile(r'["\\]')
+
+# Returned in place of a value that hasn't been fed in full.
+_INCOMPLETE = object()
+
+# Decoder states.
+_OPEN = 0
+_FIRST = 1
+_KEY = 2
+_COLON = 3
+_VALUE = 4
+_SEPARATOR = 5
+_END = 6
+_SCALAR = 7
+
+
+class MemberDecoder:
+    """Decode members of a JSON document's top-level array or object.
+
+    Feed UTF-8 encoded bytes to the decoder with `feed()`, then iterate
+    `members()` for names or indices and values of members that are complete.
+    Decoded values are added to `document`, an empty list or dict until the
+    first member is complete.
+
+    If the document is not an array or object, `document` is `None` until
+    the decoder has been closed.
+
+    Like `json.loads()`, when an object has duplicate names, `document` keeps
+    the last member with each name. Unlike `json.loads()`, `members()` yields
+    every one of them, as they arrive.
+
+    Attributes:
+        document: The document's top-level array or object, holding members
+            decoded so far, or the whole document after `close()`.
+    """
+
+    __slots__ = (
+        "document",
+        "_text",
+        "_buf",
+        "_pos",
+        "_state",
+        "_key",
+        "_closing",
+        "_scan",
+        "_depth",
+        "_in_string",
+        "_eof",
+    )
+
+    def __init__(self) -> None:
+        self.document: JSONValue = None
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._state = _OPEN
+        self._key = ""
+        self._closing = ""
+
+        # Where to resume looking for the end of the current value, or -1 if
+        # we haven't started, and nesting state at that position.
+        self._scan = -1
+        self._depth = 0
+        self._in_string = False
+
+        self._eof = False
+
+    def feed(self, data: bytes) -> None:
+        """Add _data_ to the end of the document."""
+        if self._pos:
+            # Forget decoded text.
+            self._buf = self._buf[self._pos :]
+            if self._scan >= 0:
+                self._scan -= self._pos
+            self._pos = 0
+        self._buf += self._text.decode(data)
+
+    def close(self) -> None:
+        """Mark the end of the document.
+
+        Iterate `members()` once more after calling `close()` to decode the
+        last members of the document.
+        """
+        self._buf += self._text.decode(b"", final=True)
+        self._eof = True
+
+    @property
+    def closed(self) -> bool:
+        """`True` if `close()` has been called."""
+        return self._eof
+
+    def members(self) -> Iterator[Tuple[Key, object]]:  # noqa: PLR0912, PLR0915
+        """Generate keys and values of members that have been fed in full.
+
+        Raises:
+            json.JSONDecodeError: If the document is not valid JSON, or has
+                ended without being complete.
+        """
+        while True:
+            state = self._state
+
+            if state == _OPEN:
+                char = self._skip()
+                if char is None:
+                    break
+                if char == "[":
+                    self.document = []
+                    self._closing = "]"
+                elif char == "{":
+                    self.document = {}
+                    self._closing = "}"
+                else:
+                    self._state = _SCALAR
+                    break
+                self._pos += 1
+                self._state = _FIRST
+            elif state == _FIRST:
+                char = self._skip()
+                if char is None:
+                    break
+                if char == self._closing:
+                    self._pos += 1
+                    self._state = _END
+                else:
+                    self._state = _KEY if isinstance(self.document, dict) else _VALUE
+            elif state == _KEY:
+                key = self._value()
+                if key is _INCOMPLETE:
+                    break
+                if not isinstance(key, str):
+                    raise self._error(
+                        "Expecting property name enclosed in double quotes"
+                    )
+                self._key = key
+                self._state = _COLON
+            elif state == _COLON:
+                char = self._skip()
+                if char is None:
+                    break
+                if char != ":":
+                    raise self._error("Expecting ':' delimiter")
+                self._pos += 1
+                self._state = _VALUE
+            elif state == _VALUE:
+                value = self._value()
+                if value is _INCOMPLETE:
+                    break
+                key = self._add(value)
+                self._state = _SEPARATOR
+                yield key, value
+            elif state == _SEPARATOR:
+                char = self._skip()
+                if char is None:
+                    break
+                if char == ",":
+                    self._pos += 1
+                    self._state = _KEY if isinstance(self.document, dict) else _VALUE
+                elif char == self._closing:
+                    self._pos += 1
+                    self._state = _END
+                else:
+                    raise self._error("Expecting ',' delimiter")
+            else:
+                break
+
+        if self._eof:
+            self._finish()
+
+    def _finish(self) -> None:
+        """Check that we've decoded the whole document."""
+        if self._state == _SCALAR:
+            self.document = json.loads(self._buf[self._pos :])
+            self._pos = len(self._buf)
+            self._state = _END
+        elif self._state == _END:
+            if self._skip() is not None:
+                raise self._error("Extra data")
+        else:
+            raise self._error("Unexpected end of document")
+
+    def _skip(self) -> Optional[str]:
+        """Skip whitespace and return the next character, if there is one."""
+        match = _WHITESPACE.match(self._buf, self._pos)
+        assert match is not None
+        self._pos = match.end()
+        return self._buf[self._pos] if self._pos < len(self._buf) else None
+
+    def _value(self) -> object:
+        """Decode the value at the current position, or return `_INCOMPLETE`."""
+        buf = self._buf
+
+        if self._scan < 0:
+            char = self._skip()
+            if char is None:
+                return _INCOMPLETE
+
+            if char not in '"[{':
+                # A number, `true`, `false` or `null` is complete when we see
+                # the character that follows it.
+                match = _SCALAR_END.search(buf, self._pos)
+                if match is None and not self._eof:
+                    return _INCOMPLETE
+                value, end = _DECODER.raw_decode(buf, self._pos)
+                if end != (len(buf) if match is None else match.start()):
+                    self._pos = end
+                    raise self._error("Expecting ',' delimiter")
+                self._pos = end
+                return value
+
+            # Most arrays, objects and strings arrive in one piece, so try
+            # decoding before scanning for the end.
+            try:
+                value, end = _DECODER.raw_decode(buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._scan = self._pos
+                self._depth = 0
+                self._in_string = False
+            else:
+                self._pos = end
+                return value
+
+        end = self._scan_end()
+        if end < 0:
+            return _INCOMPLETE
+
+        value, stop = _DECODER.raw_decode(buf, self._pos)
+        if stop != end:  # pragma: no cover
+            self._pos = stop
+            raise self._error("Expecting ',' delimiter")
+        self._pos = end
+        return value
+
+    def _scan_end(self) -> int:
+        """Return the end of the array, object or string we're scanning, or -1.
+
+        Scanning resumes where it left off, so each character is only
+        scanned once, however many chunks a value is split over.
+        """
+        buf = self._buf
+        pos = self._scan
+        depth = self._depth
+
+        while True:
+            if self._in_string:
+                match = _STRING_END.search(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    break
+                if match.group() == "\\":
+                    if match.end() >= len(buf):
+                        # Look at this escape sequence again when we have more.
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                self._in_string = False
+                pos = match.end()
+            else:
+                match = _STRUCTURE.search(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    break
+                char = match.group()
+                pos = match.end()
+                if char == '"':
+                    self._in_string = True
+                    continue
+                depth += 1 if char in "[{" else -1
+
+            if depth <= 0:
+                self._scan = -1
+                return pos
+
+        self._scan = pos
+        self._depth = depth
+        return -1
+
+    def _add(self, value: object) -> Key:
+        document = self.document
+        if isinstance(document, dict):
+            document[self._key] = value
+            return self._key
+
+        assert isinstance(document, list)
+        document.append(value)
+        return len(document) - 1
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        # Positions are relative to text we haven't forgotten yet.
+        return json.JSONDecodeError(message, self._buf, self._pos)
+
+
+def member_test(  # noqa: PLR0911
+    query: JSONPathQuery, document: JSONValue
+) -> Optional[MemberTest]:
+    """Return a function testing if _query_'s first segment selects a member.
+
+    Arguments:
+        query: A compiled JSONPath query.
+        document: The top-level array or object of the document _query_ is
+            being applied to, used as the root of filter contexts.
+
+    Returns:
+        A function that takes a member's name or index and its value, and
+        returns `True` if the member is selected by the first segment of
+        _query_, or `None` if _query_ can't be applied one member at a time.
+    """
+    if not query.segments or _has_root_query(query):
+        return None
+
+    segment = query.segments[0]
+    if not isinstance(segment, JSONPathChildSegment) or len(segment.selectors) != 1:
+        return None
+
+    selector = segment.selectors[0]
+
+    if isinstance(selector, NameSelector):
+        name = selector.name
+        return lambda key, _: key == name
+
+    if isinstance(selector, IndexSelector):
+        index = selector.index
+        if index < 0:
+            return None
+        return lambda key, _: key == index
+
+    if isinstance(selector, SliceSelector):
+        return _slice_test(selector.slice)
+
+    if isinstance(selector, WildcardSelector):
+        return lambda _key, _value: True
+
+    if isinstance(selector, FilterSelector):
+        return _filter_test(query, selector, document)
+
+    return None
+
+
+def _slice_test(_slice: slice) -> Optional[MemberTest]:
+    start = 0 if _slice.start is None else _slice.start
+    stop = _slice.stop
+    step = 1 if _slice.step is None else _slice.step
+
+    if start < 0 or (stop is not None and stop < 0) or step <= 0:
+        return None
+
+    def test(key: Key, _: object) -> bool:
+        return (
+            isinstance(key, int)
+            and key >= start
+            and (stop is None or key < stop)
+            and (key - start) % step == 0
+        )
+
+    return test
+
+
+def _filter_test(
+    query: JSONPathQuery, selector: FilterSelector, document: JSONValue
+) -> MemberTest:
+    env = query.env
+    expression = selector.expression
+
+    if env.optimize_queries:
+        expression = FilterExpression(
+            expression.token, fold(expression.expression, truthy=True)
+        )
+
+    if env.max_filter_evaluations is not None or env.evaluation_timeout is not None:
+        expression = LimitedFilterExpression(expression)
+
+    context = FilterContext(env=env, current=None, root=document)
+    evaluate = expression.evaluate
+
+    def test(_: Key, value: object) -> bool:
+        context.current = value
+        try:
+            return evaluate(context)
+        except JSONPathTypeError as err:
+            if not err.token:
+                err.token = selector.token
+            raise
+
+    return test
+
+
+def _has_root_query(query: JSONPathQuery) -> bool:
+    """Return `True` if any filter in _query_ uses the root identifier."""
+    stack: List[Expression] = [
+        selector.expression.expression
+        for segment in query.segments
+        for selector in segment.selectors
+        if isinstance(selector, FilterSelector)
+    ]
+
+    while stack:
+        expression = stack.pop()
+        if isinstance(expression, RootFilterQuery):
+            return True
+        if isinstance(expression, (LogicalExpression, ComparisonExpression)):
+            stack.extend((expression.left, expression.right))
+        elif isinstance(expression, PrefixExpression):
+            stack.append(expression.right)
+        elif isinstance(expression, FunctionExtension):
+            stack.extend(expression.args)
+        elif isinstance(expression, FilterQuery):
+            stack.extend(
+                selector.expression.expression
+                for segment in expression.query.segments
+                for selector in segment.selectors
+                if isinstance(selector, FilterSelector)
+            )
+
+    return False
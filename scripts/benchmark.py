@@ -6,6 +6,8 @@ from typing import NamedTuple
 from typing import Sequence
 from typing import Union
 
+from import_budget import import_time
+
 # ruff: noqa: D100 D101 D103 T201
 
 
@@ -111,5 +113,12 @@ def benchmark(number: int = 100, best_of: int = 3) -> None:
     print("just find (values)".ljust(30), f"{min(results):.3f}")
 
 
+def benchmark_import(best_of: int = 5) -> None:
+    print(f"importing jsonpath_rfc9535, best of {best_of} rounds")
+    elapsed = import_time("jsonpath_rfc9535", best_of=best_of)
+    print("import".ljust(30), f"{elapsed:.3f} ms")
+
+
 if __name__ == "__main__":
+    benchmark_import()
     benchmark()
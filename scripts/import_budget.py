@@ -0,0 +1,102 @@
+"""Check import times against a budget.
+
+Each measurement is taken in a new Python interpreter, and the best of several
+rounds is compared to the budget. Exits with a non-zero status if any
+measurement is over budget.
+"""
+
+import subprocess
+import sys
+from typing import List
+from typing import NamedTuple
+
+# ruff: noqa: D101 D103 T201 S603
+
+
+class Budget(NamedTuple):
+    description: str
+    code: str
+    module: str
+    milliseconds: float
+
+
+BUDGETS = [
+    Budget(
+        description="import jsonpath_rfc9535",
+        code="import jsonpath_rfc9535",
+        module="jsonpath_rfc9535",
+        milliseconds=10,
+    ),
+    Budget(
+        description="import jsonpath_rfc9535.cli",
+        code="import jsonpath_rfc9535.cli",
+        module="jsonpath_rfc9535.cli",
+        milliseconds=30,
+    ),
+    Budget(
+        description="import and compile a query",
+        code="import jsonpath_rfc9535; jsonpath_rfc9535.compile('$.a[?@.b > 1]')",
+        module="",
+        milliseconds=35,
+    ),
+]
+
+
+def import_time(module: str, code: str = "", best_of: int = 5) -> float:
+    """Return the best cumulative time, in milliseconds, to import _module_.
+
+    If _code_ is given, it is executed instead of `import <module>`. If _module_
+    is empty, the wall time taken to execute _code_ is returned instead.
+    """
+    code = code or f"import {module}"
+    times: List[float] = []
+
+    for _ in range(best_of):
+        if not module:
+            timed = (
+                "import time; _t = time.perf_counter()\n"
+                f"{code}\n"
+                "print(time.perf_counter() - _t)"
+            )
+            result = subprocess.run(
+                [sys.executable, "-c", timed],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            times.append(float(result.stdout) * 1000)
+            continue
+
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        for line in result.stderr.splitlines():
+            _, cumulative, name = line.split("|")
+            if name.strip() == module:
+                times.append(int(cumulative) / 1000)
+                break
+
+    return min(times)
+
+
+def check_budgets(best_of: int = 5) -> bool:
+    ok = True
+    for budget in BUDGETS:
+        elapsed = import_time(budget.module, budget.code, best_of=best_of)
+        within = elapsed <= budget.milliseconds
+        ok = ok and within
+        status = "\033[92mok\033[0m" if within else "\033[91mover budget\033[0m"
+        print(
+            budget.description.ljust(30),
+            f"{elapsed:.3f} ms / {budget.milliseconds} ms".ljust(24),
+            status,
+        )
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check_budgets() else 1)
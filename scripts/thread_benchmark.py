@@ -0,0 +1,99 @@
+"""Apply queries from several threads at once and report throughput.
+
+Every thread shares the default environment, so threads compete for the same
+query and regex caches. On a free-threaded (no-GIL) build of CPython,
+throughput should grow with the number of threads, up to the number of CPU
+cores. With the GIL, it won't.
+
+Usage: python scripts/thread_benchmark.py [MAX_THREADS]
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Any
+from typing import List
+
+import jsonpath_rfc9535 as jsonpath
+
+# ruff: noqa: D103 T201
+
+DATA: Any = {
+    "users": [
+        {
+            "name": f"user{i}",
+            "score": i % 100,
+            "email": f"user{i}@example.com",
+            "tags": ["admin"] if i % 10 == 0 else ["user", "beta"],
+        }
+        for i in range(200)
+    ]
+}
+
+QUERIES = [
+    "$.users[*].name",
+    "$.users[?@.score > 90].email",
+    "$.users[?match(@.email, 'user1.*')].name",
+    "$.users[?@.tags[?@ == 'admin']].name",
+    "$..score",
+    "$.users[10:20].tags[0]",
+]
+
+ROUNDS = 200
+
+
+def work() -> None:
+    for _ in range(ROUNDS):
+        for query in QUERIES:
+            jsonpath.find(query, DATA)
+
+
+def run(threads: int) -> float:
+    """Return the number of queries applied per second using _threads_."""
+    barrier = threading.Barrier(threads + 1)
+
+    def target() -> None:
+        barrier.wait()
+        work()
+
+    workers: List[threading.Thread] = [
+        threading.Thread(target=target) for _ in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    return threads * ROUNDS * len(QUERIES) / elapsed
+
+
+def main() -> None:
+    max_threads = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 4)
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+
+    print(f"python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+    print(f"{len(QUERIES)} queries, {ROUNDS} rounds per thread")
+
+    # Warm up caches.
+    work()
+
+    baseline = 0.0
+    threads = 1
+    while threads <= max_threads:
+        throughput = run(threads)
+        baseline = baseline or throughput
+        print(
+            f"{threads:>3} threads".ljust(14),
+            f"{throughput:>10,.0f} queries/s".ljust(20),
+            f"{throughput / baseline:.2f}x",
+        )
+        threads *= 2
+
+
+if __name__ == "__main__":
+    main()
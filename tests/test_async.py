@@ -0,0 +1,174 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import List
+
+import pytest
+
+import jsonpath_rfc9535 as jsonpath
+from jsonpath_rfc9535 import JSONPathEnvironment
+from jsonpath_rfc9535 import JSONPathLimitError
+from jsonpath_rfc9535 import JSONPathNode
+
+
+class CooperativeEnvironment(JSONPathEnvironment):
+    async_yield_interval = 10
+
+
+class LimitedEnvironment(CooperativeEnvironment):
+    max_nodes_produced = 50
+
+
+class ProfilingEnvironment(CooperativeEnvironment):
+    profile_queries = True
+
+
+@pytest.fixture()
+def env() -> JSONPathEnvironment:
+    return CooperativeEnvironment()
+
+
+DATA: Any = {"a": [{"b": i, "c": [i, i + 1]} for i in range(100)]}
+
+QUERIES = [
+    "$.a[*].b",
+    "$.a[?@.b > 90].c[0]",
+    "$..c[1]",
+    "$.a[1, 2, 5:7].b",
+    "$",
+]
+
+
+async def _collect(it: Any) -> List[JSONPathNode]:
+    return [node async for node in it]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_same_nodes_as_finditer(env: JSONPathEnvironment, query: str) -> None:
+    nodes = asyncio.run(_collect(env.afinditer(query, DATA)))
+    assert [n.path() for n in nodes] == env.find(query, DATA).paths()
+
+
+@pytest.mark.parametrize(("limit", "offset"), [(None, 5), (3, 0), (3, 10), (0, 0)])
+def test_limit_and_offset(env: JSONPathEnvironment, limit: Any, offset: int) -> None:
+    query = "$..b"
+    nodes = asyncio.run(env.afind(query, DATA, limit=limit, offset=offset))
+    assert nodes.paths() == env.find(query, DATA, limit=limit, offset=offset).paths()
+
+
+def test_yields_to_event_loop(env: JSONPathEnvironment) -> None:
+    # A filter that matches nothing still gives other tasks a chance to run.
+    ticks: List[int] = []
+
+    async def ticker() -> None:
+        while True:
+            ticks.append(1)
+            await asyncio.sleep(0)
+
+    async def main() -> List[JSONPathNode]:
+        task = asyncio.ensure_future(ticker())
+        nodes = await env.afind("$.a[?@.b < 0]", DATA)
+        task.cancel()
+        return nodes
+
+    assert asyncio.run(main()) == []
+    assert len(ticks) >= 10  # noqa: PLR2004
+
+
+def test_synchronous_queries_do_not_pause(env: JSONPathEnvironment) -> None:
+    query = env.compile("$.a[?@.b < 0]")
+    asyncio.run(query.afind(DATA))
+    assert query.find(DATA) == []
+    assert query.count(DATA) == 0
+
+
+def test_limits() -> None:
+    env = LimitedEnvironment()
+    with pytest.raises(JSONPathLimitError):
+        asyncio.run(env.afind("$..*", DATA))
+
+
+def test_profiles_do_not_count_pauses() -> None:
+    env = ProfilingEnvironment()
+    query = env.compile("$.a[?@.b > 10].b")
+    asyncio.run(query.afind(DATA))
+
+    assert env.profiler is not None
+    profile = env.profiler.profile(query)
+    assert profile is not None
+    assert [(s.entered, s.emitted) for s in profile.segments] == [
+        (1, 1),
+        (1, 89),
+        (89, 89),
+    ]
+
+
+def test_thread_executor(env: JSONPathEnvironment) -> None:
+    async def main() -> Any:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return await env.afind("$.a[?@.b > 97].b", DATA, executor=executor)
+
+    assert asyncio.run(main()).values() == [98, 99]
+
+
+def test_process_executor(env: JSONPathEnvironment) -> None:
+    async def main() -> Any:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            return await env.afind("$.a[?@.b > 97].b", DATA, limit=1, executor=executor)
+
+    nodes = asyncio.run(main())
+    assert nodes.values() == [98]
+    assert nodes.paths() == ["$['a'][98]['b']"]
+
+
+def test_package_level_functions() -> None:
+    async def main() -> Any:
+        nodes = await jsonpath.afind("$.a[?@.b > 97].b", DATA)
+        return nodes.values(), [
+            n.value async for n in jsonpath.afinditer("$.a[0].c[*]", DATA)
+        ]
+
+    assert asyncio.run(main()) == ([98, 99], [0, 1])
+
+
+def _count_pauses(monkeypatch: pytest.MonkeyPatch) -> List[int]:
+    pauses: List[int] = []
+    sleep = asyncio.sleep
+
+    async def _sleep(delay: float) -> None:
+        pauses.append(1)
+        await sleep(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", _sleep)
+    return pauses
+
+
+def test_concurrent_calls_pause_independently(
+    env: JSONPathEnvironment, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Each call visits 7 nodes, fewer than `async_yield_interval`.
+    query = env.compile("$.a[0:5].b")
+    pauses = _count_pauses(monkeypatch)
+
+    async def main() -> List[Any]:
+        its = [query.afinditer(DATA), query.afinditer(DATA)]
+        values: List[Any] = []
+        for _ in range(5):
+            values.extend([(await it.__anext__()).value for it in its])
+        return values
+
+    assert asyncio.run(main()) == [0, 0, 1, 1, 2, 2, 3, 3, 4, 4]
+    assert pauses == []
+
+
+def test_async_yield_interval_set_after_compiling(
+    env: JSONPathEnvironment, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    query = env.compile("$.a[0:5].b")
+    asyncio.run(query.afind(DATA))
+    pauses = _count_pauses(monkeypatch)
+
+    env.async_yield_interval = 1
+    assert asyncio.run(query.afind(DATA)).values() == [0, 1, 2, 3, 4]
+    assert len(pauses) == 7  # noqa: PLR2004
@@ -250,3 +250,23 @@ def test_jsonpath(
 
     with open(outfile, "r") as fd:
         assert len(json.load(fd)) == 4  # noqa: PLR2004
+
+
+def test_explain(
+    parser: argparse.ArgumentParser,
+    invalid_target: str,
+    outfile: str,
+) -> None:
+    """Test that we can explain a JSONPath without reading the target document."""
+    args = parser.parse_args(
+        ["--explain", "-q", "$..products[0, 1]", "-f", invalid_target, "-o", outfile]
+    )
+
+    handle_path_command(args)
+    args.output.flush()
+
+    with open(outfile, "r") as fd:
+        explanation = fd.read()
+
+    assert explanation.startswith("query: $..['products'][0, 1]\n")
+    assert "descendant segments: 1" in explanation
@@ -0,0 +1,170 @@
+import copy
+from typing import Any
+
+import pytest
+
+from jsonpath_rfc9535 import JSONPathEnvironment
+from jsonpath_rfc9535.columnar import plan_filter
+from jsonpath_rfc9535.selectors import FilterSelector
+
+pytest.importorskip("numpy")
+
+
+class ColumnarEnvironment(JSONPathEnvironment):
+    columnar_filter_threshold = 1
+
+
+class ItemwiseEnvironment(JSONPathEnvironment):
+    columnar_filter_threshold = None
+
+
+VALUES: Any = [
+    0,
+    1,
+    2,
+    10,
+    -1,
+    1.0,
+    2.5,
+    float("nan"),
+    float("inf"),
+    True,
+    False,
+    None,
+    "",
+    "a",
+    "b",
+    "10",
+    [],
+    [1],
+    {},
+    {"x": 1},
+]
+
+DATA: Any = [
+    *({"a": v, "b": {"c": v}, "d": [v]} for v in VALUES),
+    {"b": 1},
+    {"d": []},
+    7,
+    "a",
+    None,
+    [1, 2],
+]
+
+FILTERS = [
+    "@.a",
+    "!@.a",
+    "@.b.c",
+    "@.d[0]",
+    "@.d[-1]",
+    "@.a == 1",
+    "@.a != 1",
+    "@.a < 1",
+    "@.a > 1",
+    "@.a <= 1",
+    "@.a >= 1",
+    "@.a == 1.0",
+    "@.a < 2.5",
+    "@.a == true",
+    "@.a != true",
+    "@.a < true",
+    "@.a >= true",
+    "@.a == false",
+    "@.a == null",
+    "@.a != null",
+    "@.a <= null",
+    "@.a == 'a'",
+    "@.a < 'b'",
+    "@.a >= 'a'",
+    "@.a != 'a'",
+    "1 < @.a",
+    "'a' == @.b.c",
+    "null == @.d[0]",
+    "@.a > 0 && @.a < 10",
+    "@.a == 1 || @.a == 'a'",
+    "!(@.a == 1) && @.b",
+    "@.b.c == 2 || !@.d",
+    "@[0] == 1",
+    "@ > 1",
+    "@ == 'a'",
+]
+
+
+@pytest.mark.parametrize("filter_", FILTERS)
+def test_columnar_matches_itemwise(filter_: str) -> None:
+    query = f"$[?{filter_}]"
+    columnar = ColumnarEnvironment().compile(query)
+    itemwise = ItemwiseEnvironment().compile(query)
+
+    selector = columnar.segments[0].selectors[0]
+    assert isinstance(selector, FilterSelector)
+    assert selector.columns is not None
+
+    assert [n.path() for n in columnar.finditer(DATA)] == [
+        n.path() for n in itemwise.finditer(DATA)
+    ]
+
+
+@pytest.mark.parametrize("filter_", FILTERS)
+def test_columnar_set_matches_itemwise(filter_: str) -> None:
+    query = f"$[?{filter_}]"
+    columnar = copy.deepcopy(DATA)
+    itemwise = copy.deepcopy(DATA)
+    ColumnarEnvironment().compile(query).set(columnar, "x")
+    ItemwiseEnvironment().compile(query).set(itemwise, "x")
+    assert columnar == itemwise
+
+
+@pytest.mark.parametrize(
+    "filter_",
+    [
+        "@",
+        "@.a == @.b",
+        "@..a",
+        "@.*",
+        "@['a', 'b']",
+        "$.a == 1",
+        "length(@.a) == 1",
+    ],
+)
+def test_no_plan(filter_: str) -> None:
+    selector = ColumnarEnvironment().compile(f"$[?{filter_}]").segments[0].selectors[0]
+    assert isinstance(selector, FilterSelector)
+    assert plan_filter(selector.expression) is None
+
+
+def test_large_integers_fall_back() -> None:
+    env = ColumnarEnvironment()
+    data = [{"a": 2**53 + 1}, {"a": 2**53}, {"a": 1}]
+    assert env.find("$[?@.a > 9007199254740992]", data).values() == [data[0]]
+
+
+def test_unknown_types_fall_back() -> None:
+    class Number(int):
+        pass
+
+    env = ColumnarEnvironment()
+    data = [{"a": Number(1)}, {"a": True}]
+    assert env.find("$[?@.a == 1]", data).values() == [data[0]]
+
+
+def test_threshold() -> None:
+    env = JSONPathEnvironment()
+    assert env.columnar_filter_threshold == 1000  # noqa: PLR2004
+    data = [{"a": i % 7} for i in range(2000)]
+    assert len(env.find("$[?@.a == 3]", data)) == 286  # noqa: PLR2004
+    assert len(env.find("$[?@.a == 3]", data[:10])) == 1
+
+
+def test_profiled_filters_are_not_planned() -> None:
+    class ProfilingEnvironment(ColumnarEnvironment):
+        profile_queries = True
+
+    env = ProfilingEnvironment()
+    query = env.compile("$[?@.a == 1]")
+    query.find(DATA)
+
+    assert env.profiler is not None
+    profile = env.profiler.profile(query)
+    assert profile is not None
+    assert profile.segments[0].selectors[0].filter_evaluations == len(DATA)
@@ -0,0 +1,117 @@
+import dataclasses
+import operator
+
+import pytest
+
+from jsonpath_rfc9535 import JSONPathComplexityError
+from jsonpath_rfc9535 import JSONPathEnvironment
+from jsonpath_rfc9535.complexity import Complexity
+
+
+@dataclasses.dataclass
+class Case:
+    description: str
+    query: str
+    want: Complexity
+
+
+TEST_CASES = [
+    Case(
+        description="root identifier",
+        query="$",
+        want=Complexity(0, 0, 0, 0, 0, 0),
+    ),
+    Case(
+        description="child segments",
+        query="$.a.b[0]",
+        want=Complexity(3, 0, 0, 0, 0, 0),
+    ),
+    Case(
+        description="descendant segment",
+        query="$..a",
+        want=Complexity(11, 1, 0, 0, 0, 0),
+    ),
+    Case(
+        description="filter",
+        query="$[?@.a]",
+        want=Complexity(5, 0, 0, 1, 0, 0),
+    ),
+    Case(
+        description="nested filters",
+        query="$[?@[?@[?@.a]]]",
+        want=Complexity(29, 0, 0, 3, 0, 0),
+    ),
+    Case(
+        description="descendant segment in a filter",
+        query="$..*[?@..x]",
+        want=Complexity(36, 2, 1, 1, 0, 0),
+    ),
+    Case(
+        description="root query in descent",
+        query="$..[?$.a == @.b]",
+        want=Complexity(57, 1, 0, 1, 1, 0),
+    ),
+    Case(
+        description="root query after descent",
+        query="$..a[?$.a == @.b]",
+        want=Complexity(58, 1, 0, 1, 1, 0),
+    ),
+    Case(
+        description="root query without descent",
+        query="$.a[?$.a == @.b]",
+        want=Complexity(8, 0, 0, 1, 0, 0),
+    ),
+    Case(
+        description="literal regex pattern",
+        query="$[?match(@.a, 'a.*')]",
+        want=Complexity(5, 0, 0, 1, 0, 0),
+    ),
+    Case(
+        description="dynamic regex pattern",
+        query="$[?match(@.a, @.b)]",
+        want=Complexity(27, 0, 0, 1, 0, 1),
+    ),
+]
+
+
+@pytest.fixture()
+def env() -> JSONPathEnvironment:
+    return JSONPathEnvironment()
+
+
+@pytest.mark.parametrize("case", TEST_CASES, ids=operator.attrgetter("description"))
+def test_complexity(env: JSONPathEnvironment, case: Case) -> None:
+    assert env.compile(case.query).complexity() == case.want
+
+
+def test_reject_complex_queries() -> None:
+    class Env(JSONPathEnvironment):
+        max_query_complexity = 20
+
+    env = Env()
+    assert env.compile("$..a").complexity().score == 11  # noqa: PLR2004
+
+    with pytest.raises(JSONPathComplexityError, match="exceeds maximum 20") as err:
+        env.compile("$..*[?@..x]")
+
+    assert err.value.complexity.score == 36  # noqa: PLR2004
+
+    # Rejected queries are not cached.
+    with pytest.raises(JSONPathComplexityError):
+        env.compile("$..*[?@..x]")
+
+    assert len(env.query_cache) == 1
+
+
+def test_cached_queries_are_checked() -> None:
+    env = JSONPathEnvironment()
+    query = "$..a..b..c[?@.x[?@.y]]"
+    assert env.compile(query).complexity().score == 48  # noqa: PLR2004
+
+    env.max_query_complexity = 1
+
+    with pytest.raises(JSONPathComplexityError, match="exceeds maximum 1"):
+        env.compile(query)
+
+    with pytest.raises(JSONPathComplexityError, match="exceeds maximum 1"):
+        env.compile("$..a..b..c[?@.x[?@.z]]")
@@ -1,6 +1,10 @@
 import pytest
 
 from jsonpath_rfc9535 import JSONPathEnvironment
+from jsonpath_rfc9535 import JSONPathIndexError
+from jsonpath_rfc9535.environment import RE_SIMPLE_QUERY
+from jsonpath_rfc9535.lex import tokenize
+from jsonpath_rfc9535.tokens import TokenStream
 
 
 @pytest.fixture()
@@ -19,3 +23,38 @@ def test_find_on_no_match(env: JSONPathEnvironment) -> None:
     """Test that we get `None` if there are no matches."""
     match = env.find_one("$.other", {"some": 1, "thing": 2})
     assert match is None
+
+
+SIMPLE_QUERIES = [
+    "$",
+    "$.a",
+    "$.a.b[0].c",
+    "$['a']['b']",
+    '$["a"][-1]',
+    "$['a\"b'][\"a'b\"]",
+    "$['']",
+    "$.é-_1",
+]
+
+
+@pytest.mark.parametrize("query", SIMPLE_QUERIES)
+def test_simple_query_fast_path(env: JSONPathEnvironment, query: str) -> None:
+    assert RE_SIMPLE_QUERY.fullmatch(query)
+    tokens = tokenize(query)
+    want = tuple(env.parser.parse(TokenStream(tokens)))
+    got = env.compile(query).segments
+    assert got == want
+    assert [str(segment) for segment in got] == [str(segment) for segment in want]
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["$[01]", "$[-0]", "$['\\u263a']", "$[ 0]", "$..a", "$[0,1]", "$['\x01']"],
+)
+def test_not_a_simple_query(query: str) -> None:
+    assert not RE_SIMPLE_QUERY.fullmatch(query)
+
+
+def test_simple_query_index_out_of_range(env: JSONPathEnvironment) -> None:
+    with pytest.raises(JSONPathIndexError):
+        env.compile("$.a[9007199254740992]")
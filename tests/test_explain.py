@@ -0,0 +1,107 @@
+from typing import List
+
+import pytest
+
+from jsonpath_rfc9535 import JSONPathEnvironment
+
+
+@pytest.fixture()
+def env() -> JSONPathEnvironment:
+    return JSONPathEnvironment()
+
+
+def _section(explanation: str, name: str) -> List[str]:
+    lines = explanation.splitlines()
+    start = lines.index(f"{name}:") + 1
+    section: List[str] = []
+    for line in lines[start:]:
+        if not line.startswith("  "):
+            break
+        section.append(line.strip())
+    return section
+
+
+def test_plan(env: JSONPathEnvironment) -> None:
+    explanation = env.compile("$.a[?@.b > 1, 0]").explain()
+    assert _section(explanation, "plan") == [
+        "['a']  child segment",
+        "'a'  name selector",
+        "[?@['b'] > 1, 0]  child segment",
+        "?@['b'] > 1  filter selector",
+        ">",
+        "@['b']  relative query, singular",
+        "['b']  child segment",
+        "'b'  name selector",
+        "1  literal",
+        "0  index selector",
+    ]
+
+
+def test_root_query(env: JSONPathEnvironment) -> None:
+    explanation = env.compile("$").explain()
+    assert _section(explanation, "plan") == ["root node"]
+    assert _section(explanation, "optimizations") == ["none"]
+    assert _section(explanation, "fast paths") == ["none"]
+
+
+def test_optimizations(env: JSONPathEnvironment) -> None:
+    explanation = env.compile("$[0, 1][?1 == 2][?@.a && 1 == 1][?@[?1 == 1]]").explain()
+    assert _section(explanation, "optimizations") == [
+        "merged `0, 1` into one keys selector",
+        "removed always false filter `?1 == 2`",
+        "simplified filter `?@['a'] && 1 == 1` to `?@['a']`",
+        "@[?1 == 1]: replaced always true filter `?1 == 1` with `*`",
+    ]
+
+
+def test_optimizations_disabled() -> None:
+    class UnoptimizedEnvironment(JSONPathEnvironment):
+        optimize_queries = False
+
+    explanation = UnoptimizedEnvironment().compile("$[0, 1][?1 == 1]").explain()
+    assert "evaluation: lazy, deterministic, not optimized" in explanation
+    assert _section(explanation, "optimizations") == ["none"]
+    assert _section(explanation, "fast paths") == ["none"]
+
+
+def test_fast_paths(env: JSONPathEnvironment) -> None:
+    query = "$['a', 'b'][?match(@.a, 'ab.*') || search(@.b, 'a(b|c)')]"
+    assert _section(env.compile(query).explain(), "fast paths") == [
+        (
+            "keys selector `'a', 'b'` selects names with dict lookups, "
+            "and indices and slices as ranges"
+        ),
+        "match(@['a'], 'ab.*'): prefix pattern, matched with str operations",
+        "search(@['b'], 'a(b|c)'): matched with the regex engine",
+    ]
+
+
+def test_columnar_fast_path(env: JSONPathEnvironment) -> None:
+    (fast_path,) = _section(env.compile("$[?@.a > 1]").explain(), "fast paths")
+    assert fast_path.startswith(
+        "filter `?@['a'] > 1` is applied to arrays of 1000 or more items "
+        "a column at a time"
+    )
+
+
+def test_cost(env: JSONPathEnvironment) -> None:
+    query = "$..a[?@.b == $.c && match(@.d, @.e)]"
+    assert _section(env.compile(query).explain(), "cost") == [
+        "singular query: no",
+        "descendant segments: 1",
+        "root queries in filters: 1",
+        "relative queries in filters: 3",
+        "dynamic regex patterns: 1",
+        "complexity score: 82",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("query", "want"),
+    [
+        ("$.a[0]", "compile: simple query, built without the lexer and parser"),
+        ("$.a[*]", "compile: RegexLexer and Parser"),
+    ],
+)
+def test_environment_explain(env: JSONPathEnvironment, query: str, want: str) -> None:
+    assert env.explain(query).splitlines()[1] == want
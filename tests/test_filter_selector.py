@@ -0,0 +1,31 @@
+from typing import Any
+
+from jsonpath_rfc9535 import JSONPathEnvironment
+
+DATA: Any = [
+    {"a": [{"b": 1}, {"b": 2}], "c": 1},
+    {"a": [{"b": 3}], "c": 2},
+    {"a": [], "c": 3},
+]
+
+
+def test_nested_filters() -> None:
+    env = JSONPathEnvironment()
+    query = env.compile("$[?@.a[?@.b > 1]].c")
+    assert query.find(DATA).values() == [1, 2]
+
+
+def test_interleaved_iteration() -> None:
+    env = JSONPathEnvironment()
+    query = env.compile("$[?@.c > 1].c")
+    first = iter(query.finditer(DATA))
+    second = iter(query.finditer(DATA))
+    assert next(first).value == 2  # noqa: PLR2004
+    assert next(second).value == 2  # noqa: PLR2004
+    assert next(first).value == 3  # noqa: PLR2004
+    assert next(second).value == 3  # noqa: PLR2004
+
+
+def test_filter_scalar() -> None:
+    env = JSONPathEnvironment()
+    assert env.find("$[?@ > 1]", 7).values() == []
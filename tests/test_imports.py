@@ -0,0 +1,82 @@
+import subprocess
+import sys
+
+import pytest
+
+import jsonpath_rfc9535
+
+
+def _run(code: str) -> None:
+    subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
+
+
+def test_import_is_lazy() -> None:
+    _run(
+        """\
+import sys
+import jsonpath_rfc9535
+
+assert "jsonpath_rfc9535.environment" not in sys.modules
+assert "jsonpath_rfc9535.lex" not in sys.modules
+assert jsonpath_rfc9535._default_env is None
+
+from jsonpath_rfc9535 import JSONPathSyntaxError
+assert "jsonpath_rfc9535.environment" not in sys.modules
+
+assert jsonpath_rfc9535.find("$.a", {"a": 1}).values() == [1]
+assert "jsonpath_rfc9535.environment" in sys.modules
+"""
+    )
+
+
+def test_compile_imports_only_what_it_needs() -> None:
+    _run(
+        """\
+import sys
+import jsonpath_rfc9535
+
+jsonpath_rfc9535.compile("$.a[?@.b > 1 && match(@.c, 'x')]").find({"a": []})
+
+for name in (
+    "cooperative",
+    "explain",
+    "mutate",
+    "predicate",
+    "profiling",
+    "stream",
+):
+    assert f"jsonpath_rfc9535.{name}" not in sys.modules, name
+
+assert "regex" not in sys.modules
+"""
+    )
+
+
+def test_cli_imports_environment_when_needed() -> None:
+    _run(
+        """\
+import sys
+from jsonpath_rfc9535.cli import setup_parser
+
+setup_parser()
+assert "jsonpath_rfc9535.environment" not in sys.modules
+"""
+    )
+
+
+@pytest.mark.parametrize("name", jsonpath_rfc9535.__all__)
+def test_exported_names(name: str) -> None:
+    assert getattr(jsonpath_rfc9535, name) is not None
+    assert name in dir(jsonpath_rfc9535)
+
+
+def test_default_environment_is_created_once() -> None:
+    env = jsonpath_rfc9535.DEFAULT_ENV
+    assert isinstance(env, jsonpath_rfc9535.JSONPathEnvironment)
+    assert jsonpath_rfc9535.DEFAULT_ENV is env
+    assert jsonpath_rfc9535.compile("$.a") is env.compile("$.a")
+
+
+def test_unknown_attribute() -> None:
+    with pytest.raises(AttributeError, match="has no attribute 'nosuchthing'"):
+        jsonpath_rfc9535.nosuchthing  # noqa: B018
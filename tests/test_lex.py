@@ -1,10 +1,18 @@
 import dataclasses
 import operator
 from typing import List
+from typing import Type
 
 import pytest
 
+from jsonpath_rfc9535 import JSONPathEnvironment
+from jsonpath_rfc9535.exceptions import JSONPathIndexError
+from jsonpath_rfc9535.exceptions import JSONPathSyntaxError
+from jsonpath_rfc9535.lex import Lexer
+from jsonpath_rfc9535.lex import RegexLexer
+from jsonpath_rfc9535.lex import iter_tokens
 from jsonpath_rfc9535.lex import lex
+from jsonpath_rfc9535.lex import tokenize
 from jsonpath_rfc9535.tokens import Token
 from jsonpath_rfc9535.tokens import TokenType
 
@@ -484,3 +492,140 @@ def test_lexer(case: Case) -> None:
     lexer, tokens = lex(case.query)
     lexer.run()
     assert lexer.tokens == case.want
+
+
+@pytest.mark.parametrize("case", TEST_CASES, ids=operator.attrgetter("description"))
+def test_regex_lexer(case: Case) -> None:
+    lexer = RegexLexer(case.query)
+    lexer.run()
+    assert lexer.tokens == case.want
+
+
+# Queries where the regex lexer hands over to the character-level lexer, or
+# where token boundaries are easy to get wrong.
+EQUIVALENCE_QUERIES = [
+    "$",
+    "$ ",
+    "$.",
+    "$..",
+    "$. a",
+    "$.. a",
+    "$...a",
+    "$ .a [0] ..b",
+    "$[?@.a ]",
+    "$[?@.a == 1 ",
+    "$[?@.a = 1]",
+    "$[?@.a == 1)]",
+    "$[?(@.a == 1]",
+    "$[?true(1)]",
+    "$[?nullx(1)]",
+    "$[?foo]",
+    "$[?@.a == :1.0]",
+    "$[?@.a == 1e5 && @.b < -1.5E-3]",
+    "$[?count(@..*) > 1, ?length(@.a) < (1)]",
+    "$[?@[?@.a]]",
+    "$['a\\'b', \"c\\\"d\", '\\u263a']",
+    "$['\\x']",
+    '$["\\\'"]',
+    "$['abc",
+    "$[1:2:-1, ::, :3]",
+    "$[-]",
+    "$[1,2",
+    "$]",
+    "foo",
+    "",
+]
+
+
+@pytest.mark.parametrize("query", EQUIVALENCE_QUERIES)
+def test_regex_lexer_is_equivalent_to_lexer(query: str) -> None:
+    def scan(lexer: Lexer) -> object:
+        try:
+            lexer.run()
+        except JSONPathSyntaxError as err:
+            return str(err)
+        return [(t.type_, t.value, t.index, t.message) for t in lexer.tokens]
+
+    assert scan(RegexLexer(query)) == scan(Lexer(query))
+
+
+@pytest.mark.parametrize("query", EQUIVALENCE_QUERIES)
+def test_tokenize_with_either_lexer(query: str) -> None:
+    def _tokenize(lexer_class: Type[Lexer]) -> object:
+        try:
+            tokens = tokenize(query, lexer_class)
+        except JSONPathSyntaxError as err:
+            return str(err)
+        return [(t.type_, t.value, t.index) for t in tokens]
+
+    assert _tokenize(RegexLexer) == _tokenize(Lexer)
+
+
+@pytest.mark.parametrize("lexer_class", [Lexer, RegexLexer])
+@pytest.mark.parametrize("query", EQUIVALENCE_QUERIES)
+def test_iter_tokens_is_equivalent_to_tokenize(
+    query: str, lexer_class: Type[Lexer]
+) -> None:
+    def _tokens(func: object) -> object:
+        try:
+            return list(func(query, lexer_class))  # type: ignore
+        except JSONPathSyntaxError as err:
+            return str(err)
+
+    assert _tokens(iter_tokens) == _tokens(tokenize)
+
+
+@pytest.mark.parametrize("lexer_class", [Lexer, RegexLexer])
+def test_iter_tokens_is_lazy(lexer_class: Type[Lexer]) -> None:
+    query = "$.a[?@.b == 1].c[1:2]"
+    tokens = iter_tokens(query, lexer_class)
+    assert next(tokens) == Token(TokenType.ROOT, "$", 0, query)
+    assert next(tokens) == Token(TokenType.PROPERTY, "a", 2, query)
+    assert next(tokens) == Token(TokenType.LBRACKET, "[", 3, query)
+
+
+@pytest.mark.parametrize("lexer_class", [Lexer, RegexLexer])
+def test_scan_does_not_collect_tokens(lexer_class: Type[Lexer]) -> None:
+    lexer = lexer_class("$.a.b[0]")
+    assert len(list(lexer.scan())) == 7  # noqa: PLR2004
+    assert lexer.tokens == []
+
+
+def test_syntax_errors_are_raised_before_later_tokens_are_scanned() -> None:
+    query = "$[01].\x00"
+
+    # The lexer only fails at the end of the query.
+    with pytest.raises(JSONPathSyntaxError, match="unexpected shorthand selector"):
+        tokenize(query)
+
+    # The parser sees the invalid index before the lexer reaches the end.
+    with pytest.raises(JSONPathSyntaxError, match="leading zero in index selector"):
+        JSONPathEnvironment().compile(query)
+
+
+@pytest.mark.parametrize(
+    ("query", "column"),
+    [
+        ("$[?@ == 1e400", 8),
+        ("$[?@ == 1e400]", 8),
+        ("$[?-1e29007199254740992", 3),
+        ("$[?@ == 1" + "0" * 5000 + "]", 8),
+    ],
+)
+def test_out_of_range_numeric_literals(query: str, column: int) -> None:
+    with pytest.raises(JSONPathSyntaxError, match=f"line 1, column {column}$"):
+        JSONPathEnvironment().compile(query)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "$[1" + "0" * 5000 + "]",
+        "$.a[1" + "0" * 5000 + ", 0]",
+        "$[1" + "0" * 5000 + ":]",
+        "$[::-1" + "0" * 5000 + "]",
+    ],
+)
+def test_out_of_range_indices(query: str) -> None:
+    with pytest.raises(JSONPathIndexError, match="index out of range"):
+        JSONPathEnvironment().compile(query)
@@ -0,0 +1,100 @@
+import asyncio
+from typing import Any
+from typing import List
+
+import pytest
+
+import jsonpath_rfc9535 as jsonpath
+from jsonpath_rfc9535 import JSONPathEnvironment
+
+DATA: Any = {"a": [{"x": i} for i in range(100)]}
+
+
+@pytest.fixture()
+def env() -> JSONPathEnvironment:
+    return JSONPathEnvironment()
+
+
+@pytest.mark.parametrize(
+    ("limit", "offset", "want"),
+    [
+        (None, 0, list(range(100))),
+        (3, 0, [0, 1, 2]),
+        (3, 10, [10, 11, 12]),
+        (None, 97, [97, 98, 99]),
+        (5, 98, [98, 99]),
+        (0, 0, []),
+        (3, 200, []),
+    ],
+)
+def test_limit_and_offset(
+    env: JSONPathEnvironment, limit: int, offset: int, want: Any
+) -> None:
+    query = "$.a[*].x"
+    assert env.find(query, DATA, limit=limit, offset=offset).values() == want
+    assert [
+        node.value for node in env.finditer(query, DATA, limit=limit, offset=offset)
+    ] == want
+
+
+@pytest.mark.parametrize(
+    ("limit", "offset", "message"),
+    [
+        (-1, 0, "limit must be a non-negative integer, got -1"),
+        (None, -1, "offset must be a non-negative integer, got -1"),
+        (1, -5, "offset must be a non-negative integer, got -5"),
+    ],
+)
+def test_negative_limit_or_offset(
+    env: JSONPathEnvironment, limit: Any, offset: int, message: str
+) -> None:
+    query = env.compile("$.a[*]")
+
+    with pytest.raises(ValueError, match=message):
+        env.find("$.a[*]", DATA, limit=limit, offset=offset)
+
+    # Raised before any nodes are requested.
+    with pytest.raises(ValueError, match=message):
+        query.finditer(DATA, limit=limit, offset=offset)
+
+    with pytest.raises(ValueError, match=message):
+        asyncio.run(query.afind(DATA, limit=limit, offset=offset))
+
+    async def collect() -> List[Any]:
+        return [
+            node async for node in query.afinditer(DATA, limit=limit, offset=offset)
+        ]
+
+    with pytest.raises(ValueError, match=message):
+        asyncio.run(collect())
+
+
+def test_stop_early() -> None:
+    class Env(JSONPathEnvironment):
+        profile_queries = True
+
+    env = Env()
+    query = env.compile("$..[?@.x > 10]")
+    assert query.find(DATA, limit=2).values() == [{"x": 11}, {"x": 12}]
+
+    assert env.profiler is not None
+    profile = env.profiler.profile(query)
+    assert profile is not None
+    assert profile.segments[0].selectors[0].filter_evaluations == 14  # noqa: PLR2004
+
+
+def test_count(env: JSONPathEnvironment) -> None:
+    assert env.count("$.a[?@.x >= 90]", DATA) == 10  # noqa: PLR2004
+    assert env.count("$.b", DATA) == 0
+    assert env.compile("$..x").count(DATA) == 100  # noqa: PLR2004
+
+
+def test_exists(env: JSONPathEnvironment) -> None:
+    assert env.exists("$.a[?@.x == 50]", DATA) is True
+    assert env.exists("$.a[?@.x == 500]", DATA) is False
+    assert env.compile("$").exists(DATA) is True
+
+
+def test_default_environment() -> None:
+    assert jsonpath.find("$.a[*].x", DATA, limit=2, offset=1).values() == [1, 2]
+    assert [node.value for node in jsonpath.finditer("$.a[*].x", DATA, limit=1)] == [0]
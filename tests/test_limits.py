@@ -0,0 +1,159 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from jsonpath_rfc9535 import JSONPathEnvironment
+from jsonpath_rfc9535 import JSONPathLimitError
+from jsonpath_rfc9535.limits import DEADLINE_CHECK_INTERVAL
+from jsonpath_rfc9535.limits import LimitedSelector
+
+DATA: Any = {"a": [{"x": i, "b": list(range(10))} for i in range(10)]}
+
+# 122 arrays and objects.
+NESTED: Any = {"a": [{"b": [[j] for j in range(10)]} for _ in range(10)]}
+
+
+def test_no_limits_by_default() -> None:
+    query = JSONPathEnvironment().compile("$.a[*]")
+    assert not any(
+        isinstance(selector, LimitedSelector)
+        for segment in query._segments  # noqa: SLF001
+        for selector in segment.selectors
+    )
+
+
+def test_max_nodes_visited() -> None:
+    class Env(JSONPathEnvironment):
+        max_nodes_visited = 100
+
+    env = Env()
+    assert len(env.find("$.a[*].x", DATA)) == 10  # noqa: PLR2004
+
+    with pytest.raises(JSONPathLimitError, match="maximum nodes visited") as err:
+        env.find("$..*", NESTED)
+
+    assert err.value.stats.nodes_visited == 101  # noqa: PLR2004
+
+
+def test_max_nodes_produced() -> None:
+    class Env(JSONPathEnvironment):
+        max_nodes_produced = 50
+
+    env = Env()
+    assert len(env.find("$.a[0:3]", DATA)) == 3  # noqa: PLR2004
+
+    with pytest.raises(JSONPathLimitError, match="maximum nodes produced") as err:
+        env.find("$.a[*].b[*]", DATA)
+
+    assert err.value.stats.nodes_produced == 51  # noqa: PLR2004
+
+
+def test_max_filter_evaluations() -> None:
+    class Env(JSONPathEnvironment):
+        max_filter_evaluations = 20
+
+    env = Env()
+    assert len(env.find("$.a[?@.x > 5]", DATA)) == 4  # noqa: PLR2004
+
+    with pytest.raises(JSONPathLimitError, match="maximum filter evaluations") as err:
+        env.find("$.a[*].b[?@ > 5]", DATA)
+
+    assert err.value.stats.filter_evaluations == 21  # noqa: PLR2004
+
+
+def test_limits_include_embedded_queries() -> None:
+    class Env(JSONPathEnvironment):
+        max_nodes_visited = 100
+
+    env = Env()
+
+    # 1 + 1 nodes visited by the outer query, and 10 * 12 by `@..x`.
+    with pytest.raises(JSONPathLimitError) as err:
+        env.find("$.a[?@..x]", NESTED)
+
+    assert err.value.stats.filter_evaluations < 10  # noqa: PLR2004
+
+
+def test_limits_are_per_application() -> None:
+    class Env(JSONPathEnvironment):
+        max_nodes_visited = 20
+
+    query = Env().compile("$.a[?@.x > 5]")
+    for _ in range(5):
+        assert len(query.find(DATA)) == 4  # noqa: PLR2004
+
+
+def test_lazy_application() -> None:
+    class Env(JSONPathEnvironment):
+        max_nodes_produced = 15
+
+    it = iter(Env().finditer("$.a[*].b[*]", DATA))
+    assert [next(it).value for _ in range(3)] == [0, 1, 2]
+
+    # Other queries can be applied while `it` is suspended.
+    assert len(Env().find("$.a[*]", DATA)) == 10  # noqa: PLR2004
+
+    with pytest.raises(JSONPathLimitError):
+        list(it)
+
+
+def test_evaluation_timeout() -> None:
+    class Env(JSONPathEnvironment):
+        evaluation_timeout = 0.0
+
+    env = Env()
+    assert len(env.find("$.a[0]", DATA)) == 1
+
+    with pytest.raises(JSONPathLimitError, match="evaluation timeout") as err:
+        env.find("$..*", NESTED)
+
+    assert err.value.stats.nodes_visited == DEADLINE_CHECK_INTERVAL
+
+
+def test_limits_and_profiling() -> None:
+    class Env(JSONPathEnvironment):
+        max_filter_evaluations = 20
+        profile_queries = True
+
+    env = Env()
+    query = env.compile("$.a[?@.x > 5]")
+    assert len(query.find(DATA)) == 4  # noqa: PLR2004
+
+    assert env.profiler is not None
+    profile = env.profiler.profile(query)
+    assert profile is not None
+    assert profile.segments[1].selectors[0].filter_evaluations == 10  # noqa: PLR2004
+
+    with pytest.raises(JSONPathLimitError):
+        env.find("$.a[*].b[?@ > 5]", DATA)
+
+
+def test_limits_set_after_compiling() -> None:
+    env = JSONPathEnvironment()
+    query = env.compile("$.a[*]")
+    data = {"a": [1, 2, 3, 4]}
+    assert len(env.find("$.a[*]", data)) == 4  # noqa: PLR2004
+
+    env.max_nodes_produced = 1
+
+    with pytest.raises(JSONPathLimitError):
+        env.find("$.a[*]", data)
+
+    with pytest.raises(JSONPathLimitError):
+        query.find(data)
+
+    with pytest.raises(JSONPathLimitError):
+        query.count(data)
+
+    with pytest.raises(JSONPathLimitError):
+        query.set(data, 0)
+
+    with pytest.raises(JSONPathLimitError):
+        asyncio.run(query.afind(data))
+
+    assert data == {"a": [1, 2, 3, 4]}
+
+    env.max_nodes_produced = None
+    assert len(query.find(data)) == 4  # noqa: PLR2004
+    assert query.count(data) == 4  # noqa: PLR2004
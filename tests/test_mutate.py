@@ -0,0 +1,222 @@
+import copy
+from typing import Any
+from typing import List
+from typing import Set
+from typing import Tuple
+
+import pytest
+
+from jsonpath_rfc9535 import JSONPathEnvironment
+from jsonpath_rfc9535 import JSONPathLimitError
+
+
+@pytest.fixture()
+def env() -> JSONPathEnvironment:
+    return JSONPathEnvironment()
+
+
+DATA: Any = {
+    "a": {"a": {"a": 1, "b": 2}, "b": [1, 2, 3]},
+    "b": [{"x": 1}, {"x": 5}, {"y": 2}, 7],
+    "c": "c",
+}
+
+QUERIES = [
+    "$.c",
+    "$.a.b[1]",
+    "$.a.b[-1]",
+    "$.a.b[5]",
+    "$.a.b[0:2]",
+    "$.a.b[::-1]",
+    "$.b[*]",
+    "$.a[*]",
+    "$.b[?@.x]",
+    "$.b[?@.x > 1].x",
+    "$.b[0, 0, 3]",
+    "$.a['a', 'b', 'a']",
+    "$..a",
+    "$..b",
+    "$..*",
+    "$..[0]",
+    "$..[?@ > 1]",
+    "$..a..b",
+    "$.*..*",
+    "$.nosuchthing",
+]
+
+
+def expected_update(env: JSONPathEnvironment, query: str, data: Any) -> Any:
+    """Update _data_ one node at a time, deepest first, skipping duplicates."""
+    nodes = env.find(query, data)
+    seen: List[str] = []
+    for node in sorted(nodes, key=lambda n: len(n.location), reverse=True):
+        if node.path() not in seen:
+            seen.append(node.path())
+            node.value = {"old": node.parent.value[node.location[-1]]}  # type: ignore
+    return data
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_update(env: JSONPathEnvironment, query: str) -> None:
+    data = copy.deepcopy(DATA)
+    expected = expected_update(env, query, copy.deepcopy(DATA))
+    assert env.compile(query).update(data, lambda v: {"old": v}) is data
+    assert data == expected
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_set(env: JSONPathEnvironment, query: str) -> None:
+    data = copy.deepcopy(DATA)
+    expected = copy.deepcopy(DATA)
+    for node in env.find(query, expected):
+        node.value = None
+    assert env.compile(query).set(data, None) is data
+    assert data == expected
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_update_without_optimization(query: str) -> None:
+    class _Env(JSONPathEnvironment):
+        optimize_queries = False
+
+    env = _Env()
+    data = copy.deepcopy(DATA)
+    expected = expected_update(env, query, copy.deepcopy(DATA))
+    env.compile(query).update(data, lambda v: {"old": v})
+    assert data == expected
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_update_with_profiling(query: str) -> None:
+    class _Env(JSONPathEnvironment):
+        profile_queries = True
+
+    env = _Env()
+    data = copy.deepcopy(DATA)
+    expected = expected_update(env, query, copy.deepcopy(DATA))
+    env.compile(query).update(data, lambda v: {"old": v})
+    assert data == expected
+
+
+def test_nested_matches_are_updated_deepest_first(env: JSONPathEnvironment) -> None:
+    data = {"a": {"a": {"a": 1}}}
+    env.compile("$..a").update(data, lambda v: {"w": v})
+    assert data == {"a": {"w": {"a": {"w": {"a": {"w": 1}}}}}}
+
+
+def test_duplicate_matches_are_updated_once(env: JSONPathEnvironment) -> None:
+    data = {"a": [1, 2, 3]}
+    env.compile("$.a[0, 0, -3]").update(data, lambda v: v * 10)
+    assert data == {"a": [10, 2, 3]}
+
+
+def test_filters_see_original_data(env: JSONPathEnvironment) -> None:
+    data = {"a": [1, 2, 3]}
+    env.compile("$.a[?@ >= $.a[0]]").update(data, lambda v: v + 10)
+    assert data == {"a": [11, 12, 13]}
+
+
+def test_update_root(env: JSONPathEnvironment) -> None:
+    data = {"a": 1}
+    assert env.compile("$").update(data, lambda v: [v]) == [{"a": 1}]
+    assert env.compile("$").set(data, 1) == 1
+    assert data == {"a": 1}
+
+
+def test_update_is_limited() -> None:
+    class _Env(JSONPathEnvironment):
+        max_nodes_produced = 3
+
+    env = _Env()
+    data = {"a": [1, 2, 3]}
+    env.compile("$.a[0, 1]").update(data, lambda v: v * 10)
+    assert data == {"a": [10, 20, 3]}
+
+    with pytest.raises(JSONPathLimitError):
+        env.compile("$.a[*]").update(data, lambda v: v * 10)
+
+    assert data == {"a": [10, 20, 3]}
+
+
+def without(value: Any, locations: Set[Tuple[Any, ...]], location: Any = ()) -> Any:
+    """Return a copy of _value_ without the values at _locations_."""
+    if isinstance(value, dict):
+        return {
+            k: without(v, locations, (*location, k))
+            for k, v in value.items()
+            if (*location, k) not in locations
+        }
+    if isinstance(value, list):
+        return [
+            without(v, locations, (*location, i))
+            for i, v in enumerate(value)
+            if (*location, i) not in locations
+        ]
+    return value
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_delete(env: JSONPathEnvironment, query: str) -> None:
+    data = copy.deepcopy(DATA)
+    locations = {node.location for node in env.find(query, DATA)}
+    assert env.compile(query).delete(data) is data
+    assert data == without(DATA, locations)
+
+
+def test_delete_many_array_elements(env: JSONPathEnvironment) -> None:
+    data = {
+        "a": [{"secret": 1, "i": i} if i % 3 == 0 else {"i": i} for i in range(100)]
+    }
+    array = data["a"]
+    env.compile("$..[?@.secret]").delete(data)
+    assert data["a"] is array
+    assert [item["i"] for item in data["a"]] == [i for i in range(100) if i % 3]
+
+
+def test_delete_root(env: JSONPathEnvironment) -> None:
+    data = {"a": 1}
+    assert env.compile("$").delete(data) is None
+    assert data == {"a": 1}
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_copy_on_write(env: JSONPathEnvironment, query: str) -> None:
+    compiled = env.compile(query)
+    data = copy.deepcopy(DATA)
+
+    assert compiled.update(data, lambda v: {"old": v}, copy=True) == compiled.update(
+        copy.deepcopy(DATA), lambda v: {"old": v}
+    )
+    assert compiled.set(data, None, copy=True) == compiled.set(
+        copy.deepcopy(DATA), None
+    )
+    assert compiled.delete(data, copy=True) == compiled.delete(copy.deepcopy(DATA))
+    assert data == DATA
+
+
+def test_copy_on_write_shares_unchanged_values(env: JSONPathEnvironment) -> None:
+    data = copy.deepcopy(DATA)
+    result: Any = env.compile("$.a.b[1]").set(data, 0, copy=True)
+
+    assert result == {**DATA, "a": {**DATA["a"], "b": [1, 0, 3]}}
+    assert result is not data
+    assert result["a"] is not data["a"]
+    assert result["a"]["b"] is not data["a"]["b"]
+    assert result["a"]["a"] is data["a"]["a"]
+    assert result["b"] is data["b"]
+
+
+def test_copy_on_write_without_matches(env: JSONPathEnvironment) -> None:
+    data = copy.deepcopy(DATA)
+    assert env.compile("$.nosuchthing").delete(data, copy=True) is data
+
+
+def test_copy_on_write_is_limited() -> None:
+    class _Env(JSONPathEnvironment):
+        max_nodes_produced = 3
+
+    env = _Env()
+    data = {"a": [1, 2, 3], "b": [4]}
+    result = env.compile("$.a[0, 1]").update(data, lambda v: v * 10, copy=True)
+    assert result == {"a": [10, 20, 3], "b": [4]}
+    assert data == {"a": [1, 2, 3], "b": [4]}
@@ -0,0 +1,121 @@
+from typing import Any
+from typing import List
+
+import pytest
+
+from jsonpath_rfc9535 import JSONPathEnvironment
+from jsonpath_rfc9535 import JSONPathNodeList
+from jsonpath_rfc9535.function_extensions import ExpressionType
+from jsonpath_rfc9535.function_extensions import FilterFunction
+from jsonpath_rfc9535.function_extensions import NodesArgument
+
+
+class Recorder(FilterFunction):
+    arg_types = [ExpressionType.NODES, ExpressionType.VALUE]
+    return_type = ExpressionType.LOGICAL
+
+    def __init__(self, form: NodesArgument) -> None:
+        self.nodes_arguments = [form, NodesArgument.NODE_LIST]
+        self.calls: List[object] = []
+
+    def __call__(self, nodes: object, _: object) -> bool:  # noqa: D102
+        self.calls.append(nodes)
+        return True
+
+
+DATA: Any = [{"a": [1, 2]}, {"a": []}, 7]
+
+
+@pytest.fixture()
+def env() -> JSONPathEnvironment:
+    return JSONPathEnvironment()
+
+
+def test_count_argument(env: JSONPathEnvironment) -> None:
+    func = Recorder(NodesArgument.COUNT)
+    env.function_extensions["rec"] = func
+    env.find("$[?rec(@.a.*, 1)]", DATA)
+    assert func.calls == [2, 0, 0]
+
+
+def test_values_argument(env: JSONPathEnvironment) -> None:
+    func = Recorder(NodesArgument.VALUES)
+    env.function_extensions["rec"] = func
+    env.find("$[?rec(@.a.*, 1)]", DATA)
+    assert func.calls == [[1, 2], [], []]
+
+
+def test_node_list_argument(env: JSONPathEnvironment) -> None:
+    func = Recorder(NodesArgument.NODE_LIST)
+    env.function_extensions["rec"] = func
+    env.find("$[?rec(@.a.*, 1)]", DATA)
+    assert all(isinstance(nodes, JSONPathNodeList) for nodes in func.calls)
+    assert [len(nodes) for nodes in func.calls] == [2, 0, 0]  # type: ignore
+
+
+def test_root_query_argument(env: JSONPathEnvironment) -> None:
+    func = Recorder(NodesArgument.COUNT)
+    env.function_extensions["rec"] = func
+    env.find("$[?rec($.*, 1)]", DATA)
+    assert func.calls == [3, 3, 3]
+
+
+def test_current_node_argument(env: JSONPathEnvironment) -> None:
+    count = Recorder(NodesArgument.COUNT)
+    values = Recorder(NodesArgument.VALUES)
+    env.function_extensions["count_"] = count
+    env.function_extensions["values_"] = values
+    env.find("$[?count_(@, 1) && values_(@, 1)]", DATA)
+    assert count.calls == [1, 1, 1]
+    assert values.calls == [[{"a": [1, 2]}], [{"a": []}], [7]]
+
+
+@pytest.mark.parametrize(
+    ("query", "want"),
+    [
+        ("$[?count(@) == 1]", [{"a": [1, 2]}, {"a": []}, 7]),
+        ("$[?count(@..*) > 2]", [{"a": [1, 2]}]),
+        ("$[?value(@) == 7]", [7]),
+        ("$[?value(@.a.*) == 1]", []),
+        ("$[?value(@.a) == 7]", []),
+    ],
+)
+def test_standard_functions(env: JSONPathEnvironment, query: str, want: Any) -> None:
+    assert env.find(query, DATA).values() == want
+
+
+COUNT_DATA: Any = {
+    "a": [1, {"b": 2, "c": [3, 4]}, [5, 6, 7], "x"],
+    "b": {"c": {"b": None}},
+}
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "$",
+        "$.a",
+        "$.nosuchthing",
+        "$.a[1].b",
+        "$.a[-1]",
+        "$.a[-5]",
+        "$.a[4]",
+        "$.a[1:3]",
+        "$.a[::-1]",
+        "$.a[::0]",
+        "$.a[0, 1, 1, 5, -1]",
+        "$['a', 'b', 'a', 'z']",
+        "$.*",
+        "$.a.*",
+        "$.a[0].*",
+        "$..*",
+        "$..b",
+        "$..[0, 'c']",
+        "$..[1:]",
+        "$.a[?@.b]",
+        "$..[?@ > 2]",
+    ],
+)
+def test_query_count(env: JSONPathEnvironment, query: str) -> None:
+    compiled = env.compile(query)
+    assert compiled.count(COUNT_DATA) == len(compiled.find(COUNT_DATA))
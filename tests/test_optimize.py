@@ -0,0 +1,290 @@
+import dataclasses
+import operator
+from typing import Any
+from typing import Tuple
+
+import pytest
+
+from jsonpath_rfc9535 import JSONPathEnvironment
+from jsonpath_rfc9535.function_extensions import ExpressionType
+from jsonpath_rfc9535.function_extensions import FilterFunction
+from jsonpath_rfc9535.optimize import optimize_segments
+from jsonpath_rfc9535.selectors import KeysSelector
+
+
+@dataclasses.dataclass
+class Case:
+    description: str
+    query: str
+    want: str
+
+
+TEST_CASES = [
+    Case(
+        description="nothing to fold",
+        query="$[?@.a == 1]",
+        want="$[?@['a'] == 1]",
+    ),
+    Case(
+        description="literal comparison is always true",
+        query="$[?1 == 1]",
+        want="$[*]",
+    ),
+    Case(
+        description="literal comparison is always false",
+        query="$[?1 == 2]",
+        want="$[]",
+    ),
+    Case(
+        description="always false filter in a list of selectors",
+        query="$[0, ?'a' > 'b', 1]",
+        want="$[0, 1]",
+    ),
+    Case(
+        description="int and float literals",
+        query="$[?1 == 1.0]",
+        want="$[*]",
+    ),
+    Case(
+        description="boolean and int literals",
+        query="$[?true == 1]",
+        want="$[]",
+    ),
+    Case(
+        description="null literals",
+        query="$[?null == null]",
+        want="$[*]",
+    ),
+    Case(
+        description="mixed type ordering",
+        query="$[?1 < 'a']",
+        want="$[]",
+    ),
+    Case(
+        description="and true",
+        query="$[?@.a && 1 == 1]",
+        want="$[?@['a']]",
+    ),
+    Case(
+        description="true and",
+        query="$[?1 == 1 && @.a]",
+        want="$[?@['a']]",
+    ),
+    Case(
+        description="and false",
+        query="$[?@.a && 1 == 2]",
+        want="$[]",
+    ),
+    Case(
+        description="or true",
+        query="$[?@.a || 1 == 1]",
+        want="$[*]",
+    ),
+    Case(
+        description="or false",
+        query="$[?@.a || 1 == 2]",
+        want="$[?@['a']]",
+    ),
+    Case(
+        description="double negation",
+        query="$[?!(!@.a)]",
+        want="$[?@['a']]",
+    ),
+    Case(
+        description="triple negation",
+        query="$[?!!!@.a]",
+        want="$[?!@['a']]",
+    ),
+    Case(
+        description="negated literal comparison",
+        query="$[?!(1 == 1)]",
+        want="$[]",
+    ),
+    Case(
+        description="nested logical expressions",
+        query="$[?(@.a || 1 == 2) && (@.b || 2 < 1)]",
+        want="$[?@['a'] && @['b']]",
+    ),
+    Case(
+        description="nested filter query",
+        query="$[?@[?1 == 1]]",
+        want="$[?@[?1 == 1]]",
+    ),
+    Case(
+        description="descendant segment",
+        query="$..[?1 == 1]",
+        want="$..[*]",
+    ),
+    Case(
+        description="function calls are not folded",
+        query="$[?length('abc') == 3]",
+        want="$[?length('abc') == 3]",
+    ),
+]
+
+
+@pytest.fixture()
+def env() -> JSONPathEnvironment:
+    return JSONPathEnvironment()
+
+
+def _optimized(env: JSONPathEnvironment, query: str) -> str:
+    segments = optimize_segments(env.compile(query).segments)
+    return "$" + "".join(str(segment) for segment in segments)
+
+
+@pytest.mark.parametrize("case", TEST_CASES, ids=operator.attrgetter("description"))
+def test_optimize(env: JSONPathEnvironment, case: Case) -> None:
+    assert _optimized(env, case.query) == case.want
+
+
+DATA: Any = [
+    {"a": 1, "b": 2},
+    {"a": 0},
+    {"b": [1, 2]},
+    [1, 2],
+    "a",
+    None,
+    {"a": {"a": 1}},
+]
+
+
+@pytest.mark.parametrize("case", TEST_CASES, ids=operator.attrgetter("description"))
+def test_optimized_queries_select_the_same_nodes(
+    env: JSONPathEnvironment, case: Case
+) -> None:
+    class UnoptimizedEnvironment(JSONPathEnvironment):
+        optimize_queries = False
+
+    want = UnoptimizedEnvironment().find(case.query, DATA)
+    got = env.find(case.query, DATA)
+    assert [(node.path(), node.value) for node in got] == [
+        (node.path(), node.value) for node in want
+    ]
+
+
+def test_optimization_does_not_change_query_string(env: JSONPathEnvironment) -> None:
+    query = "$[?@.a && 1 == 1]"
+    assert str(env.compile(query)) == "$[?@['a'] && 1 == 1]"
+
+
+class LogicalArg(FilterFunction):
+    arg_types = [ExpressionType.LOGICAL]
+    return_type = ExpressionType.VALUE
+
+    def __call__(self, arg: object) -> object:  # noqa: D102
+        return arg
+
+
+def test_function_arguments_keep_their_type(env: JSONPathEnvironment) -> None:
+    env.function_extensions["arg"] = LogicalArg()
+    query = "$[?arg(@.a && 1 == 1) == true]"
+
+    # The argument is not simplified to `@.a`, which would be a node list.
+    assert _optimized(env, query) == "$[?arg((@['a'] && true)) == true]"
+    assert [node.value for node in env.find(query, DATA)] == [
+        {"a": 1, "b": 2},
+        {"a": 0},
+        {"a": {"a": 1}},
+    ]
+
+
+@dataclasses.dataclass
+class KeysCase:
+    description: str
+    query: str
+    names: Tuple[str, ...]
+    slices: Tuple[slice, ...]
+
+
+KEYS_TEST_CASES = [
+    KeysCase(
+        description="contiguous indices",
+        query="$[0, 1, 2, 3, 4]",
+        names=(),
+        slices=(slice(0, 5),),
+    ),
+    KeysCase(
+        description="contiguous negative indices",
+        query="$[-3, -2, -1, 0, 1]",
+        names=(),
+        slices=(slice(-3, None), slice(0, 2)),
+    ),
+    KeysCase(
+        description="duplicate indices",
+        query="$[1, 1, 2, 1]",
+        names=(),
+        slices=(slice(1, 2), slice(1, 3), slice(1, 2)),
+    ),
+    KeysCase(
+        description="descending indices",
+        query="$[2, 1]",
+        names=(),
+        slices=(slice(2, 3), slice(1, 2)),
+    ),
+    KeysCase(
+        description="duplicate names",
+        query="$['a', 'b', 'a']",
+        names=("a", "b", "a"),
+        slices=(),
+    ),
+    KeysCase(
+        description="overlapping slices",
+        query="$[1:3, 2:5]",
+        names=(),
+        slices=(slice(1, 3), slice(2, 5)),
+    ),
+    KeysCase(
+        description="names, indices and slices",
+        query="$['a', 0, 1, :2, 'b', 2]",
+        names=("a", "b"),
+        slices=(slice(0, 2), slice(None, 2), slice(2, 3)),
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "case", KEYS_TEST_CASES, ids=operator.attrgetter("description")
+)
+def test_merge_keys(env: JSONPathEnvironment, case: KeysCase) -> None:
+    query = env.compile(case.query)
+    (segment,) = optimize_segments(query.segments)
+    (selector,) = segment.selectors
+    assert isinstance(selector, KeysSelector)
+    assert selector.names == case.names
+    assert selector.slices == case.slices
+    assert str(segment) == str(query.segments[0])
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "$['a']",
+        "$[0]",
+        "$[0, *, 1]",
+        "$[0, ::2]",
+        "$[0, ?@.a]",
+    ],
+)
+def test_do_not_merge_keys(env: JSONPathEnvironment, query: str) -> None:
+    (segment,) = optimize_segments(env.compile(query).segments)
+    assert not any(isinstance(s, KeysSelector) for s in segment.selectors)
+
+
+@pytest.mark.parametrize(
+    "case", KEYS_TEST_CASES, ids=operator.attrgetter("description")
+)
+def test_merged_keys_select_the_same_nodes(
+    env: JSONPathEnvironment, case: KeysCase
+) -> None:
+    class UnoptimizedEnvironment(JSONPathEnvironment):
+        optimize_queries = False
+
+    unoptimized = UnoptimizedEnvironment()
+
+    for data in ([], [1, 2], list(range(10)), {"a": 1, "b": 2}, {"b": 1}, "a"):
+        want = unoptimized.find(case.query, data)
+        got = env.find(case.query, data)
+        assert [(node.path(), node.value) for node in got] == [
+            (node.path(), node.value) for node in want
+        ]
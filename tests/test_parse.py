@@ -136,6 +136,11 @@ TEST_CASES = [
         query="$[?!(@.a && !@.b)]",
         want="$[?!(@['a'] && !@['b'])]",
     ),
+    Case(
+        description="not a comparison",
+        query="$[?!(@.a == 1)]",
+        want="$[?!(@['a'] == 1)]",
+    ),
     Case(
         description="filter query, multiple bracketed segments",
         query="$[?@[0][1]]",
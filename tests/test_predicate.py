@@ -0,0 +1,116 @@
+from typing import Any
+from typing import Iterator
+
+import pytest
+
+import jsonpath_rfc9535
+from jsonpath_rfc9535 import JSONPathComplexityError
+from jsonpath_rfc9535 import JSONPathEnvironment
+from jsonpath_rfc9535 import JSONPathPredicate
+from jsonpath_rfc9535 import JSONPathSyntaxError
+from jsonpath_rfc9535 import JSONPathTypeError
+
+
+@pytest.fixture()
+def env() -> JSONPathEnvironment:
+    return JSONPathEnvironment()
+
+
+RECORDS: Any = [
+    {"price": 5, "sku": "A1"},
+    {"price": 20, "sku": "A2"},
+    {"price": 20, "sku": "B1"},
+    {"sku": "A3"},
+    "A4",
+    [1, 2],
+]
+
+
+def test_call(env: JSONPathEnvironment) -> None:
+    predicate = env.compile_filter("@.price > 10 && match(@.sku, 'A.*')")
+    assert isinstance(predicate, JSONPathPredicate)
+    assert [predicate(record) for record in RECORDS] == [
+        False,
+        True,
+        False,
+        False,
+        False,
+        False,
+    ]
+
+
+def test_filter_iter(env: JSONPathEnvironment) -> None:
+    predicate = env.compile_filter("@.price > 10 || @[1] == 2")
+    assert list(predicate.filter_iter(RECORDS)) == [RECORDS[1], RECORDS[2], [1, 2]]
+
+
+def test_filter_iter_is_lazy(env: JSONPathEnvironment) -> None:
+    consumed = []
+
+    def records() -> Iterator[object]:
+        for record in RECORDS:
+            consumed.append(record)
+            yield record
+
+    it = env.compile_filter("@.price == 20").filter_iter(records())
+    assert next(it) == RECORDS[1]
+    assert consumed == RECORDS[:2]
+
+
+def test_same_results_as_filter_selector(env: JSONPathEnvironment) -> None:
+    for expression in ("@.sku", "!@.price", "@.price < 10", "@ == 'A4'"):
+        predicate = env.compile_filter(expression)
+        assert list(predicate.filter_iter(RECORDS)) == (
+            env.find(f"$[?{expression}]", RECORDS).values()
+        )
+
+
+def test_root_is_the_value(env: JSONPathEnvironment) -> None:
+    predicate = env.compile_filter("$.price == @.price && $.sku")
+    assert predicate({"price": 1, "sku": "x"})
+    assert not predicate({"price": 1})
+
+
+def test_str(env: JSONPathEnvironment) -> None:
+    assert str(env.compile_filter("@.a==1 && (@.b)")) == "@['a'] == 1 && @['b']"
+
+
+def test_constant_expressions_are_folded(env: JSONPathEnvironment) -> None:
+    predicate = env.compile_filter("1 == 1 || @.a")
+    assert predicate(None)
+    assert str(predicate) == "1 == 1 || @['a']"
+
+
+@pytest.mark.parametrize(
+    ("expression", "message"),
+    [
+        ("@.a ==", "unexpected end of expression, line 1, column 6"),
+        ("@.a == 1][?@.b", "expected a single filter expression, line 1, column 10"),
+        ("@.a, ?@.b", "expected a single filter expression, line 1, column 5"),
+        ("1", "filter expression literals outside of function expressions"),
+    ],
+)
+def test_syntax_errors(env: JSONPathEnvironment, expression: str, message: str) -> None:
+    with pytest.raises(JSONPathSyntaxError, match=message):
+        env.compile_filter(expression)
+
+
+def test_type_error(env: JSONPathEnvironment) -> None:
+    with pytest.raises(JSONPathTypeError):
+        env.compile_filter("length(@.a)")
+
+
+def test_complexity_limit() -> None:
+    class StrictEnvironment(JSONPathEnvironment):
+        max_query_complexity = 10
+
+    env = StrictEnvironment()
+    env.compile_filter("@.a == 1")
+    with pytest.raises(JSONPathComplexityError):
+        env.compile_filter("count(@..a) > 1")
+
+
+def test_package_level_functions() -> None:
+    predicate = jsonpath_rfc9535.compile_filter("@.price > 10")
+    assert list(jsonpath_rfc9535.filter_iter(predicate, RECORDS)) == RECORDS[1:3]
+    assert list(jsonpath_rfc9535.filter_iter("@.price < 10", RECORDS)) == RECORDS[:1]
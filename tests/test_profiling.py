@@ -0,0 +1,155 @@
+from typing import Any
+
+import pytest
+
+from jsonpath_rfc9535 import JSONPathEnvironment
+from jsonpath_rfc9535.profiling import ProfiledSegment
+from jsonpath_rfc9535.profiling import Profiler
+
+
+class ProfilingEnvironment(JSONPathEnvironment):
+    profile_queries = True
+
+
+@pytest.fixture()
+def env() -> JSONPathEnvironment:
+    return ProfilingEnvironment()
+
+
+@pytest.fixture()
+def profiler(env: JSONPathEnvironment) -> Profiler:
+    assert env.profiler is not None
+    return env.profiler
+
+
+DATA: Any = {
+    "a": [
+        {"b": "foo", "c": [1, 2]},
+        {"b": "bar"},
+        {"b": "baz", "c": []},
+    ]
+}
+
+
+def test_profiling_is_disabled_by_default() -> None:
+    env = JSONPathEnvironment()
+    assert env.profiler is None
+    query = env.compile("$.a[*].b")
+    assert not any(isinstance(s, ProfiledSegment) for s in query._segments)  # noqa: SLF001
+
+
+def test_count_nodes(env: JSONPathEnvironment, profiler: Profiler) -> None:
+    query = env.compile("$.a[0, 2].b")
+    assert query.find(DATA).values() == ["foo", "baz"]
+
+    profile = profiler.profile(query)
+    assert profile is not None
+    assert [(s.entered, s.emitted) for s in profile.segments] == [
+        (1, 1),
+        (1, 2),
+        (2, 2),
+    ]
+    (selector,) = profile.segments[1].selectors
+    assert selector.entered == 1
+    assert selector.emitted == 2  # noqa: PLR2004
+
+
+def test_counts_accumulate(env: JSONPathEnvironment, profiler: Profiler) -> None:
+    query = env.compile("$.a[*]")
+    query.find(DATA)
+    query.find(DATA)
+
+    profile = profiler.profile(query)
+    assert profile is not None
+    assert profile.segments[1].emitted == 6  # noqa: PLR2004
+
+    profiler.reset()
+    assert profile.segments[1].emitted == 0
+    assert profile.elapsed == 0
+
+
+def test_count_filter_evaluations_and_regex_calls(
+    env: JSONPathEnvironment, profiler: Profiler
+) -> None:
+    query = env.compile("$.a[?match(@.b, 'ba.') && length(@.c) == 0]")
+    assert query.find(DATA).values() == [{"b": "baz", "c": []}]
+
+    profile = profiler.profile(query)
+    assert profile is not None
+    (selector,) = profile.segments[1].selectors
+    assert selector.filter_evaluations == 3  # noqa: PLR2004
+    assert selector.regex_calls == 3  # noqa: PLR2004
+    assert selector.function_calls == {"match": 3, "length": 3}
+
+
+def test_embedded_queries(env: JSONPathEnvironment, profiler: Profiler) -> None:
+    query = env.compile("$.a[?@.c]")
+    query.find(DATA)
+
+    profile = profiler.profile(query)
+    assert profile is not None
+    (selector,) = profile.segments[1].selectors
+    (subquery,) = selector.subqueries
+    assert subquery.segments[0].entered == 3  # noqa: PLR2004
+    assert subquery.segments[0].emitted == 2  # noqa: PLR2004
+
+    # Embedded query profiles are not reported at the top level.
+    assert [p.query for p in profiler.report()] == ["$['a'][?@['c']]"]
+
+
+def test_descendant_segment(env: JSONPathEnvironment, profiler: Profiler) -> None:
+    query = env.compile("$..b")
+    assert query.find(DATA).values() == ["foo", "bar", "baz"]
+
+    profile = profiler.profile(query)
+    assert profile is not None
+    (segment,) = profile.segments
+    assert segment.entered == 1
+    assert segment.emitted == 3  # noqa: PLR2004
+    assert segment.selectors[0].entered == 7  # noqa: PLR2004
+
+
+def test_profiles_optimized_segments(
+    env: JSONPathEnvironment, profiler: Profiler
+) -> None:
+    query = env.compile("$.a[0, 1, ?1 == 2]")
+    query.find(DATA)
+
+    profile = profiler.profile(query)
+    assert profile is not None
+    assert profile.query == "$['a'][0, 1, ?1 == 2]"
+    assert [s.selector for s in profile.segments[1].selectors] == ["0, 1"]
+
+
+def test_as_dict(env: JSONPathEnvironment, profiler: Profiler) -> None:
+    query = env.compile("$.a")
+    query.find(DATA)
+
+    profile = profiler.profile(query)
+    assert profile is not None
+    report = profile.as_dict()
+    assert report["query"] == "$['a']"
+    assert report["segments"] == [
+        {
+            "segment": "['a']",
+            "entered": 1,
+            "emitted": 1,
+            "elapsed": profile.segments[0].elapsed,
+            "selectors": [
+                {
+                    "selector": "'a'",
+                    "entered": 1,
+                    "emitted": 1,
+                    "filter_evaluations": 0,
+                    "function_calls": {},
+                    "regex_calls": 0,
+                    "subqueries": [],
+                }
+            ],
+        }
+    ]
+
+
+def test_unprofiled_query(profiler: Profiler) -> None:
+    query = JSONPathEnvironment().compile("$.a")
+    assert profiler.profile(query) is None
@@ -0,0 +1,158 @@
+from typing import List
+
+import pytest
+
+from jsonpath_rfc9535 import JSONPathEnvironment
+from jsonpath_rfc9535 import JSONPathLimitError
+from jsonpath_rfc9535.function_extensions import ExpressionType
+from jsonpath_rfc9535.function_extensions import FilterFunction
+
+
+@pytest.fixture()
+def env() -> JSONPathEnvironment:
+    return JSONPathEnvironment()
+
+
+@pytest.mark.parametrize(
+    ("queries", "want"),
+    [
+        (["$.a", "$['a']", '$["a"]'], "$['a']"),
+        (["$.a[0]", "$['a'][0]", "$ .a [ 0 ]"], "$['a'][0]"),
+        (["$[?@.a==1]", "$[?(@['a'] == 1)]", "$[? @.a == 1 ]"], "$[?@['a'] == 1]"),
+        (["$..*", "$..[*]"], "$..[*]"),
+    ],
+)
+def test_canonical(env: JSONPathEnvironment, queries: List[str], want: str) -> None:
+    assert [env.canonical(query) for query in queries] == [want] * len(queries)
+    assert {id(env.compile(query)) for query in queries} == {id(env.compile(want))}
+
+
+def test_compiled_queries_are_cached(env: JSONPathEnvironment) -> None:
+    query = env.compile("$.a")
+    assert env.compile("$.a") is query
+    assert env.compile("$['a']") is query
+
+    info = env.query_cache.info()
+    assert info.hits == 1
+    assert info.misses == 2  # noqa: PLR2004
+    assert info.currsize == 2  # noqa: PLR2004
+
+
+def test_query_cache_is_bounded() -> None:
+    class MyJSONPathEnvironment(JSONPathEnvironment):
+        query_cache_size = 2
+
+    env = MyJSONPathEnvironment()
+    env.compile("$.a")
+    env.compile("$.b")
+    env.compile("$.a")
+    env.compile("$.c")
+    assert len(env.query_cache) == 2  # noqa: PLR2004
+    env.compile("$.a")
+    env.compile("$.b")
+    assert env.query_cache.info().hits == 2  # noqa: PLR2004
+
+
+def test_disable_query_cache() -> None:
+    class MyJSONPathEnvironment(JSONPathEnvironment):
+        query_cache_size = 0
+
+    env = MyJSONPathEnvironment()
+    assert env.compile("$.a") is not env.compile("$.a")
+    assert len(env.query_cache) == 0
+
+
+def test_clear_query_cache(env: JSONPathEnvironment) -> None:
+    query = env.compile("$.a")
+    env.query_cache.clear()
+    assert env.query_cache.info().misses == 0
+    assert env.compile("$['a']") is not query
+
+
+class Calls(FilterFunction):
+    arg_types = [ExpressionType.VALUE]
+    return_type = ExpressionType.LOGICAL
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, _: object) -> bool:  # noqa: D102
+        self.calls += 1
+        return True
+
+
+def test_find_many(env: JSONPathEnvironment) -> None:
+    calls = Calls()
+    env.function_extensions["calls"] = calls
+    data = [{"a": 1}, {"a": 2}]
+    queries = ["$[?calls(@.a)]", "$[0]", "$[?calls(@['a'])]", "$[?calls(@.a)]"]
+
+    results = env.find_many(queries, data)
+    assert [node_list.values() for node_list in results] == [
+        [{"a": 1}, {"a": 2}],
+        [{"a": 1}],
+        [{"a": 1}, {"a": 2}],
+        [{"a": 1}, {"a": 2}],
+    ]
+
+    # Equivalent queries are evaluated once.
+    assert calls.calls == 2  # noqa: PLR2004
+
+    # Node lists are not shared between queries.
+    assert results[0] is not results[2]
+
+
+def test_shared_query_errors_refer_to_first_spelling() -> None:
+    class Env(JSONPathEnvironment):
+        max_filter_evaluations = 1
+
+    env = Env()
+    env.compile("$.a[?@.b]")
+
+    with pytest.raises(JSONPathLimitError) as err:
+        env.find("$['a']   [  ?@['b']]", {"a": [{"b": 1}, {"b": 2}]})
+
+    assert err.value.token is not None
+    assert err.value.token.query == "$.a[?@.b]"
+    assert str(err.value).endswith("line 1, column 5")
+
+
+@pytest.mark.parametrize(
+    ("name", "value"),
+    [
+        ("optimize_queries", False),
+        ("profile_queries", True),
+        ("columnar_filter_threshold", None),
+        ("max_int_index", 10),
+    ],
+)
+def test_compile_settings_clear_query_cache(
+    env: JSONPathEnvironment, name: str, value: object
+) -> None:
+    query = env.compile("$.a[?@.b == 1]")
+    setattr(env, name, value)
+    assert len(env.query_cache) == 0
+    assert env.compile("$['a'][?@['b'] == 1]") is not query
+
+
+def test_profile_queries_after_compiling(env: JSONPathEnvironment) -> None:
+    env.compile("$.a")
+    env.profile_queries = True
+    assert env.profiler is not None
+    query = env.compile("$.a")
+    query.find({"a": 1})
+    profile = env.profiler.profile(query)
+    assert profile is not None
+    assert profile.segments[0].entered == 1
+
+    # Profiles recorded so far are kept.
+    env.profile_queries = False
+    assert env.profiler.profile(query) is profile
+    assert env.profiler.profile(env.compile("$.a")) is None
+
+
+def test_other_settings_keep_query_cache(env: JSONPathEnvironment) -> None:
+    query = env.compile("$.a")
+    env.max_nodes_visited = 10
+    env.nondeterministic = True
+    assert env.compile("$.a") is query
@@ -0,0 +1,149 @@
+import subprocess
+import sys
+
+import pytest
+import regex as re
+
+from jsonpath_rfc9535 import JSONPathEnvironment
+from jsonpath_rfc9535.function_extensions import RegexCache
+from jsonpath_rfc9535.function_extensions._pattern import VERSION1
+from jsonpath_rfc9535.function_extensions._pattern import map_re
+
+
+@pytest.fixture()
+def env() -> JSONPathEnvironment:
+    return JSONPathEnvironment()
+
+
+def test_dynamic_pattern_is_compiled_once(env: JSONPathEnvironment) -> None:
+    data = {
+        "rules": {"pattern": "a.c"},
+        "items": [{"v": "abc"}, {"v": "axc"}, {"v": "abd"}],
+    }
+    query = env.compile("$.items[?match(@.v, $.rules.pattern)]")
+    assert query.find(data).values() == [{"v": "abc"}, {"v": "axc"}]
+
+    info = env.regex_cache.info()
+    assert info.misses == 1
+    assert info.hits == 2  # noqa: PLR2004
+    assert info.currsize == 1
+
+
+def test_match_and_search_share_cache(env: JSONPathEnvironment) -> None:
+    data = [{"v": "abc"}]
+    env.find("$[?match(@.v, 'a.c')]", data)
+    env.find("$[?search(@.v, 'a.c')]", data)
+    assert env.regex_cache.info().currsize == 2  # noqa: PLR2004
+
+
+def test_invalid_patterns_are_cached() -> None:
+    cache = RegexCache()
+    assert cache.get("[") is None
+    assert cache.get("[") is None
+    assert cache.info().hits == 1
+    assert cache.info().misses == 1
+
+
+def test_cache_is_bounded() -> None:
+    cache = RegexCache(maxsize=2)
+    cache.get("a")
+    cache.get("b")
+    cache.get("a")
+    cache.get("c")
+    assert len(cache) == 2  # noqa: PLR2004
+    cache.get("a")
+    cache.get("b")
+    assert cache.info().misses == 4  # noqa: PLR2004
+
+
+def test_zero_size_cache() -> None:
+    cache = RegexCache(maxsize=0)
+    assert cache.get("a") is not None
+    assert cache.get("a") is not None
+    assert cache.info().misses == 2  # noqa: PLR2004
+    assert len(cache) == 0
+
+
+def test_configure_cache_size() -> None:
+    class MockEnv(JSONPathEnvironment):
+        regex_cache_size = 1
+
+    env = MockEnv()
+    assert env.regex_cache.info().maxsize == 1
+
+
+FAST_PATH_PATTERNS = [
+    "",
+    "abc",
+    "a\\.c",
+    "a\\\\c",
+    "abc.*",
+    ".*",
+    "a|bc|",
+    "a\\|b|c",
+]
+
+FAST_PATH_STRINGS = [
+    "",
+    "abc",
+    "a.c",
+    "a\\c",
+    "abcdef",
+    "xabcx",
+    "abc\n",
+    "abc\r",
+    "abc\ud800",
+    "abc𐀀",
+    "abc\ud800\ud800x",
+    "abc\ud800x\udc00",
+    "a",
+    "bc",
+    "a|b",
+    "c",
+]
+
+
+@pytest.mark.parametrize("pattern", FAST_PATH_PATTERNS)
+def test_fast_paths_agree_with_regex(pattern: str) -> None:
+    compiled = RegexCache().get(pattern)
+    assert compiled is not None
+    assert not isinstance(compiled, re.Pattern)
+
+    full = re.compile(map_re(pattern))
+    search = re.compile(map_re(pattern), re.VERSION1)
+
+    for string in FAST_PATH_STRINGS:
+        assert bool(compiled.fullmatch(string)) == bool(full.fullmatch(string))
+        assert bool(compiled.search(string)) == bool(search.search(string))
+
+
+@pytest.mark.parametrize("pattern", ["a.c", "a*", "^a", "a$", "[ab]", "\\p{L}"])
+def test_no_fast_path(pattern: str) -> None:
+    assert isinstance(RegexCache().get(pattern), re.Pattern)
+
+
+def test_match_non_string(env: JSONPathEnvironment) -> None:
+    data = [{"v": 1}, {"v": "1"}]
+    assert env.find("$[?match(@.v, '1')]", data).values() == [{"v": "1"}]
+
+
+def test_version1_flag() -> None:
+    assert VERSION1 == re.VERSION1
+
+
+def test_regex_is_imported_lazily() -> None:
+    code = """\
+import sys
+import jsonpath_rfc9535
+
+assert "regex" not in sys.modules
+assert "iregexp_check" not in sys.modules
+
+jsonpath_rfc9535.find("$[?match(@, 'a')]", ["a"])
+assert "regex" not in sys.modules
+assert "iregexp_check" in sys.modules
+
+jsonpath_rfc9535.find("$[?match(@, 'a+')]", ["a"])
+assert "regex" in sys.modules
+"""
+    subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
@@ -0,0 +1,196 @@
+import asyncio
+import json
+from typing import Any
+from typing import AsyncIterator
+from typing import List
+
+import pytest
+
+import jsonpath_rfc9535 as jsonpath
+from jsonpath_rfc9535 import JSONPathEnvironment
+from jsonpath_rfc9535 import JSONPathLimitError
+from jsonpath_rfc9535 import JSONPathNode
+
+
+@pytest.fixture()
+def env() -> JSONPathEnvironment:
+    return JSONPathEnvironment()
+
+
+class LimitedEnvironment(JSONPathEnvironment):
+    max_nodes_produced = 10
+
+
+ARRAY: Any = [
+    {"id": i, "tags": ["a", 'q"]}', "é☃"], "price": i * 1.5} for i in range(20)
+]
+
+OBJECT: Any = {
+    "store": {"book": [{"title": "x"}, {"title": "y", "isbn": "z"}]},
+    "n": 1.25e3,
+    "s": "\\",
+    "ok": True,
+    "none": None,
+    "list": [[1, [2]], {"a": []}],
+}
+
+QUERIES = [
+    "$",
+    "$[*]",
+    "$[*].tags[1]",
+    "$[?@.id > 15].price",
+    "$[?@.tags[?@ == 'a']].id",
+    "$[3]",
+    "$[2:10:3].id",
+    "$.store.book[*].title",
+    "$.list[*][*]",
+    "$.n",
+    # These can't be applied one member at a time.
+    "$[-1]",
+    "$[::-1].id",
+    "$..title",
+    "$['store', 'n']",
+    "$[?@.id == $[0].id]",
+]
+
+
+async def _chunks(data: bytes, size: int = 1) -> AsyncIterator[bytes]:
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+async def _collect(it: Any) -> List[JSONPathNode]:
+    return [node async for node in it]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("document", [ARRAY, OBJECT], ids=["array", "object"])
+@pytest.mark.parametrize("size", [1, 7, 4096])
+def test_same_nodes_as_find(
+    env: JSONPathEnvironment, query: str, document: Any, size: int
+) -> None:
+    data = json.dumps(document, indent=1, ensure_ascii=False).encode()
+    nodes = asyncio.run(_collect(env.afinditer_stream(query, _chunks(data, size))))
+    expect = env.find(query, document)
+    assert [node.path() for node in nodes] == expect.paths()
+    assert [node.value for node in nodes] == expect.values()
+
+
+@pytest.mark.parametrize("document", [[], {}, 1, "a", None, True])
+def test_empty_containers_and_scalars(env: JSONPathEnvironment, document: Any) -> None:
+    data = json.dumps(document).encode()
+    for query in ("$", "$[*]"):
+        nodes = asyncio.run(_collect(env.afinditer_stream(query, _chunks(data))))
+        assert [node.value for node in nodes] == env.find(query, document).values()
+
+
+def test_nodes_before_end_of_stream(env: JSONPathEnvironment) -> None:
+    received: List[bytes] = []
+
+    async def stream() -> AsyncIterator[bytes]:
+        for chunk in (b'[{"a": 1}, ', b'{"a": 2}, ', b'{"a": 3}]'):
+            received.append(chunk)
+            yield chunk
+
+    async def main() -> List[int]:
+        seen = []
+        async for node in env.afinditer_stream("$[*].a", stream()):
+            seen.append(len(received))
+            assert node.value == len(received)
+        return seen
+
+    assert asyncio.run(main()) == [1, 2, 3]
+
+
+def test_root_refers_to_the_document(env: JSONPathEnvironment) -> None:
+    data = json.dumps(ARRAY).encode()
+    nodes = asyncio.run(_collect(env.afinditer_stream("$[1].id", _chunks(data, 64))))
+    assert len(nodes) == 1
+    assert nodes[0].root == ARRAY
+    assert nodes[0].parent is not None
+    assert nodes[0].parent.parent is not None
+    assert nodes[0].parent.parent.value is nodes[0].root
+
+
+@pytest.mark.parametrize(
+    ("query", "want"),
+    [
+        ("$.a", [1, 2]),
+        ("$[*]", [1, 0, 2]),
+        ("$[?@ > 0]", [1, 2]),
+        # Not streamed, so the document is decoded like `json.loads()` first.
+        ("$..a", [2]),
+    ],
+)
+def test_duplicate_names(env: JSONPathEnvironment, query: str, want: Any) -> None:
+    data = b'{"a": 1, "b": 0, "a": 2}'
+    nodes = asyncio.run(_collect(env.afinditer_stream(query, _chunks(data))))
+    assert [node.value for node in nodes] == want
+    assert nodes[0].root == json.loads(data) == {"a": 2, "b": 0}
+
+
+def test_limit_stops_reading(env: JSONPathEnvironment) -> None:
+    received: List[bytes] = []
+
+    async def stream() -> AsyncIterator[bytes]:
+        for i in range(100):
+            chunk = (b"[" if i == 0 else b",") + str(i).encode()
+            received.append(chunk)
+            yield chunk
+        yield b"]"
+
+    async def main() -> List[Any]:
+        query = env.compile("$[?@ > 2]")
+        return [node.value async for node in query.afinditer_stream(stream(), limit=2)]
+
+    assert asyncio.run(main()) == [3, 4]
+    # The last member is decoded when we see the comma that follows it.
+    assert len(received) == 6  # noqa: PLR2004
+
+
+@pytest.mark.parametrize(("limit", "offset"), [(None, 5), (3, 0), (3, 10), (0, 0)])
+def test_limit_and_offset(env: JSONPathEnvironment, limit: Any, offset: int) -> None:
+    data = json.dumps(ARRAY).encode()
+    for query in ("$[*].id", "$[-5:].id"):
+        nodes = asyncio.run(
+            _collect(
+                env.afinditer_stream(
+                    query, _chunks(data, 16), limit=limit, offset=offset
+                )
+            )
+        )
+        expect = env.find(query, ARRAY, limit=limit, offset=offset)
+        assert [node.path() for node in nodes] == expect.paths()
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"[1, 2",
+        b"[1 2]",
+        b"[1,]",
+        b"[tru]",
+        b'{"a" 1}',
+        b"{1: 2}",
+        b"[1] x",
+    ],
+)
+def test_invalid_json(env: JSONPathEnvironment, data: bytes) -> None:
+    with pytest.raises(json.JSONDecodeError):
+        asyncio.run(_collect(env.afinditer_stream("$[*]", _chunks(data))))
+
+
+def test_limits() -> None:
+    env = LimitedEnvironment()
+    data = json.dumps(ARRAY).encode()
+    with pytest.raises(JSONPathLimitError):
+        asyncio.run(_collect(env.afinditer_stream("$[*]", _chunks(data, 64))))
+
+
+def test_package_level_function() -> None:
+    data = json.dumps(ARRAY).encode()
+    nodes = asyncio.run(
+        _collect(jsonpath.afinditer_stream("$[?@.id < 2].id", _chunks(data)))
+    )
+    assert [node.value for node in nodes] == [0, 1]
@@ -0,0 +1,114 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import List
+
+import pytest
+
+import jsonpath_rfc9535 as jsonpath
+from jsonpath_rfc9535 import JSONPathEnvironment
+from jsonpath_rfc9535.cache import LRUCache
+from jsonpath_rfc9535.function_extensions import RegexCache
+
+THREADS = 8
+
+DATA: Any = {
+    "users": [
+        {"name": f"user{i}", "score": i, "tags": ["a", "b"] if i % 2 else ["c"]}
+        for i in range(50)
+    ]
+}
+
+
+def _run(func: Any, n: int = THREADS) -> List[Any]:
+    barrier = threading.Barrier(n)
+
+    def task(i: int) -> Any:
+        barrier.wait()
+        return func(i)
+
+    with ThreadPoolExecutor(max_workers=n) as executor:
+        return list(executor.map(task, range(n)))
+
+
+def test_shared_query_cache() -> None:
+    class SmallCacheEnvironment(JSONPathEnvironment):
+        query_cache_size = 4
+
+    env = SmallCacheEnvironment()
+    queries = [f"$.users[?@.score > {i}].name" for i in range(20)]
+    rounds = 3
+
+    def task(_: int) -> List[List[object]]:
+        return [env.find(q, DATA).values() for _ in range(rounds) for q in queries]
+
+    results = _run(task)
+    assert all(result == results[0] for result in results)
+
+    info = env.query_cache.info()
+    assert info.hits + info.misses == THREADS * rounds * len(queries)
+    assert info.currsize <= 4  # noqa: PLR2004
+
+
+def test_shared_regex_cache() -> None:
+    cache = RegexCache(maxsize=2)
+    patterns = [f"user{i}.*" for i in range(10)] + [f"[a-{c}]+" for c in "bcdef"]
+    rounds = 50
+
+    def task(_: int) -> List[bool]:
+        return [
+            bool(compiled.fullmatch("user12") or compiled.fullmatch("abc"))
+            for _ in range(rounds)
+            for compiled in map(cache.get, patterns)
+            if compiled is not None
+        ]
+
+    results = _run(task)
+    assert all(result == results[0] for result in results)
+
+    info = cache.info()
+    assert info.hits + info.misses == THREADS * rounds * len(patterns)
+    assert len(cache) <= 2  # noqa: PLR2004
+
+
+def test_counts_from_finished_threads_are_kept() -> None:
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.store("a", 1)
+
+    def count() -> None:
+        for _ in range(10):
+            cache.lookup("a")
+        cache.lookup("b")
+
+    for _ in range(5):
+        thread = threading.Thread(target=count)
+        thread.start()
+        thread.join()
+
+    assert (cache.hits, cache.misses) == (50, 5)
+    cache.clear()
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_one_default_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(jsonpath, "_default_env", None)
+    envs = _run(lambda _: jsonpath._get_default_env())  # noqa: SLF001
+    assert len({id(env) for env in envs}) == 1
+
+
+def test_profile_while_compiling() -> None:
+    class ProfilingEnvironment(JSONPathEnvironment):
+        profile_queries = True
+        query_cache_size = 0
+
+    env = ProfilingEnvironment()
+    assert env.profiler is not None
+    profiler = env.profiler
+
+    def task(i: int) -> int:
+        if i % 2:
+            return sum(len(profiler.report()) >= 0 for _ in range(100))
+        queries = [env.compile(f"$.users[?@.score > {j}]") for j in range(100)]
+        return len(queries)
+
+    assert sum(_run(task)) == THREADS * 100